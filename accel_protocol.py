@@ -0,0 +1,242 @@
+'''
+The binary accelerometer protocol of the micro:bit. Instead of a line of text with the name of its gesture, the micro:bit sends its raw
+accelerometer readings about 200 times a second, each one in a frame of 10 bytes:
+
+    offset  size  type    field
+    0       2     bytes   sync, always A5 5A
+    2       1     uint8   sequence number, goes up by one every frame and wraps around at 255
+    3       2     int16   x acceleration in milli-g, little endian
+    5       2     int16   y acceleration in milli-g, little endian
+    7       2     int16   z acceleration in milli-g, little endian
+    9       1     uint8   checksum, the xor of the sequence number and the three readings (bytes 2 to 8)
+
+A frame with a wrong checksum is skipped, and the decoder looks for the next sync bytes, so garbage on the line or a frame that was cut off
+only loses that frame. Gaps in the sequence numbers are counted as lost frames.
+
+The frames are decoded in batches with numpy, every frame that has arrived is decoded at once, and the swing detector turns the batch
+into swing events: ("swing start", strength) as soon as the micro:bit is swung, ("swing strength", strength) every time the swing gets
+stronger, and ("swing end", strength) when the swing ends, where the strength is between 0 and 1 and comes from the biggest acceleration of
+the swing so far. The game uses the binary protocol when microbit-protocol is set to binary in config/conf.prc.
+
+The micro:bit script is below, it can be written to a file to flash onto the micro:bit with:
+
+    python accel_protocol.py --script main.py
+'''
+import argparse
+
+import numpy as np
+from panda3d.core import ConfigVariableString
+
+microbitProtocol = ConfigVariableString("microbit-protocol", "text")
+
+SYNC = b"\xa5\x5a"
+FRAME_SIZE = 10
+FRAME_DTYPE = np.dtype([("sync", "<u2"), ("sequence", "u1"), ("x", "<i2"), ("y", "<i2"), ("z", "<i2"), ("checksum", "u1")])
+
+MICROBIT_SCRIPT = '''from microbit import *
+import ustruct
+
+uart.init(baudrate=115200)
+sequence = 0
+while True:
+    x, y, z = accelerometer.get_values()
+    body = ustruct.pack("<Bhhh", sequence, x, y, z)
+    checksum = 0
+    for byte in body:
+        checksum ^= byte
+    uart.write(b"\\xa5\\x5a" + body + bytes([checksum]))
+    sequence = (sequence + 1) & 255
+    sleep(5)
+'''
+
+
+def encodeFrame(sequence, x, y, z):
+    '''
+    This function builds a frame of the protocol, the same way the micro:bit script does.
+
+    Parameters
+    ----------------------------------------------------
+    sequence: the sequence number of the frame, it is wrapped around at 255
+    x, y, z: the acceleration in milli-g
+
+    Returns
+    ----------------------------------------------------
+    Returns the frame as bytes
+'''
+    frame = np.zeros(1, FRAME_DTYPE)
+    frame[0] = (int.from_bytes(SYNC, "little"), sequence & 255, x, y, z, 0)
+    data = bytearray(frame.tobytes())
+    checksum = 0
+    for byte in data[2:FRAME_SIZE - 1]:
+        checksum ^= byte
+    data[FRAME_SIZE - 1] = checksum
+    return bytes(data)
+
+
+def decodeFrames(data):
+    '''
+    This function decodes every complete frame in a block of bytes at once. Every position where the sync bytes appear is a possible frame,
+    and the checksums of all of them are worked out together. The bytes at the end that could be the start of a frame that has not fully
+    arrived are not consumed, so they are decoded with the bytes that arrive next.
+
+    Parameters
+    ----------------------------------------------------
+    data: the bytes that have arrived
+
+    Returns
+    ----------------------------------------------------
+    Returns a tuple of the frames (a numpy array of FRAME_DTYPE) and the number of bytes at the start of data that were consumed
+'''
+    raw = np.frombuffer(data, np.uint8)
+    count = len(raw) - FRAME_SIZE + 1
+    if count <= 0:
+        return np.zeros(0, FRAME_DTYPE), 0
+
+    starts = np.flatnonzero((raw[:count] == SYNC[0]) & (raw[1:count + 1] == SYNC[1]))
+    frames = raw[starts[:, None] + np.arange(FRAME_SIZE)]
+    valid = np.bitwise_xor.reduce(frames[:, 2:FRAME_SIZE - 1], axis = 1) == frames[:, FRAME_SIZE - 1]
+    starts, frames = starts[valid], frames[valid]
+
+    #the sync bytes can appear inside a frame with a checksum that happens to match, a frame that starts inside the frame before it is dropped
+    if len(starts) > 1 and np.any(np.diff(starts) < FRAME_SIZE):
+        keep = np.zeros(len(starts), bool)
+        end = 0
+        for num, start in enumerate(starts):
+            if start >= end:
+                keep[num] = True
+                end = start + FRAME_SIZE
+        starts, frames = starts[keep], frames[keep]
+
+    consumed = count
+    if len(starts):
+        consumed = max(consumed, int(starts[-1]) + FRAME_SIZE)
+    return np.ascontiguousarray(frames).view(FRAME_DTYPE).reshape(-1), consumed
+
+
+class SwingDetector():
+    def __init__(self, startThreshold = 2000, endThreshold = 1400, maxStrength = 4000):
+        '''
+        Initialization for the SwingDetector class. The swing detector looks at the size of the acceleration of the micro:bit, which is about
+        1000 milli-g (gravity) when it is held still. A swing starts when it goes over startThreshold, and ends when it drops under endThreshold,
+        so the swing does not flicker on and off around a single threshold. The strength of a swing comes from the biggest acceleration during it,
+and is sent again every time it goes up, so the game knows how hard the micro:bit is being swung while the swing is still going on.
+
+        Parameters
+        ----------------------------------------------------
+        startThreshold: Default: 2000, the acceleration in milli-g that starts a swing
+        endThreshold: Default: 1400, the acceleration in milli-g that ends a swing
+        maxStrength: Default: 4000, the acceleration in milli-g that is a swing of strength 1
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.startThreshold = startThreshold
+        self.endThreshold = endThreshold
+        self.maxStrength = maxStrength
+
+        #whether a swing is going on at the end of the last batch, and the biggest acceleration of the swing so far
+        self.swinging = False
+        self.peak = 0.0
+
+    def update(self, frames):
+        '''
+        This method finds the swings in a batch of frames.
+
+        Parameters
+        ----------------------------------------------------
+        frames: a numpy array of FRAME_DTYPE, in the order they arrived
+
+        Returns
+        ----------------------------------------------------
+        Returns a list of the swing events in the batch, in order
+'''
+        if len(frames) == 0:
+            return []
+        magnitude = np.sqrt(frames["x"].astype(np.float32)**2 + frames["y"].astype(np.float32)**2 + frames["z"].astype(np.float32)**2)
+
+        #each frame over the start threshold or under the end threshold sets the state, the frames in between keep the state of the last one that set it
+        trigger = np.where(magnitude > self.startThreshold, 1, np.where(magnitude < self.endThreshold, 0, -1))
+        last = np.maximum.accumulate(np.where(trigger >= 0, np.arange(len(trigger)), -1))
+        state = np.where(last >= 0, trigger[np.maximum(last, 0)] == 1, self.swinging)
+
+        #the batch is split into runs of frames with the same state, there is a run for each change of state so this loop is short
+        changes = np.flatnonzero(state[1:] != state[:-1]) + 1
+        bounds = np.concatenate(([0], changes))
+        peaks = np.maximum.reduceat(magnitude, bounds)
+
+        events = []
+        for start, peak in zip(bounds, peaks):
+            if state[start]:
+                if not self.swinging:
+                    self.swinging = True
+                    self.peak = float(peak)
+                    events.append(("swing start", self.getStrength(self.peak)))
+                elif peak > self.peak:
+                    self.peak = float(peak)
+                    events.append(("swing strength", self.getStrength(self.peak)))
+            elif self.swinging:
+                self.swinging = False
+                events.append(("swing end", self.getStrength(self.peak)))
+        return events
+
+    def getStrength(self, peak):
+        '''
+        Returns the strength of a swing between 0 and 1 from the biggest acceleration during it.
+'''
+        strength = (peak - self.endThreshold)/(self.maxStrength - self.endThreshold)
+        return min(max(strength, 0.0), 1.0)
+
+
+class StreamDecoder():
+    def __init__(self):
+        '''
+        Initialization for the StreamDecoder class. The stream decoder decodes the bytes read from one micro:bit into swing events,
+        and keeps count of the frames it has decoded, the frames that were lost and the bytes that were skipped.
+
+        Parameters
+        ----------------------------------------------------
+        None
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.swings = SwingDetector()
+        self.lastSequence = None
+        self.frames = 0
+        self.lost = 0
+        self.skipped = 0
+
+    def decode(self, data):
+        '''
+        This method decodes a block of bytes.
+
+        Parameters
+        ----------------------------------------------------
+        data: the bytes that have arrived and not been consumed yet
+
+        Returns
+        ----------------------------------------------------
+        Returns a tuple of the swing events and the number of bytes at the start of data that were consumed
+'''
+        frames, consumed = decodeFrames(data)
+        self.skipped += consumed - len(frames)*FRAME_SIZE
+        if len(frames):
+            sequence = frames["sequence"].astype(np.int16)
+            if self.lastSequence is not None:
+                sequence = np.concatenate(([self.lastSequence], sequence))
+            self.lost += int(np.sum((np.diff(sequence) - 1) % 256))
+            self.lastSequence = int(sequence[-1])
+            self.frames += len(frames)
+        return self.swings.update(frames), consumed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Writes the micro:bit script of the binary accelerometer protocol")
+    parser.add_argument("--script", default = "main.py", help = "file to write the micro:bit script to")
+    args = parser.parse_args()
+
+    with open(args.script, "w") as file:
+        file.write(MICROBIT_SCRIPT)
+    print(f"wrote {args.script}, flash it onto the micro:bit and set microbit-protocol to binary in config/conf.prc")
@@ -0,0 +1,211 @@
+from panda3d.core import Loader
+from panda3d.core import LoaderOptions
+from panda3d.core import Filename
+from panda3d.core import NodePath
+from panda3d.core import BamFile
+from panda3d.core import BamEnums
+from panda3d.core import TexturePool
+
+import argparse
+import hashlib
+import json
+import time
+import os
+
+
+#the folder the converted models are stored in, and the manifest that says which source file each one was converted from
+CACHE_DIR = "assets/cache"
+MANIFEST = os.path.join(CACHE_DIR, "manifest.json")
+
+#the model formats that are converted, ghost.bam is already a bam file so it is loaded as it is
+SOURCE_FORMATS = (".x", ".egg")
+
+#textures that are applied to a model when it is converted, these are the textures the game sets on the model after loading it
+MODEL_TEXTURES = {"assets/treeOne.x": "assets/tex/colorPalette.png",
+                  "assets/treeTwo.x": "assets/tex/colorPalette.png",
+                  "assets/axe.x": "assets/tex/colorPalette.png"}
+
+#the manifest read by resolveModel, and every path resolveModel has already resolved
+manifest = None
+resolved = {}
+
+
+def hashFile(path):
+    '''
+    This function returns the sha256 hash of the contents of a file, as a hex string.
+'''
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def readManifest():
+    '''
+    This function reads the manifest of the cache. The manifest is a dictionary from the path of each source model to the hash, size
+    and modification time of the source file and the path of the bam file it was converted to. If there is no manifest, it returns an empty dictionary.
+'''
+    try:
+        with open(MANIFEST) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def findSourceModels(assetDir = "assets"):
+    '''
+    This function returns the path of every model under assetDir that needs to be converted, the cache folder is skipped.
+'''
+    sources = []
+    for folder, subFolders, files in os.walk(assetDir):
+        if os.path.abspath(folder).startswith(os.path.abspath(CACHE_DIR)):
+            continue
+        for name in sorted(files):
+            if name.endswith(SOURCE_FORMATS):
+                sources.append(os.path.join(folder, name).replace(os.sep, "/"))
+    return sorted(sources)
+
+
+def loadUncached(path):
+    '''
+    This function loads a model without using the model pool or the model cache of panda3d, so it always reads and parses the file.
+    The texture pool is emptied first, so textures are loaded again as well. It is used by the build step so the timing comparison measures a cold start.
+
+    Parameters
+    ----------------------------------------------------
+    path: the path of the model file
+
+    Returns
+    ----------------------------------------------------
+    Returns a NodePath to the loaded model
+'''
+    TexturePool.releaseAllTextures()
+    options = LoaderOptions(LoaderOptions.LFNoCache | LoaderOptions.LFReportErrors)
+    node = Loader.getGlobalPtr().loadSync(Filename(path), options)
+    if node is None:
+        raise IOError(f"could not load {path}")
+    return NodePath(node)
+
+
+def writeBam(model, path):
+    '''
+    This function writes a model to a bam file. The textures of the model are written as paths relative to the bam file, not copied into it,
+    since every model shares the same palette texture and panda3d only loads it once. If the path ends in .pz the file is compressed.
+'''
+    bamFile = BamFile()
+    if not bamFile.openWrite(Filename(path)):
+        raise IOError(f"could not write {path}")
+    bamFile.getWriter().setFileTextureMode(BamEnums.BTM_relative)
+    bamFile.writeObject(model.node())
+    bamFile.close()
+
+
+def buildAssets(assetDir = "assets", compress = False, force = False):
+    '''
+    This function is the asset build step. It converts every .x and .egg model under assetDir into a bam file in the cache folder,
+    with the textures in MODEL_TEXTURES already applied. Each bam file is named after the hash of the contents of its source file, so a
+    model is only converted again when its source file changes. At the end it prints how long each model takes to load from its source
+    file and from its bam file when nothing is cached.
+
+    Parameters
+    ----------------------------------------------------
+    assetDir: Default: "assets", the folder to look for models in
+    compress: Default: False, if True the bam files are compressed, they are smaller on disk but take a little longer to load
+    force: Default: False, if True every model is converted again even if it has not changed
+
+    Returns
+    ----------------------------------------------------
+    Returns a dictionary from the path of each source model to the time in seconds it took to load it from source and from the bam file
+'''
+    os.makedirs(CACHE_DIR, exist_ok = True)
+    oldManifest = readManifest()
+    newManifest = {}
+    timings = {}
+
+    for source in findSourceModels(assetDir):
+        sourceHash = hashFile(source)
+        name = os.path.splitext(os.path.basename(source))[0]
+        bamPath = f"{CACHE_DIR}/{name}-{sourceHash[:16]}.bam" + (".pz" if compress else "")
+
+        #the time to load from source includes applying the texture, since the game does that after loading the model
+        start = time.perf_counter()
+        model = loadUncached(source)
+        if source in MODEL_TEXTURES:
+            model.setTexture(TexturePool.loadTexture(MODEL_TEXTURES[source]))
+        sourceTime = time.perf_counter() - start
+
+        if force or not os.path.exists(bamPath):
+            writeBam(model, bamPath)
+            print(f"converted {source} -> {bamPath}")
+        else:
+            print(f"{source} has not changed, using {bamPath}")
+
+        #removes the converted file of the last version of the source file
+        oldBam = oldManifest.get(source, {}).get("bam")
+        if oldBam and oldBam != bamPath and os.path.exists(oldBam):
+            os.remove(oldBam)
+
+        start = time.perf_counter()
+        loadUncached(bamPath)
+        bamTime = time.perf_counter() - start
+        timings[source] = {"source": sourceTime, "bam": bamTime}
+
+        stat = os.stat(source)
+        newManifest[source] = {"hash": sourceHash, "size": stat.st_size, "mtime": stat.st_mtime, "bam": bamPath}
+
+    with open(MANIFEST, "w") as file:
+        json.dump(newManifest, file, indent = 2)
+
+    printTimings(timings)
+    return timings
+
+
+def printTimings(timings):
+    '''
+    Prints the cold start timing comparison of every model and the total.
+'''
+    print(f"{'model':<28}{'source ms':>12}{'bam ms':>12}{'speedup':>10}")
+    for source, timing in timings.items():
+        print(f"{source:<28}{timing['source']*1000:12.2f}{timing['bam']*1000:12.2f}{timing['source']/max(timing['bam'], 1e-9):9.1f}x")
+    sourceTotal = sum(timing["source"] for timing in timings.values())
+    bamTotal = sum(timing["bam"] for timing in timings.values())
+    print(f"{'total':<28}{sourceTotal*1000:12.2f}{bamTotal*1000:12.2f}{sourceTotal/max(bamTotal, 1e-9):9.1f}x")
+
+
+def resolveModel(path):
+    '''
+    This function is the runtime resolver, every model the game loads goes through it. If the model has been converted by the build step
+    and the source file has not changed since, it returns the path of the bam file, otherwise it returns the path it was given, so the
+    game still works without running the build step. A source file counts as unchanged if it has the same size and modification time
+    as when it was converted, so the game never needs to hash the file. Each path is only resolved once.
+
+    Parameters
+    ----------------------------------------------------
+    path: the path of the model as it is written in the game, for example "assets/treeOne.x"
+
+    Returns
+    ----------------------------------------------------
+    Returns the path of the file to load
+'''
+    global manifest
+    if path in resolved:
+        return resolved[path]
+    if manifest is None:
+        manifest = readManifest()
+
+    resolved[path] = path
+    entry = manifest.get(path)
+    if entry is not None and os.path.exists(entry["bam"]):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        if stat is not None and stat.st_size == entry["size"] and stat.st_mtime == entry["mtime"]:
+            resolved[path] = entry["bam"]
+    return resolved[path]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Converts the models of Ghost Survival into cached bam files")
+    parser.add_argument("--compress", action = "store_true", help = "compress the bam files")
+    parser.add_argument("--force", action = "store_true", help = "convert every model again, even if it has not changed")
+    args = parser.parse_args()
+    buildAssets(compress = args.compress, force = args.force)
@@ -1,6 +1,5 @@
 from panda3d.core import CollisionNode
 from panda3d.core import CollisionSphere
-from game_collision_handler import CollisionHandler
 
 import game
 
@@ -21,27 +20,43 @@ class Axe():
 '''
         #Creating the nodepath of the axe, then inserting it into the scene graph under the cam
         #Cam is child of camera, cam is the perspective lens Panda3D uses
-        #The reason the axe is put under the cam instead of the camera is because when I want to remove the axe,
-        #I can call self.cam.removeChildren()
-        self.np  = game.gameObj.loader.loadModel("assets/axe.x")
+        #The axe is put under the cam instead of the camera so it is drawn in front of the player, it is stashed while the player is dead
+        self.np  = game.gameObj.gameLoader.getModel("assets/axe.x")
         self.np.reparentTo(game.gameObj.cam)
         self.np.setTexture(game.gameObj.textures)
         self.np.setLight(game.gameObj.pLight)
         self.np.setLight(game.gameObj.aLight)
         self.np.setScale(1.2)
         
-        #variables for the axe position
-        self.posX = 1
-        self.posY = 0.4
-        self.posZ = -0.9
-        
         #Axe collision node path
         self.cnodePath = self.np.attachNewNode(CollisionNode("axeCollNode"))
         self.cnodePath.node().addSolid(CollisionSphere(-0.21,1.45,-0.25,0.07))
         #self.cnodePath.show()
-        self.axeCollHandler = CollisionHandler()
-        game.gameObj.cTrav.addCollider(self.cnodePath, self.axeCollHandler)
+        game.gameObj.collisions.addCollider(self.cnodePath, "axe")
 
+        #puts the axe in its resting position
+        self.reset()
+    
+    def reset(self):
+        '''
+        This method puts the axe back in its resting position and stops any swing, it is called at the start of every game.
+        
+        Parameters
+        ----------------------------------------------------
+        None
+        
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        #variables for the axe position
+        self.posX = 1
+        self.posY = 0.4
+        self.posZ = -0.9
+        
+        #the position of the axe before the last tick, used to draw the axe between ticks
+        self.lastPos = (self.posX, self.posY, self.posZ)
+        
         self.np.setPos(self.posX,self.posY,self.posZ)
         self.np.setHpr(10,40,0)
         
@@ -80,7 +95,7 @@ class Axe():
         None
 '''
         if self.animprocess == 1:
-            if game.gameObj.events.axeCollision == True:
+            if game.gameObj.collisions.axeCollision == True:
                 #if the axe has collided with the ghost, it can begin to move back to the player
                 self.animprocess = 2
             if self.posY < 2:
@@ -109,10 +124,27 @@ class Axe():
                 
                 #this needs to be here to prevent a glitch from happening, a ghost may destruct midway through collision
                 #causing axeCollision to not be updated
-                game.gameObj.events.axeCollision = False
+                game.gameObj.collisions.axeCollision = False
         self.updateAxeLoc()
         
         
+    def getDamage(self):
+        '''
+        This method returns the damage the axe does to a ghost it hits. With the mouse it is always 5, with the microbit it goes from 2 for
+        the lightest swing to 8 for the hardest, using the strength of the swing (see the Handler class).
+        
+        Parameters
+        ----------------------------------------------------
+        None
+        
+        Returns
+        ----------------------------------------------------
+        Returns the damage as a float
+'''
+        if game.gameObj.inputMode == "microbit":
+            return 2 + 6*game.gameObj.events.swingStrength
+        return 5.0
+        
     def update(self):
         '''
         Update method of the axe, this is called each time the player update method is ran.
@@ -130,5 +162,7 @@ class Axe():
         if game.gameObj.events.keyMap["mouse1"] and not self.animate:
             self.animate = True
             self.animprocess = 1
+        #marks the swing of the microbit as seen, if it has already ended it is let go at the start of the next frame
+        game.gameObj.events.swingSeen()
         if self.animate == True:
             self.animateAxe()
\ No newline at end of file
@@ -0,0 +1,260 @@
+from panda3d.core import ClockObject
+from direct.task.Task import Task
+
+from my_game import MyGame
+
+import numpy as np
+import argparse
+import resource
+import json
+import time
+import sys
+
+
+def getMemoryUsage():
+    '''
+    This function returns the memory used by the process in kilobytes. On linux it reads the current resident size from /proc,
+    everywhere else it falls back to the peak resident size, which only ever goes up.
+
+    Parameters
+    ----------------------------------------------------
+    None
+
+    Returns
+    ----------------------------------------------------
+    Returns the memory used by the process in kilobytes
+'''
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1])*resource.getpagesize()/1024
+    except OSError:
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        #macOS reports the peak resident size in bytes instead of kilobytes
+        return usage/1024 if sys.platform == "darwin" else usage
+
+
+class ScalingBenchmark():
+
+    #the rounds that are benchmarked when no rounds are given
+    DEFAULT_ROUNDS = (1, 10, 50, 100, 250)
+
+    #timings that count as a regression if they are slower than the baseline by more than the tolerance
+    #the memory per ghost is only reported, it comes from the resident size of the process, which grows a whole page at a time,
+    #so it changes from run to run of the same code
+    TIMED_METRICS = ("meanMs", "p95Ms", "p99Ms", "roundSetupMs", "spawnMs")
+
+    #counts that count as a regression if they are higher than the baseline at all
+    COUNTED_METRICS = ("tasks", "events", "listeners", "colliders")
+
+    def __init__(self, gameObj, rounds = DEFAULT_ROUNDS, frames = 300, warmup = 30, timestep = 1/60):
+        '''
+        Initialization for the ScalingBenchmark class. The scaling benchmark measures how the cost of the game grows with the round.
+        It runs the game in headless mode, then for every round it sets up that round, spawns every ghost of the round at once, lets the
+        ghosts chase the player for a few frames, and then measures how long each frame takes.
+
+        For every round it records the mean, 95th percentile and 99th percentile frame time, how long setUpRound took, how long the frame
+        that spawned every ghost took, how much memory each newly created ghost used, and how many tasks, messenger events, event listeners
+        and colliders exist. Nothing should grow with the round except the frame time, and it should grow slowly.
+
+        The benchmark drives the rounds itself, so the mainGame system is removed from the fixed step loop and the player cannot die.
+
+        Parameters
+        ----------------------------------------------------
+        gameObj: the MyGame object, created with headless = True
+        rounds: Default: DEFAULT_ROUNDS, the rounds to benchmark, in the order they are benchmarked
+        frames: Default: 300, the number of frames measured for every round
+        warmup: Default: 30, the number of frames run before measuring, after every ghost has spawned
+        timestep: Default: 1/60, the number of seconds simulated by each frame
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.game = gameObj
+        self.rounds = rounds
+        self.frames = frames
+        self.warmup = warmup
+        self.timestep = timestep
+
+        #setUpRound is normally a task, the benchmark calls it directly with this task
+        self.task = Task(self.game.setUpRound, "benchmarkRound")
+
+    def setUp(self):
+        '''
+        This method switches the global clock to a fixed timestep and sets up the main game.
+'''
+        clock = ClockObject.getGlobalClock()
+        clock.setMode(ClockObject.MNonRealTime)
+        clock.setFrameRate(1/self.timestep)
+
+        self.game.taskMgr.add(self.game.setUpMainGame, "setUpMainGame")
+        self.game.taskMgr.step()
+        self.game.player.invulnerable = True
+        self.game.simLoop.step = self.timestep
+        self.game.simLoop.interpolate = False
+        self.game.simLoop.removeSystem("mainGame")
+
+    def step(self):
+        '''
+        Runs one frame of the game and returns how long it took in milliseconds.
+'''
+        start = time.perf_counter()
+        self.game.taskMgr.step()
+        return (time.perf_counter() - start)*1000
+
+    def clearRound(self):
+        '''
+        Kills every ghost that is still alive from the last round, the ghost system gives them back to the ghost pool on the next frame.
+'''
+        ghostSystem = self.game.ghostSystem
+        ghostSystem.health[ghostSystem.status == ghostSystem.MOVING] = 0
+        self.step()
+
+    def getCounts(self):
+        '''
+        This method counts the things in the game that should not grow with the round.
+
+        Returns
+        ----------------------------------------------------
+        Returns a dictionary with the number of tasks in the task manager, events accepted by the messenger, objects listening to those events,
+        and colliders in the collision traverser
+'''
+        messenger = self.game.messenger
+        events = messenger.getEvents()
+        return {"tasks": len(self.game.taskMgr.getAllTasks()),
+                "events": len(events),
+                "listeners": sum(len(messenger.whoAccepts(event)) for event in events),
+                "colliders": self.game.collisions.traverser.getNumColliders()}
+
+    def benchmarkRound(self, roundNumber):
+        '''
+        This method benchmarks a single round.
+
+        Parameters
+        ----------------------------------------------------
+        roundNumber: an integer representing the round to benchmark
+
+        Returns
+        ----------------------------------------------------
+        Returns a dictionary with the results of the round
+'''
+        self.clearRound()
+        pool = self.game.ghostPool
+        memoryBefore = getMemoryUsage()
+        createdBefore = pool.created
+
+        self.game.round = roundNumber
+        start = time.perf_counter()
+        self.game.setUpRound(self.task)
+        roundSetupMs = (time.perf_counter() - start)*1000
+
+        #spawns every wave of the round straight away instead of waiting for the scheduler, the spawn time includes the frame after it
+        start = time.perf_counter()
+        self.game.spawnDirector.spawnRemaining()
+        spawnMs = (time.perf_counter() - start)*1000 + self.step()
+        created = pool.created - createdBefore
+        memoryPerGhostKb = (getMemoryUsage() - memoryBefore)/created if created else None
+
+        for frame in range(self.warmup):
+            self.step()
+        frameTimes = np.array([self.step() for frame in range(self.frames)])
+
+        results = {"ghosts": self.game.ghostSystem.count,
+                   "meanMs": float(frameTimes.mean()),
+                   "p95Ms": float(np.percentile(frameTimes, 95)),
+                   "p99Ms": float(np.percentile(frameTimes, 99)),
+                   "roundSetupMs": roundSetupMs,
+                   "spawnMs": spawnMs,
+                   "memoryPerGhostKb": memoryPerGhostKb,
+                   "ghostsCreated": created}
+        results.update(self.getCounts())
+        return results
+
+    def run(self):
+        '''
+        This method runs the benchmark for every round and prints the results.
+
+        Returns
+        ----------------------------------------------------
+        Returns a dictionary with the settings of the benchmark, the node and draw call counts of the static scenery and the results of every round, the keys of the rounds are strings
+        so the dictionary can be saved as json
+'''
+        self.setUp()
+        results = {"frames": self.frames, "warmup": self.warmup, "timestep": self.timestep, "scenery": self.game.scenery.getStats(), "rounds": {}}
+        print(f"scenery: {results['scenery']}")
+        for roundNumber in self.rounds:
+            results["rounds"][str(roundNumber)] = self.benchmarkRound(roundNumber)
+            self.printRound(roundNumber, results["rounds"][str(roundNumber)])
+        return results
+
+    def printRound(self, roundNumber, result):
+        '''
+        Prints the results of a single round.
+'''
+        memory = "n/a" if result["memoryPerGhostKb"] is None else f"{result['memoryPerGhostKb']:.1f} KB"
+        print(f"round {roundNumber:>4} ({result['ghosts']} ghosts): mean {result['meanMs']:.3f} ms, p95 {result['p95Ms']:.3f} ms, p99 {result['p99Ms']:.3f} ms, "
+              f"setup {result['roundSetupMs']:.3f} ms, spawn {result['spawnMs']:.3f} ms, memory per ghost {memory}, "
+              f"tasks {result['tasks']}, events {result['events']}, listeners {result['listeners']}, colliders {result['colliders']}")
+
+
+def compareResults(results, baseline, tolerance = 0.25, slack = 0.5):
+    '''
+    This function compares the results of a benchmark with a baseline saved from an earlier run. Only the rounds that are in both
+    are compared. A timing is a regression if it is slower than the baseline by more than the tolerance plus the slack, a count is a regression
+    if it is higher than the baseline at all. The slack stops timings that are well under a millisecond from failing because of noise.
+
+    Parameters
+    ----------------------------------------------------
+    results: the dictionary returned by ScalingBenchmark.run
+    baseline: a dictionary returned by ScalingBenchmark.run on an earlier version of the game
+    tolerance: Default: 0.25, how much slower a timing can be than the baseline, 0.25 is 25% slower
+    slack: Default: 0.5, how much slower a timing can be than the baseline on top of the tolerance, in milliseconds
+
+    Returns
+    ----------------------------------------------------
+    Returns a list of strings, one describing each regression
+'''
+    regressions = []
+    for roundNumber, result in results["rounds"].items():
+        if roundNumber not in baseline["rounds"]:
+            continue
+        old = baseline["rounds"][roundNumber]
+        for metric in ScalingBenchmark.TIMED_METRICS:
+            if result.get(metric) is None or old.get(metric) is None:
+                continue
+            if result[metric] > old[metric]*(1 + tolerance) + slack:
+                regressions.append(f"round {roundNumber}: {metric} went from {old[metric]:.3f} to {result[metric]:.3f}")
+        for metric in ScalingBenchmark.COUNTED_METRICS:
+            if metric in old and result[metric] > old[metric]:
+                regressions.append(f"round {roundNumber}: {metric} went from {old[metric]} to {result[metric]}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Ghost Survival scaling benchmark")
+    parser.add_argument("--rounds", type = int, nargs = "+", default = list(ScalingBenchmark.DEFAULT_ROUNDS), help = "rounds to benchmark")
+    parser.add_argument("--frames", type = int, default = 300, help = "frames measured for every round")
+    parser.add_argument("--warmup", type = int, default = 30, help = "frames run before measuring every round")
+    parser.add_argument("--timestep", type = float, default = 1/60, help = "seconds of game time simulated each frame")
+    parser.add_argument("--output", help = "json file the results are saved to")
+    parser.add_argument("--baseline", help = "json file of an earlier run to compare the results with")
+    parser.add_argument("--tolerance", type = float, default = 0.25, help = "how much slower than the baseline a timing can be, 0.25 is 25%%")
+    parser.add_argument("--slack", type = float, default = 0.5, help = "milliseconds a timing can be slower than the baseline on top of the tolerance")
+    args = parser.parse_args()
+
+    game = MyGame(headless = True)
+    results = ScalingBenchmark(game, rounds = args.rounds, frames = args.frames, warmup = args.warmup, timestep = args.timestep).run()
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent = 2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compareResults(results, baseline, args.tolerance, args.slack)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("no regressions compared to the baseline")
@@ -0,0 +1,125 @@
+from direct.gui.OnscreenImage import OnscreenImage
+from panda3d.core import TransparencyAttrib
+
+import game
+
+
+class DamageHud():
+
+    #the overlay shown at each damage tier, tier 0 is full health and has no overlay
+    TIER_IMAGES = (None, r"assets/bloodSplatterOne.png", r"assets/bloodSplatterTwo.png")
+
+    def __init__(self, fadeTime = 0.25):
+        '''
+        Initialization for the DamageHud class. The damage hud is the bloody overlay that is put over the screen when the player is hurt, it gets
+        bloodier as the health of the player goes down. The overlay textures are loaded once, and the overlay is drawn on two quads that are
+        created once and kept for the whole game. Nothing is done while the health of the player stays in the same tier, when the tier changes the
+        new overlay fades in on one quad while the old overlay fades out on the other one.
+
+        Parameters
+        ----------------------------------------------------
+        fadeTime: Default: 0.25, the number of seconds it takes an overlay to fade in or out
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.fadeTime = fadeTime
+        self.textures = [None if image is None else game.gameObj.loader.loadTexture(image) for image in self.TIER_IMAGES]
+
+        #the quads the overlays are drawn on, the first one is the overlay of the current tier and the second one is the overlay that is fading out
+        self.layers = []
+        for num in range(2):
+            layer = OnscreenImage(image = self.textures[1], pos = (0,0,0), scale = (1.7778,1,1))
+            layer.setTransparency(TransparencyAttrib.MAlpha)
+            layer.setAlphaScale(0)
+            layer.hide()
+            self.layers.append(layer)
+
+        #the alpha of each quad and the alpha it is fading towards
+        self.alpha = [0.0, 0.0]
+        self.targetAlpha = [0.0, 0.0]
+        self.tier = 0
+
+    def getTier(self, health):
+        '''
+        Returns the damage tier of a health, 0 at full health, 1 at 10 health or below and 2 at 5 health or below.
+'''
+        if health <= 5:
+            return 2
+        if health <= 10:
+            return 1
+        return 0
+
+    def setHealth(self, health):
+        '''
+        This method is called every tick with the health of the player, it only changes the overlay when the health has moved into a new tier.
+
+        Parameters
+        ----------------------------------------------------
+        health: the health of the player
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        tier = self.getTier(health)
+        if tier == self.tier:
+            return
+        self.tier = tier
+
+        #the overlay that was showing becomes the one that fades out, and the new overlay fades in on the other quad
+        self.layers.reverse()
+        self.alpha.reverse()
+        self.targetAlpha[1] = 0.0
+        if self.textures[tier] is None:
+            self.targetAlpha[0] = 0.0
+        else:
+            #only the texture of the quad is swapped, setImage would create a new quad
+            self.layers[0].setTexture(self.textures[tier], 1)
+            self.layers[0].show()
+            self.alpha[0] = 0.0
+            self.targetAlpha[0] = 1.0
+
+        if not game.gameObj.taskMgr.hasTaskNamed("damageHudFade"):
+            game.gameObj.taskMgr.add(self.fade, "damageHudFade")
+
+    def fade(self, task):
+        '''
+        This is a task that moves the alpha of each quad towards its target alpha, it is only running while an overlay is fading.
+        Quads that have faded out are hidden.
+
+        Parameters
+        ----------------------------------------------------
+        task: task object from direct.task
+
+        Returns
+        ----------------------------------------------------
+        returns task.cont while an overlay is still fading, and task.done once every overlay has reached its target alpha
+'''
+        step = globalClock.getDt()/self.fadeTime if self.fadeTime > 0 else 1.0
+        fading = False
+        for num, layer in enumerate(self.layers):
+            alpha, target = self.alpha[num], self.targetAlpha[num]
+            if alpha < target:
+                alpha = min(alpha + step, target)
+            elif alpha > target:
+                alpha = max(alpha - step, target)
+            self.alpha[num] = alpha
+            layer.setAlphaScale(alpha)
+            if alpha == 0:
+                layer.hide()
+            fading = fading or alpha != target
+        return task.cont if fading else task.done
+
+    def reset(self):
+        '''
+        This method removes the overlay straight away, without fading it out. It is called when the player dies and at the start of every game.
+'''
+        game.gameObj.taskMgr.remove("damageHudFade")
+        for num, layer in enumerate(self.layers):
+            layer.setAlphaScale(0)
+            layer.hide()
+            self.alpha[num] = 0.0
+            self.targetAlpha[num] = 0.0
+        self.tier = 0
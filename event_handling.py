@@ -1,5 +1,4 @@
 from direct.showbase import DirectObject
-from timer import Timer
 
 
 '''
@@ -9,6 +8,8 @@ from microbit import *
 while True:
     gesture = accelerometer.current_gesture()
     print(gesture)
+
+For the binary protocol, the code to have in the Microbit is in accel_protocol.py
 '''
 class Handler(DirectObject.DirectObject):
     def __init__(self):
@@ -26,22 +27,22 @@ class Handler(DirectObject.DirectObject):
         #messenger.toggleVerbose()
         
         #event for when WASD is pressed
-        self.accept("w", self.changeKeyMap, ["w"])
-        self.accept("s", self.changeKeyMap, ["s"])
-        self.accept("a", self.changeKeyMap, ["a"])
-        self.accept("d", self.changeKeyMap, ["d"])
+        self.accept("w", self.changeKeyMap, ["w", True])
+        self.accept("s", self.changeKeyMap, ["s", True])
+        self.accept("a", self.changeKeyMap, ["a", True])
+        self.accept("d", self.changeKeyMap, ["d", True])
         
         #events for when WASD is no longer being pressed
-        self.accept("w-up", self.changeKeyMap, ["w"])
-        self.accept("s-up", self.changeKeyMap, ["s"])
-        self.accept("a-up", self.changeKeyMap, ["a"])
-        self.accept("d-up", self.changeKeyMap, ["d"])
+        self.accept("w-up", self.changeKeyMap, ["w", False])
+        self.accept("s-up", self.changeKeyMap, ["s", False])
+        self.accept("a-up", self.changeKeyMap, ["a", False])
+        self.accept("d-up", self.changeKeyMap, ["d", False])
         
-        self.accept("escape", self.changeKeyMap, ["escape"])
-        self.accept("escape-up", self.changeKeyMap, ["escape"])
+        self.accept("escape", self.changeKeyMap, ["escape", True])
+        self.accept("escape-up", self.changeKeyMap, ["escape", False])
         
-        self.accept("mouse1", self.changeKeyMap, ["mouse1"])
-        self.accept("mouse1-up", self.changeKeyMap, ["mouse1"])
+        self.accept("mouse1", self.changeKeyMap, ["mouse1", True])
+        self.accept("mouse1-up", self.changeKeyMap, ["mouse1", False])
         
         #dictionary containing a boolean value for WASD, escape and left mouse button
         #
@@ -52,24 +53,14 @@ class Handler(DirectObject.DirectObject):
                        "escape": False,
                        "mouse1" : False}
         
-        #list for axe hitting ghosts
-        #the boolean value for a specific ghost is the same indice as the ghostNumber
-        self.ghostAxeList = [False, False]
-        
-        #list for ghost hitting the player
-        #the pair of boolean and timer for a specific ghost is the same indice as the ghostnumber
-        self.ghostHitList = [[False, Timer()], [False, Timer()]]
-        
-        #boolean for checking if the axe has hit any ghost
-        self.axeCollision = False
+        #the strength of the current (or last) swing of the microbit, between 0 and 1, only changed by the binary protocol
+        #it starts as an average swing, so the axe does the same damage as a mouse click until the microbit is swung
+        self.swingStrength = 0.5
         
-        self.ghostToGhostEventList = []
-        
-        #list representing which ghost a ghost is colliding with
-        #if ghost 0 is colliding with ghost 3, it would be represented by this:
-        #self.ghostToGhostColliding[0] == 3
-        #-1 is the value to represent if the ghost is not colliding with any ghost
-        self.ghostToGhostColliding = [-1,-1]
+        #a swing of the microbit is held down until a tick of the game has seen it, so a swing shorter than a frame is not lost
+        #swingHeld is True until a tick sees the swing, and swingReleased is True if the swing ended before that
+        self.swingHeld = False
+        self.swingReleased = False
 
     def translateMicrobitEvent(self, microbitEvent):
         '''
@@ -94,63 +85,80 @@ class Handler(DirectObject.DirectObject):
                 self.keyMap["mouse1"] = True
     
 
-    def changeKeyMap(self, key):
+    def translateSwingEvent(self, swingEvent, strength):
         '''
-        This method is called whenever WASD, escape or left mouse button is clicked. It toggles the keyMap boolean for
-        that key. For example if w is pressed, then the key parameter of the method is 'w' and it accesses the boolean at
-        self.keyMap["w"]
+        This method is used to take the swing events decoded from the accelerometer frames of the microbit (see accel_protocol.py).
+        A swing start is treated the same as the microbit facing down, and it uses the same keyMap entry that the left mouse button would use.
+        The strength of the swing is kept every time it changes, and the swing is let go when it ends. All the events that arrived since the last
+        frame are passed through at once, so if a swing starts and ends before any tick has seen it, it is let go once a tick has seen it (see releaseSwing).
         
         Parameters
         ----------------------------------------------------
-        key: representing which value in the dictionary to change
+        swingEvent: a string, either "swing start", "swing strength" or "swing end"
+        strength: the strength of the swing so far between 0 and 1
         
         Returns
         ----------------------------------------------------
         None
 '''
-        self.keyMap[key] = not self.keyMap[key]
-    
-    def collisions(self, objectName, objectNum, entry):
+        self.swingStrength = strength
+        if swingEvent == "swing start":
+            self.keyMap["mouse1"] = True
+            self.swingHeld = True
+            self.swingReleased = False
+        elif swingEvent == "swing end":
+            if self.swingHeld:
+                self.swingReleased = True
+            else:
+                self.keyMap["mouse1"] = False
+
+    def swingSeen(self):
         '''
-        This method is called whenever a collision event between a ghost and the axe is thrown or a collision
-        event between a ghost and player is thrown.
-        
-        If the object the ghost is colliding with is the axe, it will toggle the axeCollision variable and it will
-        toggle the boolean value in ghostAxeList for that ghost.
-        If the object the ghost is colliding with is the player, then it will toggle the boolean at that specific ghosts'
-        indice
+        This method is called by the axe every tick once it has looked at the left mouse button, it marks the swing of the microbit as seen.
+        A swing that ended before it was seen is let go at the start of the next frame (see releaseSwing).
         
         Parameters
         ----------------------------------------------------
-        objectName: the name of the object, either "axe" or "player"
-        objectNum: an integer representing the ghostNumber of the ghost that is colliding with the axe or the player
-        entry: redundant parameter, any event thrown by a collision needs this extra parameter
+        None
         
         Returns
         ----------------------------------------------------
         None
+'''
+        self.swingHeld = False
+
+    def releaseSwing(self):
+        '''
+        This method is called by the fixed step loop at the start of every frame, before the input of the frame is recorded. It lets go of a
+        swing of the microbit that ended before a tick saw it, once a tick has seen it. The swing is only let go between frames, so every tick
+        of a frame sees the same keys, which are the keys written to the input log.
+        
+        Parameters
+        ----------------------------------------------------
+        None
         
+        Returns
+        ----------------------------------------------------
+        None
 '''
-        if objectName == "axe":
-            self.ghostAxeList[objectNum] = not self.ghostAxeList[objectNum]
-            self.axeCollision = not self.axeCollision
-        if objectName == "player":
-            self.ghostHitList[objectNum][0] = not self.ghostHitList[objectNum][0]
-            
-    def ghostToGhost(self, ghostOne, ghostTwo, entry):
+        if self.swingReleased and not self.swingHeld:
+            self.swingReleased = False
+            self.keyMap["mouse1"] = False
+        
+    def changeKeyMap(self, key, pressed):
         '''
-        This method is called when a ghost collides with another ghost. All it does is change the ghostNumber currently
-        stored at the colliding ghost's indice in ghostToGhostColliding
+        This method is called whenever WASD, escape or left mouse button is pressed or let go. It sets the keyMap boolean for
+        that key. For example if w is pressed, then the key parameter of the method is 'w' and pressed is True, and it sets the boolean at
+        self.keyMap["w"] to True. The value is set instead of toggled, so a key that was let go of while its keyMap entry was reset
+        (at the start of a game) does not end up stuck down.
         
         Parameters
         ----------------------------------------------------
-        ghostOne: an integer representing the ghostnumber of the colliding ghost
-        ghostTwo: an integer representing the ghost number of the ghost the colliding ghost is colliding with.
-        entry: redundant, unused parameter.
+        key: representing which value in the dictionary to change
+        pressed: True if the key was pressed, False if it was let go
         
         Returns
         ----------------------------------------------------
         None
 '''
-        self.ghostToGhostColliding[ghostOne] = ghostTwo
-        
\ No newline at end of file
+        self.keyMap[key] = pressed
@@ -0,0 +1,192 @@
+import argparse
+import threading
+import random
+import time
+import os
+
+from accel_protocol import encodeFrame
+
+
+class FakeMicrobit():
+
+    #the accelerometer reading sent for each gesture with the binary protocol, face down is sent as a swing
+    READINGS = {"face up": (0, 0, -1000), "face down": (1800, 2400, 1200)}
+
+    def __init__(self, rate = 50, protocol = "text", tornRate = 0.0, garbageRate = 0.0, seed = None):
+        '''
+        Initialization for the FakeMicrobit class. The fake micro:bit stands in for a real micro:bit, so the serial reading of the game can be run
+        without one. It opens a pseudo-terminal, which is a serial port that only exists in software, and writes a stream of gestures into it
+        at a steady rate. The game opens the other end of the pseudo-terminal, its device, like any other serial port. Pseudo-terminals only
+        exist on linux and macOS.
+
+        To make the stream more like a real serial line, lines or frames can be torn into two writes with a short pause between them, and garbage
+        bytes can be written between them.
+
+        Parameters
+        ----------------------------------------------------
+        rate: Default: 50, the number of lines (or frames with the binary protocol) written every second, 0 writes them as fast as possible
+        protocol: Default: "text", "text" to write the gesture names, or "binary" to write accelerometer frames (see accel_protocol.py)
+        tornRate: Default: 0.0, the chance that a line is torn into two writes
+        garbageRate: Default: 0.0, the chance that garbage bytes are written before a line
+        seed: Default: None, the seed of the random numbers, so a stream can be repeated
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        import pty
+        import tty
+
+        self.rate = rate
+        self.protocol = protocol
+        self.tornRate = tornRate
+        self.garbageRate = garbageRate
+        self.random = random.Random(seed)
+
+        self.master, self.slave = pty.openpty()
+        #raw mode, so the line endings and bytes written are not changed by the terminal
+        tty.setraw(self.slave)
+        self.device = os.ttyname(self.slave)
+
+        self.sequence = 0
+        self.written = 0
+        self.stopping = threading.Event()
+        self.thread = None
+
+    def encode(self, gesture):
+        '''
+        Returns the bytes of one line (or frame) for a gesture.
+'''
+        if self.protocol == "binary":
+            frame = encodeFrame(self.sequence, *self.READINGS[gesture])
+            self.sequence = (self.sequence + 1) & 255
+            return frame
+        return f"{gesture}\r\n".encode()
+
+    def write(self, gesture):
+        '''
+        This method writes one line (or frame) for a gesture, tearing it or adding garbage before it depending on the rates.
+
+        Parameters
+        ----------------------------------------------------
+        gesture: the gesture, "face up" or "face down"
+
+        Returns
+        ----------------------------------------------------
+        Returns the time (from time.perf_counter) the line was finished being written
+'''
+        data = self.encode(gesture)
+        if self.random.random() < self.garbageRate:
+            os.write(self.master, bytes(self.random.randrange(256) for num in range(self.random.randint(1, 8))))
+        if len(data) > 1 and self.random.random() < self.tornRate:
+            split = self.random.randint(1, len(data) - 1)
+            os.write(self.master, data[:split])
+            time.sleep(0.001)
+            data = data[split:]
+        os.write(self.master, data)
+        self.written += 1
+        return time.perf_counter()
+
+    def play(self, script, loop = False):
+        '''
+        This method writes a script of gestures at the rate of the fake micro:bit, it returns once the script is done or stop is called.
+
+        Parameters
+        ----------------------------------------------------
+        script: a list of tuples of a gesture and the number of seconds to send it for
+        loop: Default: False, if True the script is played again and again until stop is called
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        interval = 1/self.rate if self.rate > 0 else 0.0
+        nextWrite = time.perf_counter()
+        while not self.stopping.is_set():
+            for gesture, seconds in script:
+                end = time.perf_counter() + seconds
+                while time.perf_counter() < end and not self.stopping.is_set():
+                    self.write(gesture)
+                    nextWrite += interval
+                    delay = nextWrite - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    else:
+                        nextWrite = time.perf_counter()
+            if not loop:
+                return
+
+    def randomScript(self, count = 100):
+        '''
+        Returns a script of random gestures, each one sent for between a tenth of a second and a second.
+'''
+        return [(self.random.choice(("face up", "face down")), self.random.uniform(0.1, 1.0)) for num in range(count)]
+
+    def start(self, script = None, loop = True):
+        '''
+        This method plays a script on a background thread, a random script if no script is given.
+'''
+        if script is None:
+            script = self.randomScript()
+        self.stopping.clear()
+        self.thread = threading.Thread(target = self.play, args = (script, loop), name = "fakeMicrobit", daemon = True)
+        self.thread.start()
+
+    def stop(self):
+        '''
+        This method stops the background thread if it is running.
+'''
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join(1.0)
+            self.thread = None
+
+    def close(self):
+        '''
+        This method stops the fake micro:bit and closes the pseudo-terminal, the game sees it as the micro:bit being unplugged.
+'''
+        self.stop()
+        os.close(self.master)
+        os.close(self.slave)
+
+
+def loadScript(path):
+    '''
+    This function loads a script of gestures from a file. Every line of the file is a gesture and the number of seconds to send it for,
+    like "face down 0.5". Empty lines and lines starting with # are skipped.
+
+    Parameters
+    ----------------------------------------------------
+    path: the path to the file
+
+    Returns
+    ----------------------------------------------------
+    Returns the script, a list of tuples of a gesture and a number of seconds
+'''
+    script = []
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                gesture, seconds = line.rsplit(None, 1)
+                script.append((gesture, float(seconds)))
+    return script
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Fake micro:bit on a pseudo-terminal")
+    parser.add_argument("--rate", type = float, default = 50, help = "lines written every second")
+    parser.add_argument("--protocol", choices = ("text", "binary"), default = "text", help = "protocol of the micro:bit")
+    parser.add_argument("--torn", type = float, default = 0.0, help = "chance that a line is torn into two writes")
+    parser.add_argument("--garbage", type = float, default = 0.0, help = "chance that garbage is written before a line")
+    parser.add_argument("--seed", type = int, help = "seed of the random gestures")
+    parser.add_argument("--script", help = "file of gestures to play instead of random gestures")
+    args = parser.parse_args()
+
+    fake = FakeMicrobit(rate = args.rate, protocol = args.protocol, tornRate = args.torn, garbageRate = args.garbage, seed = args.seed)
+    print(f"fake micro:bit on {fake.device}, run the game with GHOST_SURVIVAL_MICROBIT={fake.device}")
+    try:
+        fake.play(loadScript(args.script) if args.script else fake.randomScript(), loop = True)
+    except KeyboardInterrupt:
+        pass
+    fake.close()
@@ -0,0 +1,147 @@
+from panda3d.core import ConfigVariableDouble
+from panda3d.core import ConfigVariableInt
+
+import game
+
+#the tick rate and the catch-up cap can be changed in config/conf.prc, lowering the tick rate makes the game cheaper to run
+#without changing how fast anything moves, since every tick simulates exactly 1/tickRate seconds
+simTickRate = ConfigVariableDouble("sim-tick-rate", 60)
+simMaxTicks = ConfigVariableInt("sim-max-ticks", 5)
+
+
+def lerpAngle(start, end, alpha):
+    '''
+    This function interpolates between two angles in degrees, going the short way around the circle.
+    It works on single numbers and on numpy arrays.
+
+    Parameters
+    ----------------------------------------------------
+    start: the angle at alpha = 0
+    end: the angle at alpha = 1
+    alpha: a number between 0 and 1
+
+    Returns
+    ----------------------------------------------------
+    Returns the interpolated angle
+'''
+    return start + ((end - start + 180) % 360 - 180)*alpha
+
+
+class FixedStepLoop():
+    def __init__(self, tickRate = None, maxTicks = None):
+        '''
+        Initialization for the FixedStepLoop class. The fixed step loop runs the simulation of the game (the player, the ghosts, the spawning
+        and the collisions) at a fixed number of ticks per second, no matter how fast the game is being rendered.
+        Before, every task moved things by the time since the last frame, so a long frame made the ghosts jump and could let the axe pass
+        straight through a ghost without colliding with it.
+
+        Every frame the time since the last frame is added to an accumulator, then the systems are ticked, in the order they were added,
+        once for every whole tick in the accumulator. During a tick game.gameObj.dt is always exactly one tick long. If the game falls so far behind
+        that it would need more than maxTicks ticks in one frame, the extra time is dropped so the game slows down instead of freezing.
+
+        The time left over in the accumulator is less than one tick, so the rendered transforms would be up to a tick behind. Instead, every object
+        added with addInterpolated saves its state before each tick and is drawn between its last two states, depending on how much of the next
+        tick has passed.
+
+        Parameters
+        ----------------------------------------------------
+        tickRate: Default: None, the number of ticks per second, if None it is read from sim-tick-rate in config/conf.prc
+        maxTicks: Default: None, the most ticks that can be run in one frame, if None it is read from sim-max-ticks in config/conf.prc
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.step = 1/(tickRate or simTickRate.getValue())
+        self.maxTicks = maxTicks or simMaxTicks.getValue()
+
+        #dictionary of the systems ticked by the loop, from their name to the function that ticks them.
+        #every system is a task function, it is given the task of the loop and returns task.cont
+        self.systems = {}
+
+        #objects that are drawn between their last two states, each one has a saveState and an interpolate method
+        self.interpolated = []
+        self.interpolate = True
+
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.running = True
+
+    def addSystem(self, name, function):
+        '''
+        Adds a system to the end of the tick order.
+
+        Parameters
+        ----------------------------------------------------
+        name: a string, the name of the system, this is the name the system used to have as a task
+        function: a task function that ticks the system
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.systems[name] = function
+
+    def removeSystem(self, name):
+        '''
+        Removes a system from the loop, if the loop is in the middle of a tick the system is not ticked again.
+'''
+        self.systems.pop(name, None)
+
+    def addInterpolated(self, obj):
+        '''
+        Adds an object that is drawn between its last two states, it needs a saveState method and an interpolate method that takes alpha.
+'''
+        self.interpolated.append(obj)
+
+    def stop(self):
+        '''
+        Stops the loop, it is called when the game ends. Any tick in progress is not finished and nothing is interpolated afterwards.
+'''
+        self.running = False
+        self.systems = {}
+        self.interpolated = []
+
+    def update(self, task):
+        '''
+        This is a task that adds the frame time to the accumulator, ticks the systems for every whole tick in the accumulator, then draws
+        the interpolated objects.
+
+        Parameters
+        ----------------------------------------------------
+        task: task object from direct.task
+
+        Returns
+        ----------------------------------------------------
+        returns task.cont which indicates that the task needs to be called again.
+'''
+        #the game clock gives the game time of the frame, which is zero while the game is paused
+        gameClock = game.gameObj.gameClock
+        #a swing of the microbit that ended before a tick saw it is let go between frames, so it is in the input that is recorded
+        game.gameObj.events.releaseSwing()
+        #the input of the frame is recorded, or replaced by the recorded input when a game is being replayed (see input_log.py)
+        if game.gameObj.inputLog is not None:
+            game.gameObj.inputLog.update()
+        self.accumulator += gameClock.dt
+        if self.accumulator > self.step*self.maxTicks:
+            #the game has fallen behind, the time that cannot be caught up on is dropped
+            self.accumulator = self.step*self.maxTicks
+
+        game.gameObj.dt = self.step
+        while self.running and self.accumulator >= self.step:
+            for obj in self.interpolated:
+                obj.saveState()
+            #moves the game time forward one step, which calls every scheduled function that is due this tick
+            gameClock.advance(self.step)
+            for name, function in list(self.systems.items()):
+                #a system can end the game or remove another system partway through a tick
+                if name in self.systems:
+                    function(task)
+            self.accumulator -= self.step
+            self.ticks += 1
+
+        if self.running and self.interpolate:
+            alpha = self.accumulator/self.step
+            for obj in self.interpolated:
+                obj.interpolate(alpha)
+        return task.cont
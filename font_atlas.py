@@ -0,0 +1,140 @@
+from asset_pipeline import resolveModel
+
+import argparse
+import subprocess
+import json
+import time
+import os
+
+import game
+
+
+#the folder the font atlases are written to
+FONT_DIR = "assets/fonts"
+
+#every character that is put into the atlas, all of the printable ascii characters. Every piece of text in the game only uses these
+ATLAS_CHARS = "".join(chr(code) for code in range(32, 127))
+
+
+def getAtlasPaths(fontPath):
+    '''
+    This function returns the path of the atlas of a font and the path of the json file that describes it.
+'''
+    name = os.path.splitext(os.path.basename(fontPath))[0]
+    return f"{FONT_DIR}/{name}.egg", f"{FONT_DIR}/{name}.json"
+
+
+def buildFontAtlas(fontPath = "assets/mrsmonster.ttf", chars = ATLAS_CHARS, pixelsPerUnit = 50, force = False):
+    '''
+    This function is the build step of the font atlas. It renders every character in chars into a texture with egg-mkfont, which comes with panda3d,
+    and writes an egg file that places each glyph on the texture. Next to it, it writes a json file with the characters in the atlas and the size and
+    modification time of the font file, so the game can tell if the atlas is out of date. The egg file is converted to a bam file by the asset pipeline
+    like any other model.
+
+    Parameters
+    ----------------------------------------------------
+    fontPath: Default: "assets/mrsmonster.ttf", the path of the font file
+    chars: Default: ATLAS_CHARS, a string of every character to put into the atlas
+    pixelsPerUnit: Default: 50, the number of pixels in the texture for each unit of height of the text, higher is sharper but uses more texture memory
+    force: Default: False, if True the atlas is built again even if it is up to date
+
+    Returns
+    ----------------------------------------------------
+    Returns the path of the egg file of the atlas
+'''
+    atlasPath, infoPath = getAtlasPaths(fontPath)
+    stat = os.stat(fontPath)
+    info = {"source": fontPath, "size": stat.st_size, "mtime": stat.st_mtime, "pixelsPerUnit": pixelsPerUnit, "chars": chars}
+
+    if not force and os.path.exists(atlasPath) and readAtlasInfo(infoPath) == info:
+        print(f"{atlasPath} is up to date")
+        return atlasPath
+
+    #egg-mkfont writes the texture into the folder it is run from, so it is run from the folder of the atlas
+    os.makedirs(FONT_DIR, exist_ok = True)
+    codes = ",".join(str(ord(char)) for char in chars)
+    start = time.perf_counter()
+    subprocess.run(["egg-mkfont", "-chars", codes, "-ppu", str(pixelsPerUnit), "-o", os.path.basename(atlasPath), os.path.abspath(fontPath)],
+                   cwd = FONT_DIR, check = True, stdout = subprocess.DEVNULL)
+    with open(infoPath, "w") as file:
+        json.dump(info, file, indent = 2)
+    print(f"built {atlasPath} with {len(chars)} glyphs in {(time.perf_counter() - start)*1000:.0f} ms")
+    return atlasPath
+
+
+def readAtlasInfo(infoPath):
+    '''
+    This function reads the json file that describes a font atlas, if there is no json file it returns None.
+'''
+    try:
+        with open(infoPath) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+class GameFont():
+    def __init__(self, fontPath):
+        '''
+        Initialization for the GameFont class. The game font is the font every piece of text in the game is written in. A font file like a ttf is
+        rendered while the game is running, each glyph is rendered into a texture the first time it is used at each size, which can stall a frame
+        when new text is shown. If the font atlas has been built (see buildFontAtlas), every glyph has already been rendered into a texture, so the
+        atlas is used instead. The font file is only loaded if some text has a character that is not in the atlas, or if there is no atlas
+        or it is out of date.
+
+        Parameters
+        ----------------------------------------------------
+        fontPath: the path of the font file
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.fontPath = fontPath
+        self.dynamic = None
+        self.atlas = None
+        self.chars = frozenset()
+
+        atlasPath, infoPath = getAtlasPaths(fontPath)
+        info = readAtlasInfo(infoPath)
+        stat = os.stat(fontPath)
+        if info is not None and os.path.exists(atlasPath) and info["size"] == stat.st_size and info["mtime"] == stat.st_mtime:
+            self.atlas = game.gameObj.loader.loadFont(resolveModel(atlasPath))
+            self.chars = frozenset(info["chars"])
+
+        #the font that text is written in unless it needs a character that is not in the atlas
+        self.default = self.atlas if self.atlas is not None else self.getDynamic()
+
+    def getDynamic(self):
+        '''
+        Returns the font loaded from the font file, which can render any character the font has. It is loaded the first time it is needed.
+'''
+        if self.dynamic is None:
+            self.dynamic = game.gameObj.loader.loadFont(self.fontPath)
+        return self.dynamic
+
+    def fontFor(self, text):
+        '''
+        This method returns the font that a piece of text should be written in. It is the atlas if the atlas has every character of the text,
+        otherwise it is the font loaded from the font file.
+
+        Parameters
+        ----------------------------------------------------
+        text: the text that is going to be written
+
+        Returns
+        ----------------------------------------------------
+        Returns a font object
+'''
+        if self.atlas is not None and self.chars.issuperset(text):
+            return self.atlas
+        return self.getDynamic()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Renders the game font into a font atlas, run the asset pipeline afterwards to convert it to a bam file")
+    parser.add_argument("--font", default = "assets/mrsmonster.ttf", help = "the font file to render")
+    parser.add_argument("--ppu", type = int, default = 50, help = "pixels per unit of text height")
+    parser.add_argument("--force", action = "store_true", help = "build the atlas again, even if it is up to date")
+    args = parser.parse_args()
+    buildFontAtlas(args.font, pixelsPerUnit = args.ppu, force = args.force)
@@ -0,0 +1,218 @@
+from direct.showbase import DirectObject
+from direct.gui.OnscreenText import OnscreenText
+from panda3d.core import PStatCollector
+from panda3d.core import PStatClient
+from panda3d.core import TextNode
+
+import game
+import time
+
+
+#table of every system that is timed, in the order they are shown on the overlay. Each system has the name of its PStats collector,
+#systems that are called from inside another system have their collector under the collector of that system so PStats nests them.
+#every collector is put under "App:Show code", which is where PStats puts the time spent running python code
+PROFILED_SYSTEMS = {"mainGame": "Ghost Survival:MyGame.mainGame",
+                    "updatePlayer": "Ghost Survival:Player.updatePlayer",
+                    "checkDamage": "Ghost Survival:Player.updatePlayer:Player.checkDamage",
+                    "axeUpdate": "Ghost Survival:Player.updatePlayer:Axe.update",
+                    "updateGhosts": "Ghost Survival:Ghosts",
+                    "spawnDirector": "Ghost Survival:SpawnDirector.update",
+                    "processCollisions": "Ghost Survival:Collision traversal",
+                    "roundSetup": "Ghost Survival:MyGame.setUpRound",
+                    "updateMicrobit": "Ghost Survival:MyGame.updateMicrobit"}
+
+#the length of a frame at 60 frames per second, in milliseconds
+FRAME_BUDGET = 1000/60
+
+
+class FrameProfiler(DirectObject.DirectObject):
+    def __init__(self, toggleKey = "f3", refreshRate = 0.5):
+        '''
+        Initialization for the FrameProfiler class. The frame profiler times each system of the game, so it can be seen where the time of a frame goes.
+        The time of each system is sent to its own PStats collector (see PROFILED_SYSTEMS), which shows up in PStats when want-pstats is turned on
+        in config/conf.prc, and pressing the toggle key shows an overlay with the milliseconds each system takes per frame compared to the frame budget.
+
+        The systems are timed by replacing them with a wrapped version while profiling, and putting the original back when profiling stops,
+        so when the overlay is hidden and PStats is not connected the game runs exactly the same code as it would without the profiler.
+
+        Parameters
+        ----------------------------------------------------
+        toggleKey: Default: "f3", the key that shows and hides the overlay
+        refreshRate: Default: 0.5, the number of seconds between updates of the overlay, the times shown are averaged over this period
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        super().__init__()
+        self.refreshRate = refreshRate
+        self.collectors = {name: PStatCollector(f"App:Show code:{collectorName}") for name, collectorName in PROFILED_SYSTEMS.items()}
+
+        #time spent in each system since the overlay was last updated
+        self.totals = {name: 0.0 for name in PROFILED_SYSTEMS}
+        self.frames = 0
+        self.lastRefresh = time.perf_counter()
+
+        #functions that put back the original of every system that has been wrapped
+        self.restores = []
+        self.profiling = False
+
+        self.showOverlay = False
+        self.overlay = None
+        self.accept(toggleKey, self.toggleOverlay)
+
+    def timed(self, name, function):
+        '''
+        This method wraps a function so that every call is timed by the collector of name and added to the total of name.
+
+        Parameters
+        ----------------------------------------------------
+        name: the name of the system in PROFILED_SYSTEMS
+        function: the function to wrap
+
+        Returns
+        ----------------------------------------------------
+        Returns the wrapped function
+'''
+        collector = self.collectors[name]
+        totals = self.totals
+        def timedFunction(*args):
+            collector.start()
+            start = time.perf_counter()
+            result = function(*args)
+            totals[name] += time.perf_counter() - start
+            collector.stop()
+            return result
+        return timedFunction
+
+    def wrapMethod(self, obj, attribute, name):
+        '''
+        Replaces a method of an object with a timed version. The timed version is stored on the object itself, so deleting it puts the method
+        of the class back.
+'''
+        setattr(obj, attribute, self.timed(name, getattr(obj, attribute)))
+        self.restores.append(lambda: delattr(obj, attribute))
+
+    def wrapSystem(self, simLoop, name):
+        '''
+        Replaces a system of the fixed step loop with a timed version.
+'''
+        if name not in simLoop.systems:
+            return
+        original = simLoop.systems[name]
+        simLoop.systems[name] = self.timed(name, original)
+        def restore():
+            #the system may have been removed since it was wrapped, for example updatePlayer when the player dies
+            if name in simLoop.systems:
+                simLoop.systems[name] = original
+        self.restores.append(restore)
+
+    def wrapTask(self, name):
+        '''
+        Replaces the function of every task with this name with a timed version.
+'''
+        for task in game.gameObj.taskMgr.getTasksNamed(name):
+            original = task.getFunction()
+            task.setFunction(self.timed(name, original))
+            self.restores.append(lambda task = task, original = original: task.setFunction(original))
+
+    def attach(self):
+        '''
+        This method is called whenever a game is started, since the fixed step loop is created again every game.
+        The systems of the last game are put back first, then if the overlay is showing or PStats is connected, it wraps every system of the new game.
+
+        Parameters
+        ----------------------------------------------------
+        None
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.stopProfiling()
+        if self.showOverlay or PStatClient.isConnected():
+            self.startProfiling()
+
+    def startProfiling(self):
+        '''
+        Wraps every system of the game that is currently running.
+'''
+        gameObj = game.gameObj
+        if self.profiling or gameObj.simLoop is None or not gameObj.simLoop.running:
+            return
+        self.profiling = True
+        for name in ("mainGame", "updatePlayer", "updateGhosts", "spawnDirector", "processCollisions"):
+            self.wrapSystem(gameObj.simLoop, name)
+        self.wrapMethod(gameObj.player, "checkDamage", "checkDamage")
+        self.wrapMethod(gameObj.player.axe, "update", "axeUpdate")
+        self.wrapMethod(gameObj, "setUpRound", "roundSetup")
+        self.wrapTask("updateMicrobit")
+
+    def stopProfiling(self):
+        '''
+        Puts the original of every wrapped system back.
+'''
+        for restore in self.restores:
+            restore()
+        self.restores = []
+        self.profiling = False
+
+    def toggleOverlay(self):
+        '''
+        This method is called when the toggle key is pressed. It shows or hides the overlay, the systems are only timed while the overlay
+        is showing, unless PStats is connected.
+'''
+        self.showOverlay = not self.showOverlay
+        if self.showOverlay:
+            self.overlay = OnscreenText(text = "", pos = (-1.7, 0.9), scale = 0.045, fg = (1,1,1,1), bg = (0,0,0,0.5), align = TextNode.ALeft, mayChange = True, sort = 20)
+            self.resetTotals()
+            game.gameObj.taskMgr.add(self.updateOverlay, "profilerOverlay", sort = 60)
+            self.startProfiling()
+        else:
+            game.gameObj.taskMgr.remove("profilerOverlay")
+            self.overlay.destroy()
+            self.overlay = None
+            if not PStatClient.isConnected():
+                self.stopProfiling()
+
+    def resetTotals(self):
+        '''
+        Sets the time spent in every system back to zero.
+'''
+        for name in self.totals:
+            self.totals[name] = 0.0
+        self.frames = 0
+        self.lastRefresh = time.perf_counter()
+
+    def updateOverlay(self, task):
+        '''
+        This is a task that counts the frames, and every refreshRate seconds writes the average milliseconds per frame of each system onto the overlay.
+        The systems that are called from inside another system are indented, they are already counted in the time of that system.
+
+        Parameters
+        ----------------------------------------------------
+        task: task object from direct.task
+
+        Returns
+        ----------------------------------------------------
+        returns task.cont which indicates that the task needs to be called again.
+'''
+        self.frames += 1
+        now = time.perf_counter()
+        if now - self.lastRefresh < self.refreshRate:
+            return task.cont
+
+        frameMs = (now - self.lastRefresh)*1000/self.frames
+        lines = []
+        systemsMs = 0.0
+        for name, collectorName in PROFILED_SYSTEMS.items():
+            ms = self.totals[name]*1000/self.frames
+            depth = collectorName.count(":") - 1
+            if depth == 0:
+                systemsMs += ms
+            lines.append(f"{'    '*depth}{collectorName.split(':')[-1]}: {ms:.2f} ms")
+        lines.append(f"systems: {systemsMs:.2f} ms, frame: {frameMs:.2f} ms / {FRAME_BUDGET:.1f} ms budget")
+        self.overlay.setText("\n".join(lines))
+        self.overlay.setFg((1,0,0,1) if frameMs > FRAME_BUDGET else (1,1,1,1))
+        self.resetTotals()
+        return task.cont
@@ -0,0 +1,161 @@
+import itertools
+import heapq
+
+
+class Scheduler():
+    def __init__(self):
+        '''
+        Initialization for the Scheduler class. The scheduler calls a function once a delay in game time has passed, it is used for everything
+        in the game that happens after a delay, like the hit cooldowns of the ghosts, the health regeneration of the player and the waves of ghosts
+        that spawn in each round. Before, each of these had a timer that was checked every frame. Instead, the scheduler keeps every timer in a heap
+        sorted by the time it is due, so each tick it only looks at the front of the heap, and only the timers that are due cost anything.
+
+        Parameters
+        ----------------------------------------------------
+        None
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        #heap of [due time, order, function, arguments], the order keeps timers that are due at the same time in the order they were scheduled
+        self.timers = []
+        self.order = itertools.count()
+
+        #the game time the scheduler was last advanced to
+        self.now = 0.0
+
+    def schedule(self, delay, function, *args):
+        '''
+        This method schedules a function to be called once delay seconds of game time have passed.
+
+        Parameters
+        ----------------------------------------------------
+        delay: the number of seconds of game time to wait
+        function: the function to call
+        args: the arguments to call the function with
+
+        Returns
+        ----------------------------------------------------
+        Returns the timer, which can be passed to cancel
+'''
+        timer = [self.now + delay, next(self.order), function, args]
+        heapq.heappush(self.timers, timer)
+        return timer
+
+    def cancel(self, timer):
+        '''
+        This method cancels a timer so its function is never called. The timer is left in the heap and skipped when it is due, so cancelling
+        does not need to search the heap.
+'''
+        if timer is not None:
+            timer[2] = None
+
+    def advance(self, now):
+        '''
+        This method moves the scheduler forward to a game time, and calls the function of every timer that is due by then, in the order they are due.
+
+        Parameters
+        ----------------------------------------------------
+        now: the game time
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.now = now
+        while self.timers and self.timers[0][0] <= now:
+            due, order, function, args = heapq.heappop(self.timers)
+            if function is not None:
+                function(*args)
+
+    def clear(self):
+        '''
+        This method cancels every timer and moves the scheduler back to a game time of 0, it is called at the start of every game.
+'''
+        self.timers = []
+        self.now = 0.0
+
+    def getPending(self):
+        '''
+        Returns the number of timers that have not been called yet, including cancelled timers that are still in the heap.
+'''
+        return len(self.timers)
+
+
+class GameClock():
+    def __init__(self):
+        '''
+        Initialization for the GameClock class. The game clock is the clock of the game world, every part of the game reads the time from it
+        instead of reading the time itself. Once per frame it reads the frame time from panda3d's global clock, which is monotonic, and works out
+        how much game time passed during the frame. Game time can be paused and sped up or slowed down with the time scale.
+
+        The fixed step loop uses the game time of each frame to work out how many ticks to run, and it advances the game clock by one step every tick,
+        so the time of the game clock is always the time of the current tick. The scheduler is advanced along with it.
+
+        Parameters
+        ----------------------------------------------------
+        None
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        #the game time of the current tick, and the game time that passed in the last frame
+        self.time = 0.0
+        self.dt = 0.0
+
+        self.timeScale = 1.0
+        self.paused = False
+
+        self.scheduler = Scheduler()
+
+    def update(self, task):
+        '''
+        This is a task that runs at the start of every frame, before the fixed step loop. It works out how much game time passed during the frame.
+
+        Parameters
+        ----------------------------------------------------
+        task: task object from direct.task
+
+        Returns
+        ----------------------------------------------------
+        returns task.cont which indicates that the task needs to be called again.
+'''
+        self.dt = 0.0 if self.paused else globalClock.getDt()*self.timeScale
+        return task.cont
+
+    def advance(self, step):
+        '''
+        This method is called by the fixed step loop at the start of every tick, it moves the game time forward by one step and calls every
+        scheduled function that is due.
+'''
+        self.time += step
+        self.scheduler.advance(self.time)
+
+    def reset(self):
+        '''
+        This method moves the game time back to 0 and cancels every scheduled function, it is called at the start of every game.
+        Every game starts from the same game time, so the due times of the scheduler are rounded the same way in every game, and a game
+        that is replayed (see input_log.py) runs on exactly the same times as it did when it was recorded.
+'''
+        self.time = 0.0
+        self.scheduler.clear()
+
+    def getTime(self):
+        '''
+        Returns the game time of the current tick.
+'''
+        return self.time
+
+    def setPaused(self, paused):
+        '''
+        Pauses or unpauses the game time. While the game time is paused, nothing is ticked and no scheduled functions are called.
+'''
+        self.paused = paused
+
+    def setTimeScale(self, timeScale):
+        '''
+        Sets how fast the game time passes compared to real time, 1 is real time.
+'''
+        self.timeScale = timeScale
@@ -1,30 +1,174 @@
-from panda3d.core import CollisionHandlerEvent
+from panda3d.core import CollisionHandlerQueue
+from panda3d.core import CollisionTraverser
+from panda3d.core import BitMask32
+from direct.showbase.MessengerGlobal import messenger
 
-class CollisionHandler(CollisionHandlerEvent):
-    def __init__(self):
+import numpy as np
+
+
+#table of the collision layers in the game. Every collision node belongs to one layer, the bit of the layer is put into its into collide mask
+#and the bits of every layer in collidesWith are put into its from collide mask. A collider is only ever tested against collision nodes
+#in the layers it collides with, anything else (including the visible geometry of the scenery) is skipped by the traverser.
+COLLISION_LAYERS = {"player": {"bit": 0, "collidesWith": ("ghost",)},
+                    "axe": {"bit": 1, "collidesWith": ("ghost",)},
+                    "ghost": {"bit": 2, "collidesWith": ()}}
+
+
+def setCollisionLayer(cnodePath, layer):
+    '''
+    This function sets the from and into collide masks of a collision node according to its layer in COLLISION_LAYERS.
+    
+    Parameters
+    ----------------------------------------------------
+    cnodePath: a NodePath to a CollisionNode
+    layer: a string, the name of the layer in COLLISION_LAYERS
+    
+    Returns
+    ----------------------------------------------------
+    None
+'''
+    fromMask = BitMask32.allOff()
+    for otherLayer in COLLISION_LAYERS[layer]["collidesWith"]:
+        fromMask |= BitMask32.bit(COLLISION_LAYERS[otherLayer]["bit"])
+    cnodePath.node().setFromCollideMask(fromMask)
+    cnodePath.node().setIntoCollideMask(BitMask32.bit(COLLISION_LAYERS[layer]["bit"]))
+
+
+class CollisionHandler(CollisionHandlerQueue):
+    def __init__(self, root):
         '''
         Initialization for the Collision handler object. There are many different ways to handle collisions
-        in panda3d, one way of doing it is having collisions throw events, I chose this way. This class inherits from
-        the CollisionHandlerEvent class, this class has no methods, all it does is create a collisionHandler for an object.
-        The specifications for CollisionHandlerEvent are the same for every object I use, so I just had it be part of the initialization
-        of the Collision Handler
-        
+        in panda3d, one way of doing it is having collisions throw events, another is having every collision put into a queue.
+        This class inherits from the CollisionHandlerQueue class. There is only one collision handler in the game, every collider
+        (the player and the axe) is added to the collision traverser with this same handler. Once the traverser has finished
+        for the frame, the process task goes through the queue once and stores which ghosts are touching the player and which
+        ghosts are touching the axe in two arrays, where the indice of a ghost is its ghost number. When a ghost starts or stops touching the player,
+        it throws a playerContactBegin or playerContactEnd event with the ghost number (see the PlayerDamage class).
+
+        Ghosts are never colliders themselves, they are only collided into, so the only entries in the queue are the player
+        and the axe touching something.
+
+        The collision handler has its own collision traverser, which only traverses the part of the scene graph that holds the
+        collision nodes that can be collided into (the ghosts), so the size of the rest of the scene graph does not matter.
+        The colliders themselves can be anywhere in the scene graph.
+
         Parameters
         ----------------------------------------------------
-        None
-        
+        root: the NodePath that every collision node that can be collided into is a child of
+
         Returns
         ----------------------------------------------------
         None
 '''
         super().__init__()
-        #this is notation for events
-        #whenever a collision is detected, it is going to send out an event according to this string
-        #%fn represents the from object
-        #%in represents the into object
-            
-        self.addInPattern('%fn-into-%in')
-        self.addAgainPattern('%fn-again-%in')
-        self.addOutPattern('%fn-out-%in')
-    
-    
\ No newline at end of file
+        self.root = root
+        self.traverser = CollisionTraverser("mainTraverser")
+
+        #dictionaries from collision nodes to what they are
+        #colliders maps the player and axe collision nodes to "player" or "axe"
+        #ghostNodes maps the collision node of each ghost to its ghost number
+        self.colliders = {}
+        self.ghostNodes = {}
+
+        #arrays for the ghosts touching the player and the ghosts touching the axe
+        self.playerContact = np.zeros(0, dtype = bool)
+        self.axeContact = np.zeros(0, dtype = bool)
+
+        #set of the ghost numbers of the ghosts that were touching the player after the last traversal
+        self.playerContacts = set()
+
+        #boolean for checking if the axe has hit any ghost
+        self.axeCollision = False
+
+    def addCollider(self, cnodePath, name):
+        '''
+        This method puts a collision node path into its collision layer and adds it to the collision traverser, using this collision handler.
+
+        Parameters
+        ----------------------------------------------------
+        cnodePath: the collision node path of the collider
+        name: a string representing what the collider is, either "player" or "axe", this is also its layer in COLLISION_LAYERS
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        setCollisionLayer(cnodePath, name)
+        self.colliders[cnodePath.node()] = name
+        self.traverser.addCollider(cnodePath, self)
+
+    def clearColliders(self):
+        '''
+        Removes every collider from the collision traverser and forgets every ghost.
+'''
+        self.traverser.clearColliders()
+        self.colliders = {}
+        self.ghostNodes = {}
+
+    def addGhost(self, cnodePath, ghostNumber):
+        '''
+        Puts the collision node path of a ghost into the ghost layer and registers it, so that collisions with it can be traced back to the ghost number.
+'''
+        setCollisionLayer(cnodePath, "ghost")
+        self.ghostNodes[cnodePath.node()] = ghostNumber
+
+    def removeGhost(self, cnodePath):
+        '''
+        Removes the collision node path of a ghost that has been destroyed.
+'''
+        self.ghostNodes.pop(cnodePath.node(), None)
+
+    def setGhostCount(self, count):
+        '''
+        Resizes the contact arrays for a new round, no ghost is touching anything at the start of a round.
+        The ghosts of the last round are forgotten without throwing contact events.
+
+        Parameters
+        ----------------------------------------------------
+        count: an integer representing the number of ghosts in the round
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.playerContact = np.zeros(count, dtype = bool)
+        self.axeContact = np.zeros(count, dtype = bool)
+        self.playerContacts = set()
+
+    def process(self, task):
+        '''
+        This is a task that runs the collision traverser over the collision root every frame, then reads every entry in the queue and updates
+        the contact arrays. Since the arrays are rebuilt each frame, a ghost stops touching the player or the axe as soon as it
+        is no longer colliding with it or it has died. Then it compares the ghosts touching the player to the last frame and throws
+        an event for each ghost that started or stopped touching the player.
+
+        Parameters
+        ----------------------------------------------------
+        task: task object from direct.task
+
+        Returns
+        ----------------------------------------------------
+        returns task.cont which indicates that the task needs to be called again.
+'''
+        self.traverser.traverse(self.root)
+        self.playerContact[:] = False
+        self.axeContact[:] = False
+        playerContacts = set()
+        for entry in self.entries:
+            ghostNumber = self.ghostNodes.get(entry.getIntoNode())
+            if ghostNumber is None:
+                continue
+            if self.colliders.get(entry.getFromNode()) == "player":
+                self.playerContact[ghostNumber] = True
+                playerContacts.add(ghostNumber)
+            else:
+                self.axeContact[ghostNumber] = True
+        self.axeCollision = bool(self.axeContact.any())
+
+        if playerContacts != self.playerContacts:
+            for ghostNumber in playerContacts - self.playerContacts:
+                messenger.send("playerContactBegin", [ghostNumber])
+            for ghostNumber in self.playerContacts - playerContacts:
+                messenger.send("playerContactEnd", [ghostNumber])
+            self.playerContacts = playerContacts
+        return task.cont
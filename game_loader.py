@@ -0,0 +1,140 @@
+from direct.gui.DirectGui import DirectWaitBar
+from direct.gui.DirectGui import DirectLabel
+from panda3d.core import NodePath
+from asset_pipeline import resolveModel
+
+import game
+import time
+
+
+class GameLoader():
+    def __init__(self, budget = 0.008):
+        '''
+        Initialization for the GameLoader class. The game loader loads the models of the game and sets up the main game over several frames,
+        so the window never freezes while the game is being set up.
+
+        Loading the models starts while the start screen is showing. Each model is loaded with an asynchronous loader request, which panda3d
+        loads on another thread, and a callback stores the model when it is ready. Once the player presses start, the loading screen is shown
+        until every model has been loaded, then the steps of setting up the game are run, as many steps as fit in the time budget each frame.
+        The progress bar of the loading screen shows how far along both are.
+
+        The models are kept as templates, every time the game needs one it gets its own copy, so the models only ever need to be loaded once.
+        If the game asks for a model that has not been preloaded (for example in headless mode, where there is no start screen) it is loaded right away.
+
+        Parameters
+        ----------------------------------------------------
+        budget: Default: 0.008, the number of seconds per frame that can be spent setting up the game
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.budget = budget
+
+        #dictionary from the path of each model to the loaded model, and the paths of the models that are still loading
+        self.models = {}
+        self.pending = set()
+        self.requested = 0
+
+        #the generator of setup steps that is being run, and the gui of the loading screen
+        self.steps = None
+        self.gui = None
+
+    def preload(self, paths):
+        '''
+        This method starts loading every model in paths that has not been loaded or requested yet, without waiting for them to finish.
+
+        Parameters
+        ----------------------------------------------------
+        paths: a list of model paths, as they are written in the game
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        for path in paths:
+            if path in self.models or path in self.pending:
+                continue
+            self.pending.add(path)
+            self.requested += 1
+            game.gameObj.loader.loadModel(resolveModel(path), callback = self.modelLoaded, extraArgs = [path])
+
+    def modelLoaded(self, model, path):
+        '''
+        This is the callback of an asynchronous loader request, it stores the model as a template. If the model was already loaded
+        right away while it was loading, the model that was loaded first is kept. If the model could not be loaded, nothing is stored, so
+        getModel loads it right away and the error of the loader is raised there.
+'''
+        self.pending.discard(path)
+        if model is not None:
+            self.models.setdefault(path, model)
+
+    def getModel(self, path):
+        '''
+        This method returns a copy of a model, loading it right away if it has not been loaded yet.
+
+        Parameters
+        ----------------------------------------------------
+        path: the path of the model, as it is written in the game
+
+        Returns
+        ----------------------------------------------------
+        Returns a NodePath to a new copy of the model, which is not in the scene graph
+'''
+        if path not in self.models:
+            self.models[path] = game.gameObj.loader.loadModel(resolveModel(path))
+        return NodePath(self.models[path].node().copySubgraph())
+
+    def getLoadProgress(self):
+        '''
+        Returns how much of the preloading is done, as a number between 0 and 1.
+'''
+        if self.requested == 0:
+            return 1.0
+        return 1 - len(self.pending)/self.requested
+
+    def start(self, steps):
+        '''
+        This method shows the loading screen and starts running the setup steps over the next frames.
+
+        Parameters
+        ----------------------------------------------------
+        steps: a generator that runs one step of setting up the game every time it is advanced, it yields how much of the setup
+        is done as a number between 0 and 1
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.steps = steps
+        self.gui = {"label": DirectLabel(text = "Loading...", scale = 0.15, pos = (0,0,0.1), text_font = game.gameObj.gameFont, relief = None, text_fg = (1,1,1,1)),
+                    "bar": DirectWaitBar(value = 0, range = 100, scale = (0.8,1,0.5), pos = (0,0,-0.1), barColor = (1,0,0,1), frameColor = (0.2,0.2,0.2,1))}
+        game.gameObj.taskMgr.add(self.update, "gameSetup")
+
+    def update(self, task):
+        '''
+        This is a task that waits for the preloaded models, then advances the setup steps until the time budget of the frame runs out.
+        Once every step has been run, it removes the loading screen.
+
+        Parameters
+        ----------------------------------------------------
+        task: task object from direct.task
+
+        Returns
+        ----------------------------------------------------
+        returns task.cont while the game is still being set up and task.done once it is finished
+'''
+        setupProgress = 0.0
+        if not self.pending:
+            start = time.perf_counter()
+            while time.perf_counter() - start < self.budget:
+                try:
+                    setupProgress = next(self.steps)
+                except StopIteration:
+                    for directGui in self.gui.values():
+                        directGui.destroy()
+                    self.gui = None
+                    self.steps = None
+                    return task.done
+        self.gui["bar"]["value"] = (self.getLoadProgress() + setupProgress)*50
+        return task.cont
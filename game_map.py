@@ -0,0 +1,188 @@
+import numpy as np
+import argparse
+import struct
+import json
+import sys
+
+
+#every map file starts with this header:
+#   magic (4 bytes), version, number of models, number of props, number of spawn points (unsigned 32 bit integers),
+#   then the border of the map, minX, maxX, minY, maxY (32 bit floats)
+#it is followed by the model table, then the props, then the spawn points.
+#the model table is the path of every model used by the props, each one is a 16 bit length followed by the path in utf-8, padded to a multiple of 4 bytes
+#every prop is 8 32 bit floats, model id (its indice in the model table), x, y, z, h, p, r, scale
+#every spawn point is 2 32 bit floats, x, y
+#everything is little endian
+MAGIC = b"GSMP"
+VERSION = 1
+HEADER = struct.Struct("<4sIIII4f")
+PROP_FIELDS = ("model", "x", "y", "z", "h", "p", "r", "scale")
+
+
+def align(offset):
+    '''
+    Rounds an offset up to the next multiple of 4 bytes, so the float arrays in the file can be viewed without being copied.
+'''
+    return (offset + 3) & ~3
+
+
+class GameMap():
+    def __init__(self, path):
+        '''
+        Initialization for the GameMap class. A game map holds the layout of the map: where every prop (the trees) is placed, where
+        the ghosts spawn, and the border of the map. It is loaded from a binary map file (see the top of this file for the format).
+
+        The file is memory mapped, and the props and spawn points are numpy arrays that point straight into the file, so nothing is read
+        until it is used and there is no parsing per prop. A map with tens of thousands of props loads in about as long as an empty one.
+
+        Parameters
+        ----------------------------------------------------
+        path: the path of the map file
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.path = path
+        self.data = np.memmap(path, dtype = np.uint8, mode = "r")
+
+        magic, version, numModels, numProps, numSpawns, minX, maxX, minY, maxY = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a map file")
+        if version != VERSION:
+            raise ValueError(f"{path} is version {version} of the map format, only version {VERSION} can be loaded")
+
+        #the border is in the same format as before, ((minX, maxX), (minY, maxY))
+        self.border = ((float(minX), float(maxX)), (float(minY), float(maxY)))
+
+        offset = HEADER.size
+        self.modelPaths = []
+        for num in range(numModels):
+            length, = struct.unpack_from("<H", self.data, offset)
+            self.modelPaths.append(bytes(self.data[offset + 2:offset + 2 + length]).decode("utf-8"))
+            offset += 2 + length
+        offset = align(offset)
+
+        #array of every prop, one row per prop with the columns in PROP_FIELDS
+        self.props = self.data[offset:offset + numProps*32].view(np.float32).reshape(numProps, 8)
+        offset += numProps*32
+
+        #array of every spawn point, one row per spawn point
+        self.spawnPoints = self.data[offset:offset + numSpawns*8].view(np.float32).reshape(numSpawns, 2)
+
+    def getModelIds(self):
+        '''
+        Returns the model id of every prop as an array of integers.
+'''
+        return self.props[:, 0].astype(np.int32)
+
+    def getPositions(self):
+        '''
+        Returns the position of every prop, an array with a row of x, y, z for each prop.
+'''
+        return self.props[:, 1:4]
+
+    def getHprs(self):
+        '''
+        Returns the rotation of every prop, an array with a row of h, p, r for each prop.
+'''
+        return self.props[:, 4:7]
+
+    def getScales(self):
+        '''
+        Returns the scale of every prop.
+'''
+        return self.props[:, 7]
+
+
+def writeMap(path, modelPaths, props, spawnPoints, border):
+    '''
+    This function writes a map file.
+
+    Parameters
+    ----------------------------------------------------
+    path: the path of the map file to write
+    modelPaths: a list of the paths of every model used by the props
+    props: an array (or list of rows) with one row of model id, x, y, z, h, p, r, scale for each prop
+    spawnPoints: an array (or list of rows) with one row of x, y for each ghost spawn point
+    border: the border of the map, ((minX, maxX), (minY, maxY))
+
+    Returns
+    ----------------------------------------------------
+    None
+'''
+    props = np.asarray(props, dtype = "<f4").reshape(-1, 8)
+    spawnPoints = np.asarray(spawnPoints, dtype = "<f4").reshape(-1, 2)
+    (minX, maxX), (minY, maxY) = border
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(modelPaths), len(props), len(spawnPoints), minX, maxX, minY, maxY))
+        offset = HEADER.size
+        for modelPath in modelPaths:
+            encoded = modelPath.encode("utf-8")
+            file.write(struct.pack("<H", len(encoded)) + encoded)
+            offset += 2 + len(encoded)
+        file.write(b"\0"*(align(offset) - offset))
+        file.write(props.tobytes())
+        file.write(spawnPoints.tobytes())
+
+
+def exportScene(path, props, modelPaths, spawnPoints, border):
+    '''
+    This function is the converter from a layout that has been placed in the scene graph to a map file. Each prop is a NodePath
+    that has been put in its place, with the path of the model it was loaded from.
+
+    Parameters
+    ----------------------------------------------------
+    path: the path of the map file to write
+    props: a list of NodePaths, one for each prop
+    modelPaths: a list of the path of the model of each prop, in the same order as props
+    spawnPoints: a list of (x, y) ghost spawn points
+    border: the border of the map, ((minX, maxX), (minY, maxY))
+
+    Returns
+    ----------------------------------------------------
+    None
+'''
+    models = sorted(set(modelPaths))
+    rows = []
+    for prop, modelPath in zip(props, modelPaths):
+        pos, hpr = prop.getPos(), prop.getHpr()
+        rows.append((models.index(modelPath), pos[0], pos[1], pos[2], hpr[0], hpr[1], hpr[2], prop.getSx()))
+    writeMap(path, models, rows, spawnPoints, border)
+
+
+def mapToJson(gameMap):
+    '''
+    Returns a dictionary of a map that can be saved as json, so a map can be read and edited by hand.
+'''
+    return {"border": gameMap.border,
+            "models": gameMap.modelPaths,
+            "props": [dict(zip(PROP_FIELDS, [gameMap.modelPaths[int(row[0])]] + [round(float(value), 4) for value in row[1:]])) for row in gameMap.props],
+            "spawnPoints": gameMap.spawnPoints.tolist()}
+
+
+def jsonToMap(path, data):
+    '''
+    Writes the map in a dictionary made by mapToJson to a map file.
+'''
+    models = data["models"]
+    rows = [[models.index(prop["model"])] + [prop[field] for field in PROP_FIELDS[1:]] for prop in data["props"]]
+    writeMap(path, models, rows, data["spawnPoints"], data["border"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Converts Ghost Survival maps between the binary map format and json")
+    subparsers = parser.add_subparsers(dest = "command", required = True)
+    dumpParser = subparsers.add_parser("dump", help = "print a map file as json")
+    dumpParser.add_argument("map")
+    buildParser = subparsers.add_parser("build", help = "write a json map to a map file")
+    buildParser.add_argument("json")
+    buildParser.add_argument("map")
+    args = parser.parse_args()
+
+    if args.command == "dump":
+        json.dump(mapToJson(GameMap(args.map)), sys.stdout, indent = 2)
+    else:
+        with open(args.json) as file:
+            jsonToMap(args.map, json.load(file))
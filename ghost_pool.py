@@ -0,0 +1,105 @@
+from ghost import Ghost
+
+
+class GhostPool():
+    def __init__(self):
+        '''
+        Initialization for the GhostPool class. Creating a ghost is slow, it needs a NodePath, an instance of the ghost model and a collision node.
+        Instead of creating new ghosts every round and destroying them when they die, the pool keeps every ghost that has ever been created.
+        When a ghost dies it is deactivated (stashed and hidden), and at the start of the next round it is reset and used again. New ghosts are
+        only created when a round needs more ghosts than any round before it.
+
+        Since a round with n ghosts always uses the ghost numbers 0 to n-1, the ghost at each indice of the pool always has that indice as its ghost number.
+
+        Parameters
+        ----------------------------------------------------
+        None
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        #every ghost that has been created, the indice of a ghost is its ghost number
+        self.ghosts = []
+
+        #statistics about the pool
+        self.active = 0
+        self.created = 0
+        self.reused = 0
+        
+        #the ghosts below this ghost number have been spawned in at least once
+        self.used = 0
+
+    def prepare(self, ghostNumber):
+        '''
+        This method makes sure the ghost with this ghost number has been created, creating it (and any ghost with a lower ghost number
+        that is missing) if it does not exist yet. New ghosts are created deactivated.
+
+        Parameters
+        ----------------------------------------------------
+        ghostNumber: an integer representing the ghost number
+
+        Returns
+        ----------------------------------------------------
+        Returns the ghost object with this ghost number
+'''
+        for num in range(len(self.ghosts), ghostNumber + 1):
+            self.ghosts.append(Ghost(num))
+            self.created += 1
+        return self.ghosts[ghostNumber]
+
+    def get(self, ghostNumber):
+        '''
+        This method takes a ghost out of the pool so it can be spawned in, it resets the ghost back to its spawn location.
+
+        Parameters
+        ----------------------------------------------------
+        ghostNumber: an integer representing the ghost number
+
+        Returns
+        ----------------------------------------------------
+        Returns the ghost object with this ghost number
+'''
+        if ghostNumber < self.used:
+            self.reused += 1
+        self.used = max(self.used, ghostNumber + 1)
+        ghost = self.prepare(ghostNumber)
+        ghost.activate()
+        self.active += 1
+        return ghost
+
+    def release(self, ghost):
+        '''
+        This method deactivates a ghost that has died, it stays in the pool so it can be used again next round.
+
+        Parameters
+        ----------------------------------------------------
+        ghost: the ghost object that died
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        ghost.deactivate()
+        self.active -= 1
+
+    def clear(self):
+        '''
+        This method destroys every ghost in the pool. The pool is kept between games, so this is only needed if the world is torn down.
+'''
+        for ghost in self.ghosts:
+            ghost.destruct()
+        self.ghosts = []
+        self.active = 0
+        self.used = 0
+
+    def getStats(self):
+        '''
+        This method returns the statistics of the pool.
+
+        Returns
+        ----------------------------------------------------
+        Returns a dictionary with the number of ghosts in the pool, how many are currently active, how many have been created and how many times
+        a ghost has been reused instead of being created.
+'''
+        return {"size": len(self.ghosts), "active": self.active, "created": self.created, "reused": self.reused}
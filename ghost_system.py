@@ -0,0 +1,269 @@
+import numpy as np
+
+from spatial_hash import SpatialHash
+from fixed_step_loop import lerpAngle
+
+import game
+
+
+class GhostSystem():
+
+    #values stored in the status array
+    UNSPAWNED = 0
+    MOVING = 1
+    DEAD = 2
+
+    def __init__(self):
+        '''
+        Initialization for the GhostSystem class. The ghost system is responsible for updating every ghost in the game with a single task.
+        Instead of each ghost having its own update task, all of the state that changes each frame (position, heading, health, speed,
+        status and whether it can be hit) is stored in numpy arrays, where the indice of a ghost in each array is its ghost number.
+        Every frame the whole group of ghosts is moved with a handful of array operations, then the new transforms are copied onto the
+        ghost NodePaths.
+
+        Parameters
+        ----------------------------------------------------
+        None
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        #list of ghost objects, this is the same list as the ghosts list in the MyGame class
+        self.ghosts = []
+        self.count = 0
+
+        #per ghost state, each array has one entry for every ghost in the round
+        self.pos = np.zeros((0, 2))
+        self.heading = np.zeros(0)
+        self.health = np.zeros(0)
+        self.speed = np.zeros(0)
+        self.status = np.zeros(0, dtype = np.int8)
+        self.allowHit = np.ones(0, dtype = bool)
+        
+        #the positions and headings before the last tick, used to draw the ghosts between ticks
+        self.lastPos = np.zeros((0, 2))
+        self.lastHeading = np.zeros(0)
+        
+        #grid over the map used to find the ghosts that are close to eachother, ghosts closer than separationRadius push eachother apart
+        self.separationRadius = 1.0
+        self.grid = SpatialHash(game.gameObj.mapBorder, self.separationRadius)
+
+    def setUpGhosts(self, ghosts):
+        '''
+        This method is called at the start of every round. It resizes every state array to the number of ghosts and fills it in with the
+        starting values of a ghost. Every ghost starts unspawned, with a health that depends on the current round.
+
+        Parameters
+        ----------------------------------------------------
+        ghosts: the list of ghosts in the round, the indice of each ghost is its ghost number. Ghosts that have not spawned yet are None
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.ghosts = ghosts
+        self.count = len(ghosts)
+
+        self.pos = np.zeros((self.count, 2))
+        self.heading = np.zeros(self.count)
+        self.lastPos = np.zeros((self.count, 2))
+        self.lastHeading = np.zeros(self.count)
+        self.health = np.full(self.count, game.gameObj.round*2 + 10, dtype = np.float64)
+        self.speed = np.full(self.count, 6.5)
+        self.status = np.full(self.count, self.UNSPAWNED, dtype = np.int8)
+        self.allowHit = np.ones(self.count, dtype = bool)
+
+    def spawn(self, ghostNumber, ghost):
+        '''
+        This method is called by the spawn director when a ghost spawns in, the ghost starts moving from its spawn location.
+
+        Parameters
+        ----------------------------------------------------
+        ghostNumber: an integer representing the ghost number
+        ghost: the ghost object that is spawning
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.pos[ghostNumber] = (ghost.posX, ghost.posY)
+        self.heading[ghostNumber] = 0
+        #the ghost is drawn at its spawn location until its first tick, instead of sliding in from where it was last round
+        self.lastPos[ghostNumber] = self.pos[ghostNumber]
+        self.lastHeading[ghostNumber] = 0
+        self.status[ghostNumber] = self.MOVING
+
+    def releaseAll(self):
+        '''
+        This method is called when the player dies, it gives every ghost that is spawned in back to the ghost pool so the ghosts can be used again next game.
+        The ghosts that have not spawned yet are already stashed in the pool.
+
+        Parameters
+        ----------------------------------------------------
+        None
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        for num in np.flatnonzero(self.status == self.MOVING).tolist():
+            game.gameObj.ghostPool.release(self.ghosts[num])
+        self.status[:] = self.DEAD
+
+    def saveState(self):
+        '''
+        This method is called by the fixed step loop before every tick, it saves the position and heading of every ghost
+        so the ghosts can be drawn between their last two states.
+'''
+        self.lastPos = self.pos.copy()
+        self.lastHeading = self.heading.copy()
+
+    def interpolate(self, alpha):
+        '''
+        This method is called by the fixed step loop after the ticks of a frame, it moves every ghost that is spawned in between its saved
+        state and its current state. The collision traverser never sees these transforms, move sets the ghosts back to their current state
+        at the start of the next tick.
+
+        Parameters
+        ----------------------------------------------------
+        alpha: a number between 0 and 1, how much of the next tick has passed
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        #if the round changed during the last tick there is no saved state to draw from, the ghosts stay where move put them
+        if self.lastPos.shape != self.pos.shape:
+            return
+        moving = np.flatnonzero(self.status == self.MOVING)
+        pos = self.lastPos[moving] + (self.pos[moving] - self.lastPos[moving])*alpha
+        heading = lerpAngle(self.lastHeading[moving], self.heading[moving], alpha)
+        for num, (x, y), h in zip(moving.tolist(), pos.tolist(), heading.tolist()):
+            self.ghosts[num].np.setPosHpr(x, y, 2, h, 0, 0)
+
+    def hasLivingGhosts(self):
+        '''
+        Returns True if there is at least one ghost in the round that has not been killed yet, spawned or not.
+'''
+        return bool((self.status != self.DEAD).any())
+
+    def move(self, moving):
+        '''
+        This method moves every ghost that is spawned in, it is the vectorized version of what each ghost used to do on its own.
+
+        Each ghost turns towards the player. Every ghost that is closer than the separation radius to other ghosts that are closer to the player
+        than it is, gets pushed away from all of those ghosts. Otherwise, if it is not touching the player, it moves in the direction of the
+        player at the ghost speed. The ghosts that are close to eachother are found using the spatial hash, so only ghosts that are near
+        eachother are ever compared.
+
+        Parameters
+        ----------------------------------------------------
+        moving: an array of the ghost numbers of every ghost that is spawned in
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        player = game.gameObj.player
+        playerPos = np.array((player.posX, player.posY))
+
+        pos = self.pos[moving]
+        toPlayer = playerPos - pos
+        theta = np.arctan2(toPlayer[:, 1], toPlayer[:, 0])
+
+        #finds every pair of spawned ghosts that are within the separation radius of eachother
+        self.grid.rebuild(moving, pos)
+        ghost, other = self.grid.pairsWithin(self.separationRadius)
+
+        #a ghost only moves away from the ghosts that are closer to the player than it is
+        distToPlayerSq = ((playerPos - self.pos)**2).sum(axis = 1)
+        behind = distToPlayerSq[ghost] >= distToPlayerSq[other]
+        ghost = ghost[behind]
+        other = other[behind]
+
+        #adds up the direction away from each of those ghosts, then pushes the ghost 0.01 units in the combined direction
+        toOther = self.pos[other] - self.pos[ghost]
+        awayTheta = np.arctan2(toOther[:, 1], toOther[:, 0]) + np.pi
+        awayX = np.bincount(ghost, weights = np.cos(awayTheta), minlength = self.count)[moving]
+        awayY = np.bincount(ghost, weights = np.sin(awayTheta), minlength = self.count)[moving]
+        pushed = np.bincount(ghost, minlength = self.count)[moving] > 0
+        length = np.hypot(awayX, awayY)
+        #if the pushes cancel out, the ghost is pushed the same way as two ghosts that are on top of eachother
+        awayX = np.where(length > 0, awayX/np.where(length > 0, length, 1), -1.0)
+        awayY = np.where(length > 0, awayY/np.where(length > 0, length, 1), 0.0)
+        pos[pushed, 0] += awayX[pushed]*0.01
+        pos[pushed, 1] += awayY[pushed]*0.01
+
+        #ghosts that are touching the player are not allowed to move
+        touchingPlayer = game.gameObj.collisions.playerContact[moving]
+        chasing = ~pushed & ~touchingPlayer
+        step = self.speed[moving][chasing]*game.gameObj.dt
+        pos[chasing, 0] += np.cos(theta[chasing])*step
+        pos[chasing, 1] += np.sin(theta[chasing])*step
+
+        self.pos[moving] = pos
+        turning = moving[~pushed]
+        self.heading[turning] = np.degrees(theta[~pushed]) + 90
+
+        #copies the new transforms onto the NodePaths, one call per ghost
+        for num, (x, y), h in zip(moving.tolist(), pos.tolist(), self.heading[moving].tolist()):
+            self.ghosts[num].np.setPosHpr(x, y, 2, h, 0, 0)
+
+    def checkHits(self, moving):
+        '''
+        This method checks if any spawned ghost has been hit by the axe, then removes any ghost that has run out of health.
+        A ghost can only be hit while the axe is being swung and only once per swing, allowHit is reset once the axe stops
+        colliding with the ghost.
+
+        Parameters
+        ----------------------------------------------------
+        moving: an array of the ghost numbers of every ghost that is spawned in
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        axeColliding = game.gameObj.collisions.axeContact[moving]
+
+        #having the animate attribute from axe in there allows hits to only be counted if the person is swinging their axe
+        hit = axeColliding & self.allowHit[moving] & game.gameObj.player.axe.animate
+        if hit.any():
+            self.health[moving[hit]] -= game.gameObj.player.axe.getDamage()
+            self.allowHit[moving[hit]] = False
+            #plays the hit sound effect
+            game.gameObj.globalGhostHitSFX.play()
+
+        #if the axe is no longer colliding with the ghost and allowHit is also False, it is going to reset allowHit
+        self.allowHit[moving[~axeColliding]] = True
+
+        dead = moving[self.health[moving] <= 0]
+        if dead.size:
+            #adds the kills to ghostKills, plays death soundeffect and gives the ghosts back to the ghost pool
+            game.gameObj.ghostKills += int(dead.size)
+            game.gameObj.globalGhostDeathSFX.play()
+            self.status[dead] = self.DEAD
+            for num in dead.tolist():
+                game.gameObj.ghostPool.release(self.ghosts[num])
+
+    def update(self, task):
+        '''
+        This is a task that updates every ghost in the game, it is ticked by the fixed step loop. It moves the ghosts that are spawned in
+        and applies axe damage to them. Spawning the ghosts in is done by the SpawnDirector.
+
+        Parameters
+        ----------------------------------------------------
+        task: task object from direct.task
+
+        Returns
+        ----------------------------------------------------
+        returns task.cont which indicates that the task needs to be called again.
+'''
+        if self.count == 0:
+            return task.cont
+
+        moving = np.flatnonzero(self.status == self.MOVING)
+        if moving.size:
+            self.move(moving)
+            self.checkHits(moving)
+        return task.cont
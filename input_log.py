@@ -0,0 +1,205 @@
+'''
+The input log of a game is a compact binary file of everything the player did, so the game can be played back exactly the same way.
+It starts with a header:
+
+    offset  size  type     field
+    0       4     bytes    magic, always GSIL
+    4       1     uint8    version, 2
+    5       4     uint32   seed of the random number generators
+    9       8     float64  length of a tick of the fixed step loop in seconds
+    17      1     uint8    most ticks run in one frame
+    18      8     float64  x sensitivity
+    26      8     float64  y sensitivity
+
+followed by a record for every frame of the game, 21 bytes each:
+
+    offset  size  type     field
+    0       8     float64  game time that passed during the frame
+    8       1     uint8    keys held down, a bit for each key of KEYS, and bit 7 is set while the microbit is the input
+    9       4     float32  x position of the mouse
+    13      4     float32  y position of the mouse
+    17      4     float32  strength of the swing of the microbit
+
+Every part of the game that changes over time is driven by the game clock, so replaying the game time of every frame along with the input
+runs the exact same ticks, with the same ghosts spawning and the same hits, as the game that was recorded.
+'''
+import random
+import struct
+
+import numpy as np
+
+import game
+
+MAGIC = b"GSIL"
+VERSION = 2
+HEADER = struct.Struct("<4sBIdBdd")
+FRAME = struct.Struct("<dBfff")
+
+#the keys of keyMap in the order of their bits, and the bit that is set while the microbit is the input
+KEYS = ("w", "s", "a", "d", "escape", "mouse1")
+MICROBIT_BIT = 0x80
+
+
+def packKeys(keyMap, inputMode):
+    '''
+    Returns the keys held down in keyMap and the input mode packed into the bits of a byte.
+'''
+    bits = MICROBIT_BIT if inputMode == "microbit" else 0
+    for num, key in enumerate(KEYS):
+        if keyMap[key]:
+            bits |= 1 << num
+    return bits
+
+
+def unpackKeys(bits, keyMap):
+    '''
+    Sets the keys in keyMap from the bits of a byte, and returns the input mode.
+'''
+    for num, key in enumerate(KEYS):
+        keyMap[key] = bool(bits & (1 << num))
+    return "microbit" if bits & MICROBIT_BIT else "mouse"
+
+
+class InputRecorder():
+    def __init__(self, path):
+        '''
+        Initialization for the InputRecorder class. The input recorder writes the input log of every game that is played. At the start of every
+        frame of the fixed step loop, before any tick, it writes down the game time of the frame, the keys held down, the position of the mouse
+        and the strength of the swing of the microbit.
+        The random number generators are seeded at the start of every game with a new seed, which is written in the header of the log.
+
+        The first game is written to path, and every game after it to a new file with its number added to the name, like session-2.log,
+        so playing again never overwrites a game that was recorded.
+
+        Parameters
+        ----------------------------------------------------
+        path: the file the input log of the first game is written to
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.path = path
+        self.file = None
+        self.games = 0
+        self.replaying = False
+
+        #the position of the mouse this frame, the player reads it from here while the game is being recorded
+        self.mouse = (0.0, 0.0)
+
+    def getPath(self):
+        '''
+        Returns the file the input log of the current game is written to.
+'''
+        if self.games <= 1:
+            return self.path
+        stem, dot, extension = self.path.rpartition(".")
+        if not dot or "/" in extension:
+            return f"{self.path}-{self.games}"
+        return f"{stem}-{self.games}.{extension}"
+
+    def startRun(self):
+        '''
+        This method is called by the game at the start of every game, after the fixed step loop has been created. It opens a new input log and
+        writes its header.
+'''
+        self.stopRun()
+        self.games += 1
+        seed = random.randrange(2**32)
+        random.seed(seed)
+        np.random.seed(seed)
+        gameObj = game.gameObj
+        self.file = open(self.getPath(), "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, gameObj.simLoop.step, gameObj.simLoop.maxTicks, gameObj.sensX, gameObj.sensY))
+
+    def update(self):
+        '''
+        This method is called by the fixed step loop at the start of every frame, it writes the record of the frame.
+'''
+        if self.file is None:
+            return
+        gameObj = game.gameObj
+        mouse = gameObj.mouseWatcherNode if gameObj.win is not None else None
+        if mouse is not None and mouse.hasMouse():
+            self.mouse = (mouse.getMouseX(), mouse.getMouseY())
+        else:
+            self.mouse = (0.0, 0.0)
+        self.file.write(FRAME.pack(gameObj.gameClock.dt, packKeys(gameObj.events.keyMap, gameObj.inputMode), *self.mouse, gameObj.events.swingStrength))
+
+    def stopRun(self):
+        '''
+        This method closes the input log of the current game, it is called when the player dies and when the game is quit.
+'''
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class InputReplay():
+    def __init__(self, path):
+        '''
+        Initialization for the InputReplay class. The input replay plays back an input log in place of the player. At the start of every frame of
+        the fixed step loop it replaces the game time of the frame, the keys held down, the input mode, the position of the mouse and the strength
+        of the swing of the microbit with the ones that were recorded, so the live input is ignored. The whole log is read when it is loaded,
+        it is only 21 bytes a frame.
+
+        The replay can be watched with a window, where one recorded frame is played every frame, or run with no window as fast as the computer
+        allows (see the HeadlessReplay class).
+
+        Parameters
+        ----------------------------------------------------
+        path: the input log to play back
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, self.seed, self.step, self.maxTicks, self.sensX, self.sensY = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an input log")
+        self.frames = list(FRAME.iter_unpack(data[HEADER.size:len(data) - (len(data) - HEADER.size) % FRAME.size]))
+
+        self.frame = 0
+        self.finished = False
+        self.replaying = True
+        self.mouse = (0.0, 0.0)
+
+    def startRun(self):
+        '''
+        This method is called by the game at the start of a game, after the fixed step loop has been created. It seeds the random number
+        generators and sets up the fixed step loop and the sensitivity the same way as the game that was recorded.
+'''
+        random.seed(self.seed)
+        np.random.seed(self.seed)
+        gameObj = game.gameObj
+        gameObj.simLoop.step = self.step
+        gameObj.simLoop.maxTicks = self.maxTicks
+        gameObj.sensX, gameObj.sensY = self.sensX, self.sensY
+        self.frame = 0
+        self.finished = False
+
+    def update(self):
+        '''
+        This method is called by the fixed step loop at the start of every frame, it puts the recorded frame in place of the live input.
+        Once every frame has been played, the replay is finished and the game goes back to the live input.
+'''
+        gameObj = game.gameObj
+        if self.frame >= len(self.frames):
+            if not self.finished:
+                self.finished = True
+                gameObj.inputLog = None
+            return
+        dt, bits, mouseX, mouseY, swingStrength = self.frames[self.frame]
+        self.frame += 1
+        gameObj.gameClock.dt = dt
+        gameObj.inputMode = unpackKeys(bits, gameObj.events.keyMap)
+        self.mouse = (mouseX, mouseY)
+        gameObj.events.swingStrength = swingStrength
+
+    def stopRun(self):
+        '''
+        This method is called when the player dies or the game is quit, the replay is finished.
+'''
+        self.finished = True
@@ -9,112 +9,153 @@
 
 import serial
 import serial.tools.list_ports as list_ports
+from serial_reader import SerialReader
+import threading
 import time
 
 class Microbit():
     
-    def __init__(self):
+    def __init__(self, protocol="text", extraDevices=(), scanInterval=1.0, minBackoff=0.5, maxBackoff=8.0):
         self.isLoaded = False
-        self.dataCache = ''
         
-        print('looking for microbit')
-        self.microbit = self.findMicrobitComPort()
-        print(self.microbit)
-        if not self.microbit:
-            raise Exception("Microbit not found")
-            return
+        #devices that are used as microbits even though they do not have the PID and VID of a microbit, like the fake microbit in fake_microbit.py
+        self.extraDevices = list(extraDevices)
         
-        print('opening microbit port')
-        self.openConnection()
-        #microbit.open()
+        #the serial ports are read on a background thread, the game only reads the newest line it has published
+        #it starts with no ports, they are added by the discovery thread when a microbit is found
+        #the protocol is "text" for the gesture names, or "binary" for the accelerometer frames (see accel_protocol.py)
+        self.reader = SerialReader(protocol=protocol)
+        self.reader.start()
+        self.ports = []
+        self.lastSequence = []
+        
+        #device name (like COM3 or /dev/ttyACM0) -> indice of its port in the reader, for the microbits that are open
+        self.devices = {}
+        #device name -> [time it can be tried again, backoff], for the microbits that failed to open or were unplugged
+        self.retries = {}
+        self.scanInterval = scanInterval
+        self.minBackoff = minBackoff
+        self.maxBackoff = maxBackoff
+        
+        #looking for the microbit is done on its own thread, so starting the game never waits on the serial ports
+        #it keeps looking every scanInterval seconds, so a microbit can be plugged in, unplugged and plugged back in while the game is running
+        self.stopping = threading.Event()
+        self.discovery = threading.Thread(target=self.discover, name="microbitDiscovery", daemon=True)
+        self.discovery.start()
     
     
-    def readRecentLine(self):
-        if (self.microbit.inWaiting()>0):
-            self.dataCache += self.microbit.read(self.microbit.inWaiting()).decode('utf-8')#.decode('utf-8') #read the bytes and convert from binary array to utf-8
-            
-            isFullLine = self.dataCache.count('\r\n')
-
-            if isFullLine > 1:
-                data = self.dataCache.rpartition('\r\n')#.strip() #split the data into 3 parts [useful, /r/n, cut off data]
-                self.dataCache = data[-1]                         #Take the cut off data and save it for later
-                data = data[0].rpartition('\r\n')[-1]        #Split the last complete chunk of data off and save (keeps only newest data sent by microbit)
-                
-                return data
+    def discover(self):
+        #the loop of the discovery thread, it runs until closeConnection is called
+        while not self.stopping.is_set():
+            try:
+                self.scan()
+            except Exception as e:
+                print(f"microbit scan failed: {e}")
+            self.stopping.wait(self.scanInterval)
+    
+    
+    def scan(self):
+        #opens every microbit that is plugged in and not open yet
+        now = time.monotonic()
         
-        return None
+        #a microbit the reader has lost was unplugged, it is opened again once it comes back and its backoff is over
+        for device, controller in list(self.devices.items()):
+            if not self.reader.connected[controller]:
+                del self.devices[device]
+                self.retries[device] = [now + self.minBackoff, self.minBackoff]
+        
+        for device in self.findMicrobitDevices():
+            if device in self.devices:
+                continue
+            retry = self.retries.get(device)
+            if retry is not None and now < retry[0]:
+                continue
+            try:
+                port = self.openPort(device)
+            except (OSError, ValueError) as e:
+                #the backoff doubles every time the microbit fails to open, up to maxBackoff
+                backoff = self.minBackoff if retry is None else min(retry[1]*2, self.maxBackoff)
+                self.retries[device] = [now + backoff, backoff]
+                if retry is None:
+                    print(f"could not open microbit on {device}, trying again: {e}")
+                continue
+            self.retries.pop(device, None)
+            self.ports.append(port)
+            self.lastSequence.append(0)
+            self.devices[device] = self.reader.addPort(port)
+            print(f"microbit connected on {device}")
     
     
-    def nonBlockingReadAll(self):
-        #Proper Non-blocking version of serial read
-        #This method breaks up your code into tiny chunks/partial messages quite often.
-        #But it works with much shorter message durations.
-        if (self.microbit.inWaiting()>0):
-            #Method 2
-            data = self.microbit.read(self.microbit.inWaiting()).decode('utf-8') #read the bytes and convert from binary array to utf-8
-            return(data)
+    def openPort(self, device, baud=115200):
+        #opens a serial connection to a microbit
+        return serial.Serial(device, baudrate=baud, timeout=0.1)
+    
+    
+    def getController(self):
+        #returns the indice of the main controller, the first microbit that is still connected, or None if no microbit is connected
+        for controller, connected in enumerate(self.reader.connected):
+            if connected:
+                return controller
         return None
+    
+    
+    def isConnected(self):
+        return self.getController() is not None
+    
+    
+    def readRecentLine(self, controller=None):
+        #returns the newest line the microbit has sent, or None if it has not sent a new line since the last call
+        #this never touches the serial port, so it never blocks the game
+        if controller is None:
+            controller = self.getController()
+            if controller is None:
+                return None
+        line, arrived, sequence = self.reader.getSnapshot(controller)
+        if sequence == self.lastSequence[controller]:
+            return None
+        self.lastSequence[controller] = sequence
+        return line
+    
+    
+    def readEvents(self, controller=None):
+        #returns the swing events the microbit has sent since the last call, with the binary protocol
+        if controller is None:
+            controller = self.getController()
+            if controller is None:
+                return []
+        return self.reader.readEvents(controller)
+    
+    
+    def getSnapshot(self, controller=0):
+        #returns (newest line, time it arrived from time.monotonic, sequence number) for a microbit
+        return self.reader.getSnapshot(controller)
 
         
-    def isReady(self):
-        try:
-            self.microbit.inWaiting()
-            
-        except:
-            #not open, try to open
-            try:
-                self.openConnection()
-            except:
-                return False
-        
-        return True
+    def isReady(self, controller=0):
+        return controller < len(self.reader.connected) and self.reader.connected[controller]
         
-    
-    def openConnection(self):
-        self.microbit.open()
-        #TODO - Add error handling here
         
     def closeConnection(self):
-        self.microbit.close()
+        self.stopping.set()
+        self.discovery.join(1.0)
+        self.reader.stop()
+        for port in self.ports:
+            port.close()
 
 
-    def findMicrobitComPort(self, pid=516, vid=3368, baud=115200):
+    def findMicrobitDevices(self, pid=516, vid=3368):
         '''
-        This function finds a device connected to usb by it's PID and VID and returns a serial connection
+        This function finds the devices connected to usb with a PID and VID and returns their names
         Adapted From - https://stackoverflow.com/questions/58043143/how-to-set-up-serial-communication-with-microbit-using-pyserial
         Parameters
         ----------
         pid - Product id of device to search for
         vid - Vendor id of device to search for
-        baud - Baud rate to open the serial connection at
         Returns
         -------
-        Serial - If a device is found a serial connection for the device is configured and returned
+        list - The device names (like COM3 or /dev/ttyACM0) of every device that was found, followed by the extra devices
         '''
         #Required information about the microbit so it can be found
         #PID_MICROBIT = 516
         #VID_MICROBIT = 3368
-        TIMEOUT = 0.1
-        
-        #Create the serial object
-        serPort = serial.Serial(timeout=TIMEOUT)
-        serPort.baudrate = baud
-        
-        #Search for device on open ports and return connection if found
-        ports = list(list_ports.comports())
-        
-        print('scanning ports')
-        for p in ports:
-            print('port: {}'.format(p))
-            try:
-                print('pid: {} vid: {}'.format(p.pid, p.vid))
-            except AttributeError:
-                continue
-            if (p.pid == pid) and (p.vid == vid):
-                print('found target device pid: {} vid: {} port: {}'.format(
-                    p.pid, p.vid, p.device))
-                serPort.port = str(p.device)
-                return serPort
-        
-        #If nothing found then return None
-        return None
+        return [str(p.device) for p in list_ports.comports() if p.pid == pid and p.vid == vid] + self.extraDevices
@@ -22,6 +22,7 @@
 #make sure panda3d is installed into Thonny
 #responsible for loading the configurations of panda3d
 from panda3d.core import loadPrcFile
+from panda3d.core import loadPrcFileData
 loadPrcFile("config/conf.prc")
 
 from direct.showbase.ShowBase import ShowBase
@@ -34,22 +35,41 @@ from panda3d.core import PointLight
 from panda3d.core import AmbientLight
 from panda3d.core import Material
 from panda3d.core import NodePath
-from panda3d.core import CollisionTraverser
+from panda3d.core import Camera
+from game_collision_handler import CollisionHandler
+from static_scenery import StaticScenery
+from game_map import GameMap
+from game_loader import GameLoader
+from screen_manager import ScreenManager
+from font_atlas import GameFont
 
 
 from player import Player
-from ghost import Ghost
+from player_damage import PlayerDamage
+from ghost_pool import GhostPool
+from spawn_director import SpawnDirector
+from ghost_system import GhostSystem
+from fixed_step_loop import FixedStepLoop
+from game_clock import GameClock
+from frame_profiler import FrameProfiler
 from timer import Timer
 from settings import Settings
+from asset_pipeline import resolveModel
 
 from direct.gui.DirectGui import *
 from panda3d.core import TransparencyAttrib
 from panda3d.core import TextNode
 from microbit import Microbit
+from accel_protocol import microbitProtocol
+from input_log import InputRecorder
+from input_log import InputReplay
 
 import webbrowser
 import game
 import sys
+import os
+import argparse
+import json
 import math
 
 #Assets grabbed from: 
@@ -65,7 +85,7 @@ import math
 
 #Microbit implementation taken from Mr.Brooks
 class MyGame(ShowBase):
-    def __init__(self):
+    def __init__(self, headless = False):
         '''
         Main Game class, contains all global attributes as well as object within the game.
         It inherits from the Showbase class of panda3d, which is the main class containing all the basic methods, functions and attributes
@@ -92,13 +112,19 @@ class MyGame(ShowBase):
         
         Collision Traverser:
         ----------------------------------------------------
-        Collision traversers are objects that check for collisions between collision solids (collision system of panda3d). The only collision traverser that I use is the main one
-        generated by panda3d, called cTrav. This is a collision traverser that is automatically part of the task manager. More information about collision traversers can be found here:
+        Collision traversers are objects that check for collisions between collision solids (collision system of panda3d). The only collision traverser that I use is the one
+        owned by the collision handler (self.collisions), it only traverses ghostRoot, the part of the scene graph holding the ghosts, instead of all of render.
+        Collide masks split the collision nodes into layers (see COLLISION_LAYERS), so the traverser never tests the scenery. More information about collision traversers can be found here:
         https://docs.panda3d.org/1.10/python/programming/collision-detection/collision-traversers
         
+        Headless Mode:
+        ----------------------------------------------------
+        In headless mode the game is started without a window and without audio, and the start screen is never created. This is used to simulate
+        the game faster than real time (see the HeadlessSimulation class), for example on computers that cannot render.
+        
         Parameters
         ----------------------------------------------------
-        None
+        headless: Default: False, if True the game is started with no window, no audio and no start screen
         
         Returns
         ----------------------------------------------------
@@ -107,16 +133,32 @@ class MyGame(ShowBase):
         
 '''
         game.gameObj = self
-        super().__init__()
+        self.headless = headless
+        if self.headless:
+            loadPrcFileData("", "audio-library-name null")
+            super().__init__(windowType = "none")
+            #without a window panda3d does not create a camera, the player and the axe still need one to be attached to
+            self.camera = self.render.attachNewNode("camera")
+            self.cam = self.camera.attachNewNode(Camera("cam"))
+        else:
+            super().__init__()
         self.set_background_color(0,0,0)
         
         self.settings = Settings()
-        self.inputMode = self.settings.input
+        
+        #the clock of the game world, every cooldown and delay in the game is scheduled with its scheduler
+        self.gameClock = GameClock()
+        #the input recorder or the input replay, None if the input is neither being recorded nor replayed (see input_log.py)
+        self.inputLog = None
+        #the input mode is the input that is being used, it is only microbit while the microbit input is chosen in the settings and a microbit is connected
+        self.inputMode = "mouse"
         self.gameRoot = NodePath("gameroot")
         self.gameRoot.reparentTo(self.render)
         self.sensX = self.settings.sensitivityX
         self.sensY = self.settings.sensitivityY
-        self.gameFont = self.loader.loadFont(r"assets/mrsmonster.ttf")
+        #the game font is loaded from the pre-rendered font atlas if it has been built, see the GameFont class
+        self.fonts = GameFont(r"assets/mrsmonster.ttf")
+        self.gameFont = self.fonts.default
         
         #Lighting
         plight = PointLight('my dlight')
@@ -126,16 +168,14 @@ class MyGame(ShowBase):
         alight.setColor((0.2,0.2,0.2,1))
         self.aLight = self.gameRoot.attachNewNode(alight)
         
-        #If the input mode is microbit, it checks if a microbit is connected, if not it defaults to the regular mouse input.
-        if self.inputMode == "microbit":
-            try:
-                self.microbit = Microbit()
-            except Exception as e:
-                print(e)
-                self.inputMode = "mouse"
+        #The microbit looks for a microbit on its own thread, so the game starts straight away whether a microbit is plugged in or not.
+        #The input mode is switched between the mouse and the microbit as the microbit is plugged in and unplugged (see the checkInputMode task).
+        #GHOST_SURVIVAL_MICROBIT can be set to the device of the fake microbit (see fake_microbit.py) to play without one
+        fakeDevices = [device for device in os.environ.get("GHOST_SURVIVAL_MICROBIT", "").split(os.pathsep) if device]
+        self.microbit = None if self.headless else Microbit(protocol = microbitProtocol.getValue(), extraDevices = fakeDevices)
         
         #ghost model instance, all ghosts created reference this model
-        self.globalGhost = self.loader.loadModel(r"assets/ghost.bam")
+        self.globalGhost = self.loader.loadModel(resolveModel(r"assets/ghost.bam"))
         self.globalGhost.setScale(0.5)
         self.globalGhost.setLight(self.aLight)
         self.globalGhost.setLight(self.pLight)
@@ -155,28 +195,51 @@ class MyGame(ShowBase):
         self.disableMouse()
         self.events = Handler()
         self.windowProps = GameProperties()
-        self.win.requestProperties(self.windowProps)
+        if self.win is not None:
+            self.win.requestProperties(self.windowProps)
+        
+        #loads the models of the game and sets up the main game over several frames, with a loading screen
+        #the palette texture of the axe and the trees is loaded once, it is the same for every game
+        self.gameLoader = GameLoader()
+        self.textures = self.loader.loadTexture(r"assets/tex/colorPalette.png")
         
         self.ghostKills = 0
         self.dt = 0.0
-        self.mapBorder = ((-57,45),(-26,34))
-        self.textures = None
+        #the layout of the map, where the trees are placed, where the ghosts spawn and the border of the map, see the GameMap class
+        self.map = GameMap(r"assets/maps/forest.map")
+        self.mapBorder = self.map.border
         self.environment = None
+        self.scenery = None
         self.round = None
         self.ghosts = None
+        self.ghostSystem = GhostSystem()
         self.player = None
         self.props = None
         self.roundSpawnTimer = None
-        self.gui = None
         self.roundCounter = None
+        self.simLoop = None
+        
+        #times each system of the game, press f3 to show how long each system takes per frame
+        self.profiler = FrameProfiler()
+        
+        #every gui screen is built once, the first time it is shown, and is then hidden and shown again
+        self.screens = ScreenManager()
+        self.screens.addScreen("start", self.buildStartScreen)
+        self.screens.addScreen("settings", self.buildSettingsScreen)
+        self.screens.addScreen("death", self.buildDeathScreen)
         
         self.taskMgr.add(self.escapeQuit,"quitGame")
-        self.taskMgr.add(self.setUpStartScreen, "startScreenSetup")
+        #the game clock reads the time of each frame before anything else runs
+        self.taskMgr.add(self.gameClock.update, "gameClock", sort = -50)
+        self.taskMgr.doMethodLater(0.25, self.checkInputMode, "checkInputMode")
+        if not self.headless:
+            self.taskMgr.add(self.setUpStartScreen, "startScreenSetup")
         
     def updateMicrobit(self, task):
         '''
         This is a task that is reponsible for translating the microbit into an event (see Handler class). This reads the most recent line from the microbit,
-        then passes it through the translateMicrobitEvent method of the Handler class, which throws an event depending on what data is coming from the microbit.
+        which has already been read from the serial port by the serial reader thread, so it never waits on the port, then passes it through the translateMicrobitEvent method of the Handler class, which throws an event depending on what data is coming from the microbit.
+        With the binary protocol, the swing events that have been decoded since the last frame are passed through the translateSwingEvent method instead.
         This is a task that is added to the taskmanager only if there is a microbit and the input mode is set to microbit.
         
         Parameters
@@ -188,6 +251,8 @@ class MyGame(ShowBase):
         Returns task.cont, which indicates this task is finished. 
 
 '''
+        for event, strength in self.microbit.readEvents():
+            self.events.translateSwingEvent(event, strength)
         data = self.microbit.readRecentLine()
         self.events.translateMicrobitEvent(data)
         return task.cont
@@ -211,10 +276,76 @@ class MyGame(ShowBase):
         None
 '''
         if state == 1:
-            self.inputMode = "microbit"
+            self.settings.update(inputIn = "microbit")
         if state == 0:
-            self.inputMode = "mouse"
-        self.settings.update(inputIn = self.inputMode)
+            self.settings.update(inputIn = "mouse")
+        self.updateInputMode()
+
+    def checkInputMode(self, task):
+        '''
+        This is a task that runs a few times a second and checks whether the microbit has been plugged in or unplugged (see updateInputMode).
+        It only reads a flag set by the serial reader thread, so it never waits on the serial port.
+
+        Parameters
+        ----------------------------------------------------
+        task: task object from direct.task
+
+        Returns
+        ----------------------------------------------------
+        returns task.again which indicates that the task needs to be called again after its delay.
+'''
+        self.updateInputMode()
+        return task.again
+
+    def updateInputMode(self):
+        '''
+        This method sets the input mode to microbit if the microbit input is chosen in the settings and a microbit is connected, otherwise it sets it to mouse.
+        If the input mode changes during a game, the updateMicrobit task is added or removed, and the attack that was held down is let go.
+        The profiler is attached again so the updateMicrobit task is profiled along with the rest of the game.
+
+        Parameters
+        ----------------------------------------------------
+        None
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        #while a game is being replayed, the input mode comes from the input log
+        if self.inputLog is not None and self.inputLog.replaying:
+            return
+        connected = self.microbit is not None and self.microbit.isConnected()
+        inputMode = "microbit" if self.settings.input == "microbit" and connected else "mouse"
+        if inputMode == self.inputMode:
+            return
+        self.inputMode = inputMode
+        self.events.keyMap["mouse1"] = False
+        if self.taskMgr.hasTaskNamed("simLoop"):
+            if inputMode == "microbit":
+                self.taskMgr.add(self.updateMicrobit, "updateMicrobit")
+            else:
+                self.taskMgr.remove("updateMicrobit")
+            #the profiler wraps the tasks that are running when it is attached, so it is attached again to profile the new task
+            self.profiler.attach()
+    
+    def getMouse(self):
+        '''
+        This method returns the position of the mouse this frame, where the middle of the window is (0, 0). While the input is being recorded or
+        replayed it comes from the input log, so the player turns the same way in the replay as it did in the game that was recorded.
+        
+        Parameters
+        ----------------------------------------------------
+        None
+        
+        Returns
+        ----------------------------------------------------
+        Returns a tuple of the x and y position of the mouse, or None if there is no mouse to read
+'''
+        if self.inputLog is not None:
+            return self.inputLog.mouse
+        if self.win is None:
+            return None
+        return self.mouseWatcherNode.getMouseX(), self.mouseWatcherNode.getMouseY()
     
     def updateSensitivity(self):
         '''
@@ -230,17 +361,18 @@ class MyGame(ShowBase):
         ----------------------------------------------------
         None
 '''
-        #Elements that are part of the start screen or settings screen get put in the gui dictionary.
-        self.sensX = self.gui["sensitivityX"]["value"]*14.4
-        self.gui["sensitivityXText"].setText(f"Mouse Sensitivity X: {round(self.sensX/14.4)}")
-        self.sensY = self.gui["sensitivityY"]["value"]*14.4
-        self.gui["sensitivityYText"].setText(f"Mouse Sensitivity Y: {round(self.sensY/14.4)}")
+        #Elements that are part of the settings screen are in the widget dictionary of the settings screen.
+        gui = self.screens.get("settings")
+        self.sensX = gui["sensitivityX"]["value"]*14.4
+        self.screens.setText("settings", "sensitivityXText", f"Mouse Sensitivity X: {round(self.sensX/14.4)}")
+        self.sensY = gui["sensitivityY"]["value"]*14.4
+        self.screens.setText("settings", "sensitivityYText", f"Mouse Sensitivity Y: {round(self.sensY/14.4)}")
         self.settings.update(sensXIn = self.sensX, sensYIn = self.sensY)
         
     def transitionStartToSettings(self):
         '''
         This is a method called when transitioning between the start and the settings (called by the settings button
-        in the start screen). This method removes the start screen gui and then creates the settings gui.
+        in the start screen). This method hides the start screen and shows the settings screen.
         
         Parameters
         ----------------------------------------------------
@@ -250,20 +382,31 @@ class MyGame(ShowBase):
         ----------------------------------------------------
         None
 '''
-        for directGui in self.gui.values():
-            directGui.destroy()
-        self.gui = {"back" : DirectButton(text = "back", scale = 0.1, pos = (-1.5, 0 ,-0.85), command = self.transitionSettingsToStart, text_font = self.gameFont, text_fg = (1,1,1,1), relief = None),
-                         "input" : DirectCheckButton(text = "microbit", scale = 0.2, pos = (-0.60,0,0.65), command = self.changeInput, text_font = self.gameFont, text_fg = (1,1,1,1), relief = None),
-                         "sensitivityXText" : DirectLabel(text = f"Mouse Sensitivity X: {round(self.sensX/14.4)}", scale = 0.10, pos = (-0.6,0,0.45), text_font = self.gameFont, text_fg = (1,1,1,1), relief = None),
-                         "sensitivityX": DirectSlider(scale = 0.5, pos = (-0.6,0,0.4), range = (1,100), value = round(self.sensX/14.4), command = self.updateSensitivity),
-                         "sensitivityYText" : DirectLabel(text = f"Mouse Sensitivity Y: {round(self.sensY/14.4)}", scale = 0.10, pos = (-0.6,0,0.25), text_font = self.gameFont, text_fg = (1,1,1,1), relief = None),
-                         "sensitivityY": DirectSlider(scale = 0.5, pos = (-0.6,0,0.2), range = (1,100), value = round(self.sensY/14.4), command = self.updateSensitivity)}
+        self.screens.show("settings")
+    
+    def buildSettingsScreen(self, root):
+        '''
+        This method creates the gui of the settings screen, it is called by the screen manager the first time the settings screen is shown.
+        
+        Parameters
+        ----------------------------------------------------
+        root: the NodePath of the screen, every widget of the screen is put under it
+        
+        Returns
+        ----------------------------------------------------
+        Returns a dictionary of the widgets of the screen
+'''
+        return {"back" : DirectButton(parent = root, text = "back", scale = 0.1, pos = (-1.5, 0 ,-0.85), command = self.transitionSettingsToStart, text_font = self.gameFont, text_fg = (1,1,1,1), relief = None),
+                "input" : DirectCheckButton(parent = root, text = "microbit", scale = 0.2, pos = (-0.60,0,0.65), command = self.changeInput, text_font = self.gameFont, text_fg = (1,1,1,1), relief = None),
+                "sensitivityXText" : DirectLabel(parent = root, text = f"Mouse Sensitivity X: {round(self.sensX/14.4)}", scale = 0.10, pos = (-0.6,0,0.45), text_font = self.gameFont, text_fg = (1,1,1,1), relief = None),
+                "sensitivityX": DirectSlider(parent = root, scale = 0.5, pos = (-0.6,0,0.4), range = (1,100), value = round(self.sensX/14.4), command = self.updateSensitivity),
+                "sensitivityYText" : DirectLabel(parent = root, text = f"Mouse Sensitivity Y: {round(self.sensY/14.4)}", scale = 0.10, pos = (-0.6,0,0.25), text_font = self.gameFont, text_fg = (1,1,1,1), relief = None),
+                "sensitivityY": DirectSlider(parent = root, scale = 0.5, pos = (-0.6,0,0.2), range = (1,100), value = round(self.sensY/14.4), command = self.updateSensitivity)}
         
     def transitionSettingsToStart(self):
         '''
         This method is responsible for transitioning between the settings screen back to the start screen. It is called when
-        the user hits the back button on the gui. It removes all the objects on the gui currently, then it adds a task to the
-        task manager called startScreenSetup which creates the gui for the start screen.
+        the user hits the back button on the gui. It hides the settings screen and shows the start screen again.
         
         Parameters
         ----------------------------------------------------
@@ -273,14 +416,13 @@ class MyGame(ShowBase):
         ----------------------------------------------------
         None
 '''
-        for directGui in self.gui.values():
-            directGui.destroy()
-        self.taskMgr.add(self.setUpStartScreen, "startScreenSetup")
+        self.screens.show("start")
         
     def setUpStartScreen(self, task):
         '''
-        This is a task that is reponsible for creating the gui of the start screen, it is the second task that is added to the game,
-        it creates the gui for the start screen and also plays the start screen music.
+        This is a task that is reponsible for showing the start screen, it is the second task that is added to the game,
+        it shows the gui for the start screen and also plays the start screen music. It also starts loading the models of the game in the background,
+        so they are ready by the time the player presses start.
         
         Parameters
         ----------------------------------------------------
@@ -290,22 +432,39 @@ class MyGame(ShowBase):
         ----------------------------------------------------
         returns task.done, which indicates the task is finished and should be removed from the task manager.
 '''
-        self.gui = {"title": DirectLabel(text = "Ghost Survival", scale = 0.3, text_font = self.gameFont, text_fg = (1,1,1,1), relief = None),
-                         "start" : DirectButton(text = "Start", scale = 0.2, command = self.transitionStartToGame, text_font = self.gameFont, relief = None, text_fg = (1,0,0,1)),
-                         "settings" : DirectButton(text = "Settings", scale = 0.1, command = self.transitionStartToSettings, text_font = self.gameFont, relief = None, text_fg = (1,0,0,1)),
-                         "quit" : DirectButton(text = "Quit", scale = 0.1, command = self.gameQuit, text_font = self.gameFont, relief = None, text_fg = (1,0,0,1)),
-                         "tutorial" : DirectButton(text = "How To Play", scale = 0.1, command = self.openBrowser, text_font = self.gameFont, text_fg = (1,0,0,1), relief = None)}
-        self.gui["title"].setPos(0,0,0.5)
-        self.gui["start"].setPos(0,0,0)
-        self.gui["settings"].setPos(1.5,0,-0.75)
-        self.gui["quit"].setPos(-1.5,-0,-0.75)
-        self.gui["tutorial"].setPos(0,0,-0.75)
+        self.screens.show("start")
         self.introMusic.play()
+        self.gameLoader.preload(self.map.modelPaths + [r"assets/environment.egg", r"assets/axe.x"])
         return task.done
     
+    def buildStartScreen(self, root):
+        '''
+        This method creates the gui of the start screen, it is called by the screen manager the first time the start screen is shown.
+        
+        Parameters
+        ----------------------------------------------------
+        root: the NodePath of the screen, every widget of the screen is put under it
+        
+        Returns
+        ----------------------------------------------------
+        Returns a dictionary of the widgets of the screen
+'''
+        gui = {"title": DirectLabel(parent = root, text = "Ghost Survival", scale = 0.3, text_font = self.gameFont, text_fg = (1,1,1,1), relief = None),
+               "start" : DirectButton(parent = root, text = "Start", scale = 0.2, command = self.transitionStartToGame, text_font = self.gameFont, relief = None, text_fg = (1,0,0,1)),
+               "settings" : DirectButton(parent = root, text = "Settings", scale = 0.1, command = self.transitionStartToSettings, text_font = self.gameFont, relief = None, text_fg = (1,0,0,1)),
+               "quit" : DirectButton(parent = root, text = "Quit", scale = 0.1, command = self.gameQuit, text_font = self.gameFont, relief = None, text_fg = (1,0,0,1)),
+               "tutorial" : DirectButton(parent = root, text = "How To Play", scale = 0.1, command = self.openBrowser, text_font = self.gameFont, text_fg = (1,0,0,1), relief = None)}
+        gui["title"].setPos(0,0,0.5)
+        gui["start"].setPos(0,0,0)
+        gui["settings"].setPos(1.5,0,-0.75)
+        gui["quit"].setPos(-1.5,-0,-0.75)
+        gui["tutorial"].setPos(0,0,-0.75)
+        return gui
+    
     def transitionStartToGame(self):
         '''
-        This is a method called when the user clicks the play button in the start screen, it removes the anything on the screen, then adds the task setUpMainGame to the task manager.
+        This is a method called when the user clicks the play button in the start screen, it removes the anything on the screen, then the game loader
+        hides the start screen, shows the loading screen and sets up the main game over the next few frames.
         It also stops playing the intro music and starts playing the in game music.
         
         Parameters
@@ -316,9 +475,8 @@ class MyGame(ShowBase):
         ----------------------------------------------------
         None
 '''
-        for thing in self.gui.values():
-            thing.destroy()
-        self.taskMgr.add(self.setUpMainGame, "setUpMainGame")
+        self.screens.hide()
+        self.gameLoader.start(self.setUpMainGameSteps())
         self.introMusic.stop()
         self.inGameMusic.play()
     
@@ -341,8 +499,8 @@ class MyGame(ShowBase):
     
     def setUpMainGame(self,task):
         '''
-        This method sets up the main game. It loads all the necessary models, creates the map and creates all the objects needed
-        for the game.
+        This method sets up the main game all at once, in a single frame. It is used when there is no loading screen, in headless mode.
+        When the game is started from the start screen, the same steps are spread over several frames by the game loader instead.
         
         Parameters
         ----------------------------------------------------
@@ -353,77 +511,169 @@ class MyGame(ShowBase):
         returns task.done which indicates that the task is finished and should be removed from the task manager
 
 '''
+        for progress in self.setUpMainGameSteps():
+            pass
+        return task.done
+    
+    def setUpMainGameSteps(self):
+        '''
+        This method sets up the main game. The first time it is called it sets up the world of the game, then it starts a new game in the world.
+        It is a generator, it stops after each step so the game loader can spread the steps over several frames and show
+        the progress on the loading screen. The models are loaded by the game loader, while the start screen is showing.
         
-        #Changes the cursor from visible to hidden
-        #Updates the window properties
-        #Assigns a new variable called self.props to the s
-        self.windowProps.updateMouseView()
-        self.win.requestProperties(self.windowProps)
-        self.props = self.win.getProperties()
+        Parameters
+        ----------------------------------------------------
+        None
         
-        #Resets the event handling object and also initializes the collision traverser. 
-        self.events = Handler()
-        self.cTrav = CollisionTraverser("mainTraverser")
+        Returns
+        ----------------------------------------------------
+        Yields how much of the game has been set up, as a number between 0 and 1
+
+'''
+        #the world is only set up once, it is kept when the player dies
+        if self.scenery is None:
+            for progress in self.setUpWorldSteps():
+                yield progress*0.9
+        
+        self.startRun()
+        yield 1.0
+    
+    def setUpWorldSteps(self):
+        '''
+        This method sets up the world of the game, everything that is the same in every game: the map, the floor, the player and the axe,
+        the collision handler, the ghost pool and the spawn director. It is only run once, when the game is first started. When the player dies
+        the world is stashed instead of being torn down, and playing again only resets the state of the game (see the startRun method), so
+        the models never need to be copied, the map never needs to be merged again, and the ghosts that were created stay in the ghost pool.
+        It is a generator, in the same way as setUpMainGameSteps.
+        
+        Parameters
+        ----------------------------------------------------
+        None
+        
+        Returns
+        ----------------------------------------------------
+        Yields how much of the world has been set up, as a number between 0 and 1
+
+'''
+        #initializes the collision handler every collider shares.
+        #ghostRoot is the parent of every ghost, it is the only part of the scene graph that the collision traverser goes through
+        self.ghostRoot = self.gameRoot.attachNewNode("ghostRoot")
+        self.collisions = CollisionHandler(self.ghostRoot)
+        self.ghostPool = GhostPool()
+        self.spawnDirector = SpawnDirector()
         
-        #Loads textures for the axe and the trees.
         #self.environment is the floor of the world
-        #inserts the floor into the scene graph and sets its position and color
+        #sets the position and color of the floor, the static scenery inserts it into the scene graph
         #Colors are done in percent of rgb, instead of having a color being from 0-255, it is 0-1
-        self.textures = self.loader.loadTexture(r"assets/tex/colorPalette.png")
-        self.environment = self.loader.loadModel(r"assets/environment.egg")
-        self.environment.reparentTo(self.gameRoot)
+        self.environment = self.gameLoader.getModel(r"assets/environment.egg")
         self.environment.setPos(0,0,-1)
         self.environment.setColor(0.0706,0.4,0.149)
+        yield 0.1
+        
+        #creates the player object, and the damage system that makes the ghosts touching the player hurt it
+        self.player = Player()
+        self.playerDamage = PlayerDamage(self.player)
+        yield 0.2
+        
+        #places the trees of the game map, then merges the trees and the floor into a few batches, the scenery never moves so it only needs a few draw calls
+        for progress in self.setUpMap():
+            yield 0.2 + progress*0.8
+        
+        #creates the roundSpawnTimer, which is a timer object that is used to determine how often and when the ghosts spawn in.
+        #creates the roundCounter, which is a DirectLabel object that displays the current round, it is hidden while the player is dead
+        self.roundSpawnTimer = Timer()
+        self.roundCounter = DirectLabel(text = "", scale = 0.15, pos = (-1.45,0,-0.85), text_font = self.gameFont, relief = None, text_fg = (1,0,0,1), frameColor = (0,0,0,1))
+        self.roundCounter.hide()
+        
+        #builds the death screen ahead of time, so the first death does not have to lay out its text and load its image
+        self.screens.build("death")
+        yield 1.0
+    
+    def startRun(self):
+        '''
+        This method starts a new game in the world that has already been set up. It only resets the state of the game, the round, the kills,
+        the ghosts and the player, then puts the world back into the scene graph and starts the fixed step loop. It does not create or load anything
+        that is drawn, so it is fast enough to be done in a single frame when the player presses play again.
+        
+        Parameters
+        ----------------------------------------------------
+        None
+        
+        Returns
+        ----------------------------------------------------
+        None
+
+'''
+        #the game time goes back to 0 and the timers of the last game are cancelled
+        self.gameClock.reset()
+        
+        #keys that were pressed during the last game or the death screen are not carried into the new game
+        for key in self.events.keyMap:
+            self.events.keyMap[key] = False
         
         #sets the round equal to one and resets the ghost kills
-        #creates a list and then adds ghost objects to the list depending on the round specified. 
+        #creates the list of ghosts depending on the round specified, the spawn director fills it in as the ghosts spawn.
         self.round = 1
         self.ghostKills = 0
-        self.ghosts = [Ghost(0), Ghost(1)]
+        self.ghosts = [None]*2
+        self.ghostSystem.setUpGhosts(self.ghosts)
+        self.spawnDirector.setUpRound(len(self.ghosts))
+        self.collisions.setGhostCount(len(self.ghosts))
+        self.playerDamage.setUpRound()
         
-        #creates the player object
-        self.player = Player()
+        #puts the player back at the start with full health, and puts the world and the axe back into the scene graph
+        self.player.reset()
+        self.gameRoot.unstash()
+        self.player.axe.np.unstash()
         
-        #creates trees
-        self.trees = self.createMap()
-        self.setUpMap()
+        #Changes the cursor from visible to hidden
+        #Updates the window properties
+        #Assigns a new variable called self.props to the s
+        self.windowProps.updateMouseView()
+        if self.win is not None:
+            self.win.requestProperties(self.windowProps)
+            self.props = self.win.getProperties()
         
         #moves the cursor to the center of the screen. 
-        self.win.movePointer(0, self.props.getXSize()//2,self.props.getYSize()//2)
-        
-        #adds the update method for the player and the maingame method for the game into the task manager
-        self.taskMgr.add(self.mainGame,"mainGame")
-        self.taskMgr.add(self.player.updatePlayer, "updatePlayer")
+        if self.win is not None:
+            self.win.movePointer(0, self.props.getXSize()//2,self.props.getYSize()//2)
+        
+        #creates the fixed step loop, which ticks the maingame method, the update method for the player, the update method for the ghosts and the spawn director,
+        #then runs the collision traverser and processes the collisions at the end of every tick.
+        #the player and the ghosts are drawn between their last two ticks
+        self.simLoop = FixedStepLoop()
+        self.simLoop.addSystem("mainGame", self.mainGame)
+        self.simLoop.addSystem("updatePlayer", self.player.updatePlayer)
+        self.simLoop.addSystem("updateGhosts", self.ghostSystem.update)
+        self.simLoop.addSystem("spawnDirector", self.spawnDirector.update)
+        self.simLoop.addSystem("processCollisions", self.collisions.process)
+        self.simLoop.addInterpolated(self.player)
+        self.simLoop.addInterpolated(self.ghostSystem)
+        self.taskMgr.add(self.simLoop.update, "simLoop")
+        
+        #the round setup of the last game was cancelled along with the other timers
+        self.roundSetupTimer = None
+        
+        #starts recording the input of the new game, or sets up the game the same way as the game that is being replayed
+        if self.inputLog is not None:
+            self.inputLog.startRun()
         
         #if the input is microbit, it will add the updateMicrobit method as well
         if self.inputMode == "microbit":    
             self.taskMgr.add(self.updateMicrobit, "updateMicrobit")
         
-        
-        #iterates through the list of ghosts in the game
-        #adds each updateGhost method of each ghost into the task manager
-        #for each ghost, it will tell the event object to accept collision events between this ghost and every other ghost in the list
-        #also adds each event name into an event list, which makes it easier to clean up when the player dies
-        for num in range(len(self.ghosts)):
-            self.taskMgr.add(self.ghosts[num].update, f"{num}updateGhost")
-            for ghost in self.ghosts:
-                if ghost != self.ghosts[num]:
-                    self.events.accept(f"{num}ghostCollNode-into-{ghost.ghostNumber}ghostCollNode", self.events.ghostToGhost, [num, ghost.ghostNumber])
-                    self.events.ghostToGhostEventList.append("{num}ghostCollNode-into-{ghost.ghostNumber}ghostCollNode")
-                    self.events.accept(f"{num}ghostCollNode-out-{ghost.ghostNumber}ghostCollNode", self.events.ghostToGhost, [num, -1])
-                    self.events.ghostToGhostEventList.append("{num}ghostCollNode-out-{ghost.ghostNumber}ghostCollNode")
-        #creates the roundSpawnTimer, which is a timer object that is used to determine how often and when the ghosts spawn in.
-        self.roundSpawnTimer = Timer()
+        #resets the round spawn timer and shows the round counter
         self.roundSpawnTimer.setTimer(0)
+        self.roundCounter.setText(f"Round {self.round}")
+        self.roundCounter.show()
         
-        #creates the roundCounter, which is a DirectLabel object that displays the current round
-        self.roundCounter = DirectLabel(text = f"Round {self.round}", scale = 0.15, pos = (-1.45,0,-0.85), text_font = self.gameFont, relief = None, text_fg = (1,0,0,1), frameColor = (0,0,0,1))
-        return task.done
+        #the fixed step loop is new every game, so the profiler needs to wrap it again if it is profiling
+        self.profiler.attach()
     
     def transitionDeathToGame(self):
         '''
         This method is for transitioning the death screen back into the game, it is called when the user clicks the play again button on the you died screen.
-        It removes everything on the gui from before and then it adds the setUpMainGame task to the taskManager.
+        It hides the death screen and then starts a new game straight away, the world is already set up so there is no loading screen.
         
         Parameters
         ----------------------------------------------------
@@ -434,16 +684,15 @@ class MyGame(ShowBase):
         None
         
 '''
-        for directGui in self.gui.values():
-            directGui.destroy()
-        self.taskMgr.add(self.setUpMainGame, "setUpMainGame")
+        self.screens.hide()
+        self.startRun()
     
     def transitionGameToDeath(self):
         '''
-        This is a method responsible for transitioning the game to death. It cleans up the scene from the game and then creates the
-        new gui that is displayed in the death screen. There are many things that need to be done, it needs to remove all the objects that
-        were previously on the scene graph such as the trees, the floor, and the ghosts. It also needs to remove the collision solids from the collision traverser
-        and clean up the events. Then it needs to create the new gui that is displayed on the screen. 
+        This is a method responsible for transitioning the game to death. It ends the game and then creates the
+        shows the death screen. The world of the game is not torn down, so it does not need to be set up again
+        when the player plays again. Every ghost that is still alive goes back to the ghost pool, then the world (the trees, the floor and the ghosts)
+        and the axe are stashed, which takes them out of the scene graph without destroying them. Then it shows the death screen with the score of the game. 
         
         Parameters
         ----------------------------------------------------
@@ -454,43 +703,58 @@ class MyGame(ShowBase):
         None
 
 '''
-        #Goes into the ghostCollision eventlist and tells the event handler to ignore all of these events
-        for event in self.events.ghostToGhostEventList:
-            self.events.ignore(event)
-        
-        #every ghost in self.ghosts needs to be destroyed if it has not been already.
-        for ghost in self.ghosts:
-            if ghost != None:
-                ghost.destruct()
-        
-        #removes all collision solids from the collision traverser
-        #removes any node parented to gameRoot (trees, the floor)
-        #removes any nodes below the cam
-        #removes the roundcounter
-        self.cTrav.clearColliders()
-        self.gameRoot.node().removeAllChildren()
-        self.cam.node().removeAllChildren()
-        self.roundCounter.destroy()
+        #every ghost that is still alive goes back into the ghost pool
+        self.ghostSystem.releaseAll()
+        
+        #stashes everything parented to gameRoot (trees, the floor, the ghosts) and the axe
+        #hides the roundcounter
+        self.gameRoot.stash()
+        self.player.axe.np.stash()
+        self.roundCounter.hide()
         
         #changes the cursor from hidden to visible
         self.windowProps.updateMouseView()
-        self.win.requestProperties(self.windowProps)
-        self.props = self.win.getProperties()
-        #creates the gui for the death screen
-        self.gui = {"replay": DirectButton(text = "Play Again", scale = 0.1, pos = (0,0,-0.5), command = self.transitionDeathToGame, sortOrder = 10, text_font = self.gameFont, relief = None, text_fg = (1,1,1,1)),
-                         "quit": DirectButton(text = "Quit", scale = 0.1, command = self.gameQuit, pos = (-1.5,0,-0.75), sortOrder = 9, text_font = self.gameFont, relief = None, text_fg = (1,1,1,1)),
-                         "score": DirectLabel(text = f"You survived {self.round-1} rounds!", scale = 0.2, sortOrder = 8, pos = (0,0,0.3), text_font = self.gameFont, relief = None, text_fg = (1,0,0,1)),
-                         "bloodFilter": OnscreenImage(image = r"assets/bloodSplatterThree.png", scale = (1.7778,1,1)),
-                         "kills" : DirectLabel(text = f"You killed {self.ghostKills} zombies!", scale = 0.2, sortOrder = 7, pos = (0,0,0), text_font = self.gameFont, relief = None, text_fg = (1,0,0,1))}
+        if self.win is not None:
+            self.win.requestProperties(self.windowProps)
+            self.props = self.win.getProperties()
+        #shows the death screen, only the score and the kills are changed
+        self.screens.show("death")
+        self.screens.setText("death", "score", f"You survived {self.round-1} rounds!")
+        self.screens.setText("death", "kills", f"You killed {self.ghostKills} zombies!")
+        
+        #stops the fixed step loop and removes it from the taskManager, nothing else is ticked once the game has ended
+        #the microbit task is added again at the start of the next game
+        #if the player kills all ghosts just before it dies, the next round will have been scheduled, I have not experienced this glitch
+        #but cancelling it prevents it from happening at all.
+        self.simLoop.stop()
+        self.taskMgr.remove("simLoop")
+        self.taskMgr.remove("updateMicrobit")
+        self.gameClock.scheduler.cancel(self.roundSetupTimer)
+        self.roundSetupTimer = None
+        if self.inputLog is not None:
+            self.inputLog.stopRun()
+
+    def buildDeathScreen(self, root):
+        '''
+        This method creates the gui of the death screen, it is called by the screen manager when the world is set up, so the death screen is
+        ready before the player first dies. The score and the kills are filled in every time the death screen is shown.
+        
+        Parameters
+        ----------------------------------------------------
+        root: the NodePath of the screen, every widget of the screen is put under it
+        
+        Returns
+        ----------------------------------------------------
+        Returns a dictionary of the widgets of the screen
+'''
+        gui = {"replay": DirectButton(parent = root, text = "Play Again", scale = 0.1, pos = (0,0,-0.5), command = self.transitionDeathToGame, sortOrder = 10, text_font = self.gameFont, relief = None, text_fg = (1,1,1,1)),
+               "quit": DirectButton(parent = root, text = "Quit", scale = 0.1, command = self.gameQuit, pos = (-1.5,0,-0.75), sortOrder = 9, text_font = self.gameFont, relief = None, text_fg = (1,1,1,1)),
+               "score": DirectLabel(parent = root, text = "", scale = 0.2, sortOrder = 8, pos = (0,0,0.3), text_font = self.gameFont, relief = None, text_fg = (1,0,0,1)),
+               "bloodFilter": OnscreenImage(parent = root, image = r"assets/bloodSplatterThree.png", scale = (1.7778,1,1)),
+               "kills" : DirectLabel(parent = root, text = "", scale = 0.2, sortOrder = 7, pos = (0,0,0), text_font = self.gameFont, relief = None, text_fg = (1,0,0,1))}
         #makes the image transparent
-        self.gui["bloodFilter"].setTransparency(TransparencyAttrib.MAlpha)
-        
-        #removes the mainGame task from the taskManager
-        #if the player kills all ghosts just before it dies, it will add the round setup task to the task manager, I have not experienced this glitch
-        #but the if statement is to prevent it from happening at all.
-        self.taskMgr.remove("mainGame")
-        if self.taskMgr.hasTaskNamed("roundSetup"):
-            self.taskMgr.remove("roundSetup")
+        gui["bloodFilter"].setTransparency(TransparencyAttrib.MAlpha)
+        return gui
 
     def gameQuit(self):
         '''
@@ -507,6 +771,8 @@ class MyGame(ShowBase):
         None
 '''
         self.settings.saveSettings()
+        if self.inputLog is not None:
+            self.inputLog.stopRun()
         try:
             self.microbit.closeConnection()
         except:
@@ -515,8 +781,8 @@ class MyGame(ShowBase):
         
     def mainGame(self, task):
         '''
-        Main game method that is called when the game is running. It constantly updates the delta time (change in time from last frame),
-        then it checks if any ghosts are still alive, if there isn't any more ghost's alive it will call the setUpRound function which
+        Main game method that is ticked by the fixed step loop when the game is running. The delta time is set by the fixed step loop, it is always
+        the length of one tick. It checks if any ghosts are still alive, if there isn't any more ghost's alive it will call the setUpRound function which
         will set up the new round.
         
         Parameters
@@ -527,122 +793,69 @@ class MyGame(ShowBase):
         ----------------------------------------------------
         returns task.cont which indicates the task is finished
 '''
-        #settings deltaTime
-        self.dt = globalClock.getDt()
-        
-        #checkGhosts is a boolean variable
-        #iterates through self.ghosts and if there is a single ghost that is still alive, it will break from the loop
-        #and set checkGhosts to True
-        checkGhosts = False
-        for ghost in self.ghosts:
-            if ghost != None:
-                checkGhosts = True
-                break
+        #checkGhosts is a boolean variable, it is True if there is a single ghost that is still alive
+        checkGhosts = self.ghostSystem.hasLivingGhosts()
             
         #if there wasn't any ghosts alive and the game is not currently setting up rounds then increase the round
-        if not checkGhosts and not self.taskMgr.hasTaskNamed("roundSetup"):
+        if not checkGhosts and self.roundSetupTimer is None:
             self.round += 1
-            #adds the setupround task but only performs the task 2 seconds later.
-            self.taskMgr.doMethodLater(2,self.setUpRound,"roundSetup")
+            #sets up the next round 2 seconds of game time later, with the scheduler of the game clock
+            self.roundSetupTimer = self.gameClock.scheduler.schedule(2, self.roundSetupDue)
             
         return task.cont
     
-    def setUpRound(self, task):
+    def roundSetupDue(self):
+        '''
+        This method is called by the scheduler of the game clock 2 seconds of game time after the last ghost of a round dies, it sets up the next round.
+        The round is set up on game time, so it happens on the same tick every time a game is replayed.
+'''
+        self.roundSetupTimer = None
+        self.setUpRound()
+    
+    def setUpRound(self, task = None):
         '''
         This task is responsible for setting up the next round. It works similarily to the setUpMainGame task, except it
         doesn't tear the whole scene down, instead it modifies some variable and adjusts for the new round and new amount of ghosts.
         
-        It recreates the list of ghost objects, redos the event lists for each of them. It also recreates the event list
-        for checking if the ghost is hit by the axe, if the ghost is hitting the player, and which ghosts are colliding with eachother.
+        It creates an empty list of ghosts and gives the spawn director the new amount of ghosts, the spawn director takes the ghosts out of the
+        ghost pool as they spawn in. It resizes the arrays for checking if the ghost is hit by the axe and if the ghost is hitting the player.
+        Ghosts colliding with eachother are found by the ghost system every frame, so nothing needs to be set up for them.
         Then it resets the round spawn timer.
         
         Parameters
         ----------------------------------------------------
-        task: task object from direct.task
+        task: Default: None, task object from direct.task, the headless simulation and the benchmark call this method as a task
         
         Returns
         ----------------------------------------------------
-        Returns task.done which indicates the task is finished and can be removed from the task manager.
+        Returns task.done which indicates the task is finished and can be removed from the task manager, or None if there is no task.
 '''
-        #resets the lists for the ghosts and their event lists in the Handler() class
-        #Tells the handler to ignore every ghostToGhost event then resets the ghosttoghosts event list
-        self.ghosts = []
-        self.events.ghostAxeList = []
-        self.events.ghostHitList = []
-        self.events.ghostToGhostColliding = []
-        for event in self.events.ghostToGhostEventList:
-            self.events.ignore(event)
-        self.events.ghostToGhostEventList = []
-        
-        #recreates the ghosts list of ghost objects.
-        for num in range(self.round+1):
-            self.ghosts.append(Ghost(num))
-            
-        #adds all the update tasks for each ghost in ghosts list
-        #also adds the correct amount of indices with default values for ghostAxeList, ghostHitList and ghostToGhostColliding
-        for num in range(len(self.ghosts)):
-            self.taskMgr.add(self.ghosts[num].update, f"{num}updateGhost")
-            self.events.ghostAxeList.append(False)
-            self.events.ghostHitList.append([False,Timer()])
-            self.events.ghostToGhostColliding.append(-1)
-            for ghost in self.ghosts:
-                #tells the event handler class to accept events that are thrown when ghosts collide with eachother
-                if ghost != self.ghosts[num]:
-                    self.events.accept(f"{num}ghostCollNode-into-{ghost.ghostNumber}ghostCollNode", self.events.ghostToGhost, [num, ghost.ghostNumber])
-                    self.events.ghostToGhostEventList.append("{num}ghostCollNode-into-{ghost.ghostNumber}ghostCollNode")
-                    self.events.accept(f"{num}ghostCollNode-out-{ghost.ghostNumber}ghostCollNode", self.events.ghostToGhost, [num, ghost.ghostNumber])
-                    self.events.ghostToGhostEventList.append("{num}ghostCollNode-out-{ghost.ghostNumber}ghostCollNode")
+        #none of the ghosts for this round have spawned yet, the spawn director puts each ghost into the list when it spawns
+        self.ghosts = [None]*(self.round+1)
+        
+        #hands the new ghosts to the ghost system, which updates all of them in one task
+        #creates the spawn timeline for the round
+        #resizes the arrays of the collision handler to the new amount of ghosts
+        #no ghost of the new round is touching the player or on its hit cooldown
+        self.ghostSystem.setUpGhosts(self.ghosts)
+        self.spawnDirector.setUpRound(len(self.ghosts))
+        self.collisions.setGhostCount(len(self.ghosts))
+        self.playerDamage.setUpRound()
+        
         #resets the roundspawn timer
         self.roundSpawnTimer.setTimer(0)
         
         #resets the roundcounter
         self.roundCounter.setText(f"Round {self.round}")
-        return task.done
+        if task is not None:
+            return task.done
     
-    def createMap(self):
-        '''
-        This method is for creating the map, it loads all of the tree NodePaths into a list.
-        Parameters
-        ----------------------------------------------------
-        None
-        
-        Returns
-        ----------------------------------------------------
-        Returns a list of NodePaths objects
-         
-'''
-        trees = [self.loader.loadModel(r"assets/treeOne.x"),
-                      self.loader.loadModel(r"assets/treeTwo.x"),
-                      self.loader.loadModel(r"assets/treeTwo.x"),
-                      self.loader.loadModel(r"assets/treeTwo.x"),
-                      self.loader.loadModel(r"assets/treeOne.x"),
-                      self.loader.loadModel(r"assets/treeOne.x"),
-                      self.loader.loadModel(r"assets/treeTwo.x")]
-        
-        for num in range(27):
-            if num == 4 or num == 13:
-                trees.append(self.loader.loadModel(r"assets/treeOne.x"))
-                trees.append(self.loader.loadModel(r"assets/treeTwo.x"))
-                trees.append(self.loader.loadModel(r"assets/treeTwo.x"))
-                trees.append(self.loader.loadModel(r"assets/treeTwo.x"))
-                trees.append(self.loader.loadModel(r"assets/treeOne.x"))
-            else:
-                trees.append(self.loader.loadModel(r"assets/treeOne.x"))
-                trees.append(self.loader.loadModel(r"assets/treeTwo.x"))
-                trees.append(self.loader.loadModel(r"assets/treeTwo.x"))
-                trees.append(self.loader.loadModel(r"assets/treeTwo.x"))
-                trees.append(self.loader.loadModel(r"assets/treeOne.x"))
-                trees.append(self.loader.loadModel(r"assets/treeOne.x"))
-                trees.append(self.loader.loadModel(r"assets/treeTwo.x"))
-        return trees
-
     def setUpMap(self):
         '''
-        This method takes all the trees in self.trees and sets them up in the scene
-        
-        It inserts every tree into the scene graph as a child of the gameRoot NodePath.
-        Then it sets each ones textures, rotates it (the models come by default as sideways), then calls set light
-        on each of the trees. Setlight indicates that this object will be affected by the light object.
+        This method sets up the map from the game map. It gets the model of each kind of prop from the game loader, then the static scenery copies it
+        into place for every prop in the map, puts the floor in with them and merges them into a few batches (see the StaticScenery class).
+        The textures and the lights are set on all of the trees at once. Setlight indicates that this object will be affected by the light object.
+        It is a generator, it stops after each chunk of the map is built.
         
         Parameters
         ----------------------------------------------------
@@ -650,239 +863,40 @@ class MyGame(ShowBase):
         
         Returns
         ----------------------------------------------------
-        None
+        Yields how much of the map has been set up, as a number between 0 and 1
 
 '''
-        for tree in self.trees:
-            tree.reparentTo(self.gameRoot)
-            tree.setTexture(self.textures)
-            tree.setHpr(0,90,0)
-            tree.setLight(self.pLight)
-            tree.setLight(self.aLight)
-            
-        self.trees[0].setPos(-61,-34,-0.5)
-        self.trees[1].setPos(-62,-30,-0.5)
-        self.trees[2].setPos(-59,-28,-0.5)
-        self.trees[3].setPos(-62,-26,-0.5)
-        self.trees[4].setPos(-58.5,-27,-0.5)
-        self.trees[5].setPos(-62,-25,-0.5)
-        self.trees[6].setPos(-59,-23,-0.5)
-        
-        self.trees[7].setPos(-61,-21,-0.5)
-        self.trees[8].setPos(-62,-17,-0.5)
-        self.trees[9].setPos(-59,-15,-0.5)
-        self.trees[10].setPos(-62,-13,-0.5)
-        self.trees[11].setPos(-58.5,-14,-0.5)
-        self.trees[12].setPos(-62,-12,-0.5)
-        self.trees[13].setPos(-59,-10,-0.5)
-        
-        self.trees[14].setPos(-61,-8,-0.5)
-        self.trees[15].setPos(-62,-4,-0.5)
-        self.trees[16].setPos(-59,-2,-0.5)
-        self.trees[17].setPos(-62,0,-0.5)
-        self.trees[18].setPos(-58.5,-1,-0.5)
-        self.trees[19].setPos(-62,1,-0.5)
-        self.trees[20].setPos(-59,3,-0.5)
-        
-        self.trees[21].setPos(-61,5,-0.5)
-        self.trees[22].setPos(-62,9,-0.5)
-        self.trees[23].setPos(-59,11,-0.5)
-        self.trees[24].setPos(-62,13,-0.5)
-        self.trees[25].setPos(-58.5,12,-0.5)
-        self.trees[26].setPos(-62,14,-0.5)
-        self.trees[27].setPos(-59,16,-0.5)
-        
-        self.trees[28].setPos(-61,18,-0.5)
-        self.trees[29].setPos(-62,22,-0.5)
-        self.trees[30].setPos(-59,24,-0.5)
-        self.trees[31].setPos(-62,26,-0.5)
-        self.trees[32].setPos(-58.5,25,-0.5)
-        self.trees[33].setPos(-62,27,-0.5)
-        self.trees[34].setPos(-59,29,-0.5)
-        
-        self.trees[35].setPos(-61,31,-0.5)
-        self.trees[36].setPos(-62,35,-0.5)
-        self.trees[37].setPos(-59,37,-0.5)
-        self.trees[38].setPos(-62,39,-0.5)
-        self.trees[39].setPos(-58.5,38,-0.5)
-    
-        #forward side
-        self.trees[40].setPos(-53,38,-0.5)
-        self.trees[41].setPos(-51,39,-0.5)
-        self.trees[42].setPos(-49,36,-0.5)
-        self.trees[43].setPos(-42,39,-0.5)
-        self.trees[44].setPos(-40,35.5,-0.5)
-        self.trees[45].setPos(-45,38,-0.5)
-        self.trees[46].setPos(-44,36,-0.5)
-        
-        self.trees[47].setPos(-40,38,-0.5)
-        self.trees[48].setPos(-38,39,-0.5)
-        self.trees[49].setPos(-36,36,-0.5)
-        self.trees[50].setPos(-29,39,-0.5)
-        self.trees[51].setPos(-27,35.5,-0.5)
-        self.trees[52].setPos(-32,38,-0.5)
-        self.trees[53].setPos(-31,36,-0.5)
-        
-        self.trees[54].setPos(-27,38,-0.5)
-        self.trees[55].setPos(-25,39,-0.5)
-        self.trees[56].setPos(-23,36,-0.5)
-        self.trees[57].setPos(-16,39,-0.5)
-        self.trees[58].setPos(-13,35.5,-0.5)
-        self.trees[59].setPos(-19,38,-0.5)
-        self.trees[60].setPos(-17.5,36,-0.5)
-        
-        self.trees[61].setPos(-14,38,-0.5)
-        self.trees[62].setPos(-12,39,-0.5)
-        self.trees[63].setPos(-10,36,-0.5)
-        self.trees[64].setPos(-3,39,-0.5)
-        self.trees[65].setPos(0,35.5,-0.5)
-        self.trees[66].setPos(-6,38,-0.5)
-        self.trees[67].setPos(-4.5,36,-0.5)
-        
-        self.trees[68].setPos(-1,38,-0.5)
-        self.trees[69].setPos(1,39,-0.5)
-        self.trees[70].setPos(3,36,-0.5)
-        self.trees[71].setPos(10,39,-0.5)
-        self.trees[72].setPos(13,35.5,-0.5)
-        self.trees[73].setPos(7,38,-0.5)
-        self.trees[74].setPos(8.5,36,-0.5)
-        
-        self.trees[75].setPos(12,38,-0.5)
-        self.trees[76].setPos(14,39,-0.5)
-        self.trees[77].setPos(16,36,-0.5)
-        self.trees[78].setPos(23,39,-0.5)
-        self.trees[79].setPos(26,35.5,-0.5)
-        self.trees[80].setPos(20,38,-0.5)
-        self.trees[81].setPos(21.5,36,-0.5)
-        
-        self.trees[82].setPos(25,38,-0.5)
-        self.trees[83].setPos(27,39,-0.5)
-        self.trees[84].setPos(29,36,-0.5)
-        self.trees[85].setPos(36,39,-0.5)
-        self.trees[86].setPos(39,35.5,-0.5)
-        self.trees[87].setPos(33,38,-0.5)
-        self.trees[88].setPos(34.5,36,-0.5)
-        
-        self.trees[89].setPos(38,38,-0.5)
-        self.trees[90].setPos(40,39,-0.5)
-        self.trees[91].setPos(42,36,-0.5)
-        self.trees[92].setPos(49,39,-0.5)
-        self.trees[93].setPos(52,35.5,-0.5)
-        self.trees[94].setPos(46,38,-0.5)
-        self.trees[95].setPos(47.5,36,-0.5)
-        
-        #right side
-        self.trees[96].setPos(51,18,-0.5)
-        self.trees[97].setPos(52,22,-0.5)
-        self.trees[98].setPos(49,24,-0.5)
-        self.trees[99].setPos(52,26,-0.5)
-        self.trees[100].setPos(48.5,25,-0.5)
-        self.trees[101].setPos(52,27,-0.5)
-        self.trees[102].setPos(49,29,-0.5)
-        
-        self.trees[103].setPos(51,-34,-0.5)
-        self.trees[104].setPos(52,-30,-0.5)
-        self.trees[105].setPos(49,-28,-0.5)
-        self.trees[106].setPos(52,-26,-0.5)
-        self.trees[107].setPos(48.5,-27,-0.5)
-        self.trees[108].setPos(52,-25,-0.5)
-        self.trees[109].setPos(49,-23,-0.5)
-        
-        self.trees[110].setPos(51,-21,-0.5)
-        self.trees[111].setPos(52,-17,-0.5)
-        self.trees[112].setPos(49,-15,-0.5)
-        self.trees[113].setPos(52,-13,-0.5)
-        self.trees[114].setPos(48.5,-14,-0.5)
-        self.trees[115].setPos(52,-12,-0.5)
-        self.trees[116].setPos(49,-10,-0.5)
-        
-        self.trees[117].setPos(51,-8,-0.5)
-        self.trees[118].setPos(52,-4,-0.5)
-        self.trees[119].setPos(49,-2,-0.5)
-        self.trees[120].setPos(52,0,-0.5)
-        self.trees[121].setPos(48.5,-1,-0.5)
-        self.trees[122].setPos(52,1,-0.5)
-        self.trees[123].setPos(49,3,-0.5)
-        
-        self.trees[124].setPos(51,5,-0.5)
-        self.trees[125].setPos(52,9,-0.5)
-        self.trees[126].setPos(49,11,-0.5)
-        self.trees[127].setPos(52,13,-0.5)
-        self.trees[128].setPos(48.5,12,-0.5)
-        self.trees[129].setPos(52,14,-0.5)
-        self.trees[130].setPos(49,16,-0.5)
-        
-        self.trees[131].setPos(51,31,-0.5)
-        self.trees[132].setPos(52,35,-0.5)
-        self.trees[133].setPos(49,37,-0.5)
-        self.trees[134].setPos(52,39,-0.5)
-        self.trees[135].setPos(48.5,38,-0.5)
-        
-        #backward side
-        self.trees[136].setPos(-53,-32,-0.5)
-        self.trees[137].setPos(-51,-33,-0.5)
-        self.trees[138].setPos(-49,-30,-0.5)
-        self.trees[139].setPos(-42,-33,-0.5)
-        self.trees[140].setPos(-40,-29.5,-0.5)
-        self.trees[141].setPos(-45,-32,-0.5)
-        self.trees[142].setPos(-44,-30,-0.5)
-        
-        self.trees[143].setPos(-40,-32,-0.5)
-        self.trees[144].setPos(-38,-33,-0.5)
-        self.trees[145].setPos(-36,-30,-0.5)
-        self.trees[146].setPos(-29,-33,-0.5)
-        self.trees[147].setPos(-27,-29.5,-0.5)
-        self.trees[148].setPos(-32,-32,-0.5)
-        self.trees[149].setPos(-31,-30,-0.5)
-        
-        self.trees[150].setPos(-27,-32,-0.5)
-        self.trees[151].setPos(-25,-33,-0.5)
-        self.trees[152].setPos(-23,-30,-0.5)
-        self.trees[153].setPos(-16,-33,-0.5)
-        self.trees[154].setPos(-13,-29.5,-0.5)
-        self.trees[155].setPos(-19,-32,-0.5)
-        self.trees[156].setPos(-17.5,-30,-0.5)
-        
-        self.trees[157].setPos(-14,-32,-0.5)
-        self.trees[158].setPos(-12,-33,-0.5)
-        self.trees[159].setPos(-10,-30,-0.5)
-        self.trees[160].setPos(-3,-33,-0.5)
-        self.trees[161].setPos(0,-29.5,-0.5)
-        self.trees[162].setPos(-6,-32,-0.5)
-        self.trees[163].setPos(-4.5,-30,-0.5)
-        
-        self.trees[164].setPos(-1,-32,-0.5)
-        self.trees[165].setPos(1,-33,-0.5)
-        self.trees[166].setPos(3,-30,-0.5)
-        self.trees[167].setPos(10,-33,-0.5)
-        self.trees[168].setPos(13,-29.5,-0.5)
-        self.trees[169].setPos(7,-32,-0.5)
-        self.trees[170].setPos(8.5,-30,-0.5)
-        
-        self.trees[171].setPos(12,-32,-0.5)
-        self.trees[172].setPos(14,-33,-0.5)
-        self.trees[173].setPos(16,-30,-0.5)
-        self.trees[174].setPos(23,-33,-0.5)
-        self.trees[175].setPos(26,-29.5,-0.5)
-        self.trees[176].setPos(20,-32,-0.5)
-        self.trees[177].setPos(21.5,-30,-0.5)
-        
-        self.trees[178].setPos(25,-32,-0.5)
-        self.trees[179].setPos(27,-33,-0.5)
-        self.trees[180].setPos(29,-30,-0.5)
-        self.trees[181].setPos(36,-33,-0.5)
-        self.trees[182].setPos(39,-29.5,-0.5)
-        self.trees[183].setPos(33,-32,-0.5)
-        self.trees[184].setPos(34.5,-30,-0.5)
-        
-        self.trees[185].setPos(38,-32,-0.5)
-        self.trees[186].setPos(40,-33,-0.5)
-        self.trees[187].setPos(42,-30,-0.5)
-        self.trees[188].setPos(49,-33,-0.5)
-        self.trees[189].setPos(52,-29.5,-0.5)
-        self.trees[190].setPos(46,-32,-0.5)
-        self.trees[191].setPos(47.5,-30,-0.5)
+        models = [self.gameLoader.getModel(modelPath) for modelPath in self.map.modelPaths]
+        self.scenery = StaticScenery(self.gameRoot)
+        yield from self.scenery.buildSteps(self.map, models, self.environment, self.textures, [self.pLight, self.aLight])
 
-game = MyGame()
-
-game.run() 
\ No newline at end of file
+if __name__ == "__main__":
+    #the game can be ran in headless mode, with the --headless flag or by setting the GHOST_SURVIVAL_HEADLESS environment variable
+    parser = argparse.ArgumentParser(description = "Ghost Survival")
+    parser.add_argument("--headless", action = "store_true", default = bool(os.environ.get("GHOST_SURVIVAL_HEADLESS")), help = "simulate the game with no window or audio")
+    parser.add_argument("--rounds", type = int, default = 5, help = "headless: number of rounds to simulate")
+    parser.add_argument("--start-round", type = int, default = 1, help = "headless: round to start the simulation at")
+    parser.add_argument("--timestep", type = float, default = 1/60, help = "headless: seconds of game time simulated each frame")
+    parser.add_argument("--record", help = "file to record the input of every game to")
+    parser.add_argument("--replay", help = "input log to play back, with --headless it is played back as fast as possible")
+    parser.add_argument("--output", help = "headless replay: json file the results are saved to")
+    args = parser.parse_args()
+    
+    if args.headless and args.replay:
+        from simulation import HeadlessReplay
+        game = MyGame(headless = True)
+        results = HeadlessReplay(game, InputReplay(args.replay)).run()
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(results, file, indent = 4)
+    elif args.headless:
+        from simulation import HeadlessSimulation
+        game = MyGame(headless = True)
+        HeadlessSimulation(game, rounds = args.rounds, startRound = args.start_round, timestep = args.timestep).run()
+    else:
+        game = MyGame()
+        if args.record:
+            game.inputLog = InputRecorder(args.record)
+        elif args.replay:
+            game.inputLog = InputReplay(args.replay)
+        game.run() 
\ No newline at end of file
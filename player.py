@@ -1,13 +1,11 @@
 from axe import Axe
 from panda3d.core import CollisionCapsule
 from panda3d.core import CollisionNode
-from game_collision_handler import CollisionHandler
 
 import game
 import math
-from timer import Timer
-from direct.gui.OnscreenImage import OnscreenImage
-from panda3d.core import TransparencyAttrib
+from fixed_step_loop import lerpAngle
+from damage_hud import DamageHud
 
 #player hit sound effect from https://www.fesliyanstudios.com/royalty-free-sound-effects-download/breathing-150
 class Player():
@@ -26,45 +24,74 @@ class Player():
         None
 '''
         
-        self.speed = 0
         self.acceleration = 15
         self.decceleration = -17
         
-        #this attribute represents the last direction the player was moving in, when the user doesn't click
-        #any buttons, the player will maintain its current speed in the direction it was last moving in, simulating inertia.
-        self.lastMovingDirection = 0
-        
-        self.posX = 0
-        self.posY = -10
-        self.posZ = 2
-        
-        self.heading = 0
-        self.pitch = 0
-        self.roll = 0
-        
-        self.playerHealth = 15
+        #if the player is invulnerable, it never dies, this is used when the game is simulated in headless mode
+        self.invulnerable = False
         
-        #regenTimer is a timer that is used to determine when the player can begin to regenerate health
-        self.regenTimer = Timer()
+        #regenTimer is the scheduler timer that regenerates the health of the player, it is started again every time the player is hit
+        self.regenTimer = None
         
         #collision NodePath for the player object. 
         self.cnodePath = game.gameObj.cam.attachNewNode(CollisionNode("playerCollNode"))
         self.cnodePath.node().addSolid(CollisionCapsule(0,0,0,0,0,2,0.5))
         self.cnodePath.show()
-        self.playerCollHandler = CollisionHandler()
-        game.gameObj.cTrav.addCollider(self.cnodePath, self.playerCollHandler)
+        game.gameObj.collisions.addCollider(self.cnodePath, "player")
         
         #axe object
         self.axe = Axe()
         
-        #damage filter, this is an attribute that is assigned an image to put on the screen.
-        #this is where the image for the bloody effect that comes on the screen when the player is damaged is stored
-        self.damageFilter = None
+        #damage hud, the bloody overlay that comes on the screen when the player is damaged
+        self.damageHud = DamageHud()
         
         #sound effects for the player
         self.playerHitSFX = game.gameObj.loader.loadSfx(r"assets/sounds/heavy-breathing.mp3")
         self.playerHitSFX.setLoop(True)
         self.playerHitSFX.setVolume(0.75)
+        
+        #sets the speed, position, rotation and health of the player
+        self.reset()
+    
+    def reset(self):
+        '''
+        This method puts the player back to how it is at the start of a game, its speed, position, rotation and health, and resets the axe.
+        The player object is only created once, when the game is first set up, and every game after that it is reset instead of created again.
+        
+        Parameters
+        ----------------------------------------------------
+        None
+        
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.speed = 0
+        
+        #this attribute represents the last direction the player was moving in, when the user doesn't click
+        #any buttons, the player will maintain its current speed in the direction it was last moving in, simulating inertia.
+        self.lastMovingDirection = 0
+        
+        self.posX = 0
+        self.posY = -10
+        self.posZ = 2
+        
+        self.heading = 0
+        self.pitch = 0
+        self.roll = 0
+        
+        self.playerHealth = 15
+        game.gameObj.gameClock.scheduler.cancel(self.regenTimer)
+        self.regenTimer = None
+        
+        #removes the bloody image and stops the heavy breathing from the last game
+        self.damageHud.reset()
+        self.playerHitSFX.stop()
+        
+        #the position and rotation of the player before the last tick, used to draw the player between ticks
+        self.lastState = (self.posX, self.posY, self.posZ, self.heading, self.pitch, self.roll)
+        self.updatePlayerLoc()
+        self.axe.reset()
     
     def updatePlayerLoc(self):
         '''
@@ -80,6 +107,41 @@ class Player():
 '''
         game.gameObj.camera.setPos(self.posX,self.posY,self.posZ)
         game.gameObj.camera.setHpr(self.heading,self.pitch,self.roll)
+    
+    def saveState(self):
+        '''
+        This method is called by the fixed step loop before every tick, it saves the position and rotation of the player and the position of the axe
+        so the player can be drawn between its last two states.
+        
+        Parameters
+        ----------------------------------------------------
+        None
+        
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.lastState = (self.posX, self.posY, self.posZ, self.heading, self.pitch, self.roll)
+        self.axe.lastPos = (self.axe.posX, self.axe.posY, self.axe.posZ)
+    
+    def interpolate(self, alpha):
+        '''
+        This method is called by the fixed step loop after the ticks of a frame, it moves the camera and the axe between their saved state and their current state.
+        
+        Parameters
+        ----------------------------------------------------
+        alpha: a number between 0 and 1, how much of the next tick has passed
+        
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        x, y, z, heading, pitch, roll = self.lastState
+        game.gameObj.camera.setPos(x + (self.posX - x)*alpha, y + (self.posY - y)*alpha, z + (self.posZ - z)*alpha)
+        game.gameObj.camera.setHpr(lerpAngle(heading, self.heading, alpha), lerpAngle(pitch, self.pitch, alpha), lerpAngle(roll, self.roll, alpha))
+        if self.axe.animate:
+            x, y, z = self.axe.lastPos
+            self.axe.np.setPos(x + (self.axe.posX - x)*alpha, y + (self.axe.posY - y)*alpha, z + (self.axe.posZ - z)*alpha)
         
     def updateSpeed(self):
         '''
@@ -116,7 +178,7 @@ class Player():
             
     def updatePlayer(self,task):
         '''
-        This is a task that is responsible for updating the player, this is added to the task manager whenver the game is being played.
+        This is a task that is responsible for updating the player, this is ticked by the fixed step loop whenever the game is being played.
         This method involves changing the direction the player is looking in, allowing the player to move, checking for damage and updating the axe.
         
         Parameters
@@ -176,9 +238,10 @@ class Player():
                 self.posX, self.posY = newPos
         
         #if the input is the mouse, then moving the mouse will move the direction the player is looking in
-        if game.gameObj.inputMode == "mouse":  
-            mouse = game.gameObj.mouseWatcherNode
-            mouseX, mouseY = mouse.getMouseX(), mouse.getMouseY()
+        #in headless mode there is no window, so there is no mouse to read unless a game is being replayed
+        mouse = game.gameObj.getMouse() if game.gameObj.inputMode == "mouse" else None
+        if mouse is not None:
+            mouseX, mouseY = mouse
             #mouse x and mouseY are coordinates between 0-1.
             #the heading rotation is the change in the mouseX
             #the pitch rotation is the change in the mouseY
@@ -189,7 +252,8 @@ class Player():
             self.pitch += pitchRot
             
             #moves the cursor back to the center of the screen. 
-            game.gameObj.win.movePointer(0, game.gameObj.props.getXSize()//2,game.gameObj.props.getYSize()//2)
+            if game.gameObj.win is not None:
+                game.gameObj.win.movePointer(0, game.gameObj.props.getXSize()//2,game.gameObj.props.getYSize()//2)
         
         #if the inputMode is the microbit, then a and d are used to pan left and right. 
         if game.gameObj.inputMode == "microbit":
@@ -217,13 +281,29 @@ class Player():
 '''
         return (game.gameObj.mapBorder[0][0] <= newPos[0] <= game.gameObj.mapBorder[0][1]) and (game.gameObj.mapBorder[1][0] <= newPos[1] <= game.gameObj.mapBorder[1][1])
     
-    def checkDamage(self):
+    def takeDamage(self, damage):
         '''
-        This method is responsible for checking if the player is taking damage.
+        This method is called by the player damage system when a ghost hits the player (see the PlayerDamage class). The player loses health,
+        the regen timer starts again and the heavy breathing sound effect plays.
         
-        It iterates through the ghostHitList list in the game events object to determine which ghost hit the player.
-        Each ghost has its own timer which indicates their hit cooldown, this prevents ghosts from spamming hits.
-        This method also manages the health regeneration for the player. 
+        Parameters
+        ----------------------------------------------------
+        damage: the health the player loses
+        
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.playerHealth -= damage
+        scheduler = game.gameObj.gameClock.scheduler
+        scheduler.cancel(self.regenTimer)
+        self.regenTimer = scheduler.schedule(4, self.regenerate)
+        self.playerHitSFX.play()
+    
+    def checkDamage(self):
+        '''
+        This method is responsible for checking if the player has died, and showing how hurt the player is on the damage hud.
+        The damage itself is done by the player damage system when ghosts touch the player, so this method does not depend on the number of ghosts.
         
         Parameters
         ----------------------------------------------------
@@ -233,64 +313,31 @@ class Player():
         ----------------------------------------------------
         None
         '''
-        
-        for ghosts in game.gameObj.events.ghostHitList:
-            if ghosts[0] == True:
-                if ghosts[1].mode == "default":
-                    #if the ghost that has hit the player does not have a cooldown, it will cause the player to take damage and it will start the regeneration timer
-                    #it will also start the timer for the ghost hit cooldown
-                    #plays the heavy breathing sound effect
-                    self.playerHealth -= 5
-                    self.regenTimer.setTimer(4)
-                    self.playerHitSFX.play()
-                    ghosts[1].setTimer(3)
-                elif ghosts[1].getTimeUntil() < 0:
-                    #if the ghost hitting the player has passed its hit cooldown, the player will take damage, reset the regen timer and reset the ghost hit cooldown timer
-                    #plays heavy breathing sound effect
-                    self.playerHealth -= 5
-                    self.regenTimer.setTimer(4)
-                    self.playerHitSFX.play()
-                    ghosts[1].setTimer(3)
-            elif (not ghosts[0]) and ghosts[1].getTimeUntil() < 0:
-                #if the ghost isnt colliding with the player and the ghost hit hooldown is over, then it will reset the ghost hit cooldown timer.
-                ghosts[1].resetTimer()
-                
-        if self.playerHealth <= 0:
+        if self.playerHealth <= 0 and not self.invulnerable:
             #if the player health is below zero, the player dies
             game.gameObj.transitionGameToDeath()
-            game.gameObj.taskMgr.remove("updatePlayer")
+            game.gameObj.simLoop.removeSystem("updatePlayer")
             self.playerHitSFX.stop()
-            try:
-                self.damageFilter.destroy()
-            except:
-                pass
+            self.damageHud.reset()
+            game.gameObj.gameClock.scheduler.cancel(self.regenTimer)
             return
         
-        if self.regenTimer.mode == "timing" and self.regenTimer.getTimeUntil() < 0:
-            #if the regen timer is going and it has passed the regen cooldown, it will reset the player health, remove the bloody image from the screen
-            # and stop the heavy breathing sound effect
-            self.playerHealth = 15
-            self.damageFilter.destroy()
-            self.regenTimer.resetTimer()
-            self.playerHitSFX.stop()
-            
-        if self.playerHealth == 10:
-            #if the player health is 10, it will display the first bloody image
-            try:
-                self.damageFilter.destroy()
-            except AttributeError:
-                pass
-            self.damageFilter = OnscreenImage(image = r"assets/bloodSplatterOne.png", pos = (0,0,0), scale = (1.7778,1,1))
-            self.damageFilter.setTransparency(TransparencyAttrib.MAlpha)
-            
-        if self.playerHealth == 5:
-            #if the player health is 5, it will display the second bloody image
-            try:
-                self.damageFilter.destroy()
-            except AttributeError:
-                print(e)
-                pass
-            self.damageFilter = OnscreenImage(image = r"assets/bloodSplatterTwo.png", pos = (0,0,0), scale = (1.7778,1,1))
-            self.damageFilter.setTransparency(TransparencyAttrib.MAlpha)
-
-
+        #the damage hud shows a bloodier image the lower the player health is, it only changes when the health moves to a new tier
+        self.damageHud.setHealth(self.playerHealth)
+    
+    def regenerate(self):
+        '''
+        This method is called by the scheduler once the player has not been hit for 4 seconds, it resets the player health
+        and stops the heavy breathing sound effect. The damage hud fades out on the next tick.
+        
+        Parameters
+        ----------------------------------------------------
+        None
+        
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.playerHealth = 15
+        self.regenTimer = None
+        self.playerHitSFX.stop()
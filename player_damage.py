@@ -0,0 +1,88 @@
+from direct.showbase import DirectObject
+
+import game
+
+
+class PlayerDamage(DirectObject.DirectObject):
+    def __init__(self, player, damage = 5, cooldown = 3):
+        '''
+        Initialization for the PlayerDamage class. The player damage system is responsible for ghosts hurting the player. It does not look at
+        every ghost each frame. Instead, the collision handler throws a playerContactBegin event when a ghost starts touching the player and
+        a playerContactEnd event when it stops, and the damage system keeps the set of ghosts that are touching the player, the attackers.
+
+        A ghost hits the player as soon as it starts touching the player, unless it is still on its hit cooldown. Each hit schedules the end of
+        the cooldown of the ghost with the scheduler of the game clock, and when the cooldown is over the ghost hits again if it is still an attacker.
+        So the damage system only does any work when a ghost starts or stops touching the player, or a cooldown ends.
+
+        Parameters
+        ----------------------------------------------------
+        player: the player object
+        damage: Default: 5, the health the player loses each time a ghost hits it
+        cooldown: Default: 3, the number of seconds of game time before a ghost can hit the player again
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        super().__init__()
+        self.player = player
+        self.damage = damage
+        self.cooldown = cooldown
+
+        #the ghost numbers of the ghosts touching the player, and of the ghosts that are on their hit cooldown
+        self.attackers = set()
+        self.coolingDown = set()
+
+        #ghost numbers are used again every round, so cooldowns from the last round are ignored once a new round is set up
+        self.generation = 0
+
+        self.accept("playerContactBegin", self.contactBegin)
+        self.accept("playerContactEnd", self.contactEnd)
+
+    def setUpRound(self):
+        '''
+        This method is called at the start of every round and every game, no ghost is touching the player or on its hit cooldown.
+'''
+        self.attackers.clear()
+        self.coolingDown.clear()
+        self.generation += 1
+
+    def contactBegin(self, ghostNumber):
+        '''
+        This method is called when a ghost starts touching the player, the ghost hits the player straight away if it is not on its hit cooldown.
+
+        Parameters
+        ----------------------------------------------------
+        ghostNumber: an integer representing the ghost number
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.attackers.add(ghostNumber)
+        if ghostNumber not in self.coolingDown:
+            self.attack(ghostNumber)
+
+    def contactEnd(self, ghostNumber):
+        '''
+        This method is called when a ghost stops touching the player, including when it dies. Its hit cooldown keeps going.
+'''
+        self.attackers.discard(ghostNumber)
+
+    def attack(self, ghostNumber):
+        '''
+        This method makes a ghost hit the player and starts the hit cooldown of the ghost.
+'''
+        self.coolingDown.add(ghostNumber)
+        self.player.takeDamage(self.damage)
+        game.gameObj.gameClock.scheduler.schedule(self.cooldown, self.cooldownOver, ghostNumber, self.generation)
+
+    def cooldownOver(self, ghostNumber, generation):
+        '''
+        This method is called by the scheduler when the hit cooldown of a ghost is over, the ghost hits the player again if it is still touching the player.
+'''
+        if generation != self.generation:
+            return
+        self.coolingDown.discard(ghostNumber)
+        if ghostNumber in self.attackers:
+            self.attack(ghostNumber)
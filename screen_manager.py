@@ -0,0 +1,120 @@
+import game
+
+
+class ScreenManager():
+    def __init__(self):
+        '''
+        Initialization for the ScreenManager class. The screen manager holds every gui screen of the game (the start screen, the settings screen
+        and the death screen). Every time the screen changed, the gui used to be destroyed and created again, which lays out all of its text
+        in the font again and loads its images again. Instead, each screen is built once, the first time it is needed, and after that it is only
+        stashed and unstashed. Labels that show something that changes, like the score, are updated with setText.
+
+        Every screen has its own NodePath under aspect2d, the widgets of the screen are parented to it, so the whole screen is
+        shown and hidden at once. A stashed screen is not drawn and its buttons can not be clicked.
+
+        Parameters
+        ----------------------------------------------------
+        None
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        #dictionary from the name of each screen to the method that builds it
+        self.builders = {}
+
+        #dictionary from the name of each screen that has been built to its NodePath and to the dictionary of its widgets
+        self.roots = {}
+        self.screens = {}
+
+        #the name of the screen that is showing, None if no screen is showing
+        self.current = None
+
+    def addScreen(self, name, builder):
+        '''
+        This method adds a screen to the screen manager, it is not built until it is needed.
+
+        Parameters
+        ----------------------------------------------------
+        name: the name of the screen
+        builder: a method that takes the NodePath of the screen, creates every widget of the screen under it, and returns a dictionary of the widgets
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.builders[name] = builder
+
+    def build(self, name):
+        '''
+        This method builds a screen if it has not been built yet, the screen starts hidden. It can be called ahead of time so the
+        screen is ready before it is shown.
+
+        Parameters
+        ----------------------------------------------------
+        name: the name of the screen
+
+        Returns
+        ----------------------------------------------------
+        Returns the dictionary of the widgets of the screen
+'''
+        if name not in self.screens:
+            root = game.gameObj.aspect2d.attachNewNode(f"{name}Screen")
+            root.stash()
+            self.roots[name] = root
+            self.screens[name] = self.builders[name](root)
+        return self.screens[name]
+
+    def get(self, name):
+        '''
+        Returns the dictionary of the widgets of a screen, building the screen if it has not been built yet.
+'''
+        return self.build(name)
+
+    def show(self, name):
+        '''
+        This method hides the screen that is showing and shows this screen instead.
+
+        Parameters
+        ----------------------------------------------------
+        name: the name of the screen
+
+        Returns
+        ----------------------------------------------------
+        Returns the dictionary of the widgets of the screen
+'''
+        widgets = self.build(name)
+        self.hide()
+        self.roots[name].unstash()
+        self.current = name
+        return widgets
+
+    def hide(self):
+        '''
+        This method hides the screen that is showing, if there is one.
+'''
+        if self.current is not None:
+            self.roots[self.current].stash()
+            self.current = None
+
+    def setText(self, name, widget, text):
+        '''
+        This method changes the text of a widget on a screen. The text is only laid out again if it is different from the text the widget already has.
+        If the text has a character that is not in the font atlas, the widget is switched to the font that can render it (see the GameFont class).
+
+        Parameters
+        ----------------------------------------------------
+        name: the name of the screen
+        widget: the name of the widget in the dictionary of the screen
+        text: the new text
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        directGui = self.get(name)[widget]
+        if directGui["text"] != text:
+            font = game.gameObj.fonts.fontFor(text)
+            if directGui["text_font"] != font:
+                directGui["text_font"] = font
+            directGui.setText(text)
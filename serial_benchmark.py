@@ -0,0 +1,198 @@
+from event_handling import Handler
+from serial_reader import RingBuffer
+from accel_protocol import StreamDecoder
+from accel_protocol import encodeFrame
+from fake_microbit import FakeMicrobit
+from microbit import Microbit
+
+import numpy as np
+import threading
+import argparse
+import random
+import json
+import time
+
+
+def makeStream(protocol, count, tornRate = 0.0, garbageRate = 0.0, seed = 0):
+    '''
+    This function makes the bytes of a stream of random gestures, the same way the fake micro:bit writes them, and splits them into chunks
+    of random sizes like the reads of a serial port.
+
+    Parameters
+    ----------------------------------------------------
+    protocol: "text" or "binary"
+    count: the number of lines (or frames)
+    tornRate: Default: 0.0, the chance that a line is torn across two chunks
+    garbageRate: Default: 0.0, the chance that garbage bytes are put before a line
+    seed: Default: 0, the seed of the random numbers
+
+    Returns
+    ----------------------------------------------------
+    Returns the list of chunks
+'''
+    rng = random.Random(seed)
+    chunks = []
+    chunk = b""
+    for num in range(count):
+        if rng.random() < garbageRate:
+            chunk += bytes(rng.randrange(256) for garbage in range(rng.randint(1, 8)))
+        gesture = rng.choice(("face up", "face down"))
+        data = encodeFrame(num, *FakeMicrobit.READINGS[gesture]) if protocol == "binary" else f"{gesture}\r\n".encode()
+        if rng.random() < tornRate:
+            split = rng.randint(1, len(data) - 1)
+            chunks.append(chunk + data[:split])
+            chunk = data[split:]
+        else:
+            chunk += data
+        #the serial port is read in chunks of a few lines at a time
+        if rng.random() < 0.25:
+            chunks.append(chunk)
+            chunk = b""
+    chunks.append(chunk)
+    return chunks
+
+
+def benchmarkParser(protocol, count = 200000, tornRate = 0.1, garbageRate = 0.01):
+    '''
+    This function measures how fast the serial reader splits lines (or decodes frames with the binary protocol), without a serial port.
+    The stream is parsed the same way the serial reader thread parses it.
+
+    Parameters
+    ----------------------------------------------------
+    protocol: "text" or "binary"
+    count: Default: 200000, the number of lines (or frames) parsed
+    tornRate: Default: 0.1, the chance that a line is torn across two chunks
+    garbageRate: Default: 0.01, the chance that garbage bytes are put before a line
+
+    Returns
+    ----------------------------------------------------
+    Returns a dictionary of the results
+'''
+    chunks = makeStream(protocol, count, tornRate, garbageRate)
+    buffer = RingBuffer()
+    decoder = StreamDecoder()
+    parsed = 0
+    start = time.perf_counter()
+    for chunk in chunks:
+        buffer.write(chunk)
+        if protocol == "binary":
+            events, consumed = decoder.decode(buffer.peek())
+            buffer.consume(consumed)
+        else:
+            parsed += len(buffer.readLines())
+    seconds = time.perf_counter() - start
+    if protocol == "binary":
+        parsed = decoder.frames
+    return {"protocol": protocol, "parsed": parsed, "written": count, "seconds": seconds, "linesPerSecond": parsed/seconds}
+
+
+def benchmarkPty(protocol, seconds = 5.0, rate = 200, fps = 60, toggleEvery = 10, tornRate = 0.1, garbageRate = 0.01):
+    '''
+    This function measures the serial reading of the game end to end, with the fake micro:bit on a pseudo-terminal. The fake micro:bit
+    writes gestures at a steady rate, switching between face up and face down every few lines, while the main thread runs frames at the
+    frame rate of the game and does what the updateMicrobit task does every frame.
+
+    It measures how long the main thread spends on the micro:bit every frame, and the latency from the fake micro:bit finishing writing
+    a new gesture to keyMap["mouse1"] changing, which includes waiting for the next frame.
+
+    Parameters
+    ----------------------------------------------------
+    protocol: "text" or "binary"
+    seconds: Default: 5.0, how long to run for
+    rate: Default: 200, the lines written every second
+    fps: Default: 60, the frames run every second
+    toggleEvery: Default: 10, the number of lines written before the gesture changes
+    tornRate: Default: 0.1, the chance that a line is torn into two writes
+    garbageRate: Default: 0.01, the chance that garbage is written before a line
+
+    Returns
+    ----------------------------------------------------
+    Returns a dictionary of the results
+'''
+    fake = FakeMicrobit(rate = rate, protocol = protocol, tornRate = tornRate, garbageRate = garbageRate, seed = 0)
+    microbit = Microbit(protocol = protocol, extraDevices = [fake.device], scanInterval = 0.05)
+    handler = Handler()
+    while not microbit.isConnected():
+        time.sleep(0.01)
+
+    #the time every change of gesture finished being written, in order
+    changes = []
+    def write():
+        interval = 1/rate
+        nextWrite = time.perf_counter()
+        gestures = ("face up", "face down")
+        num = 0
+        while not fake.stopping.is_set():
+            finished = fake.write(gestures[(num//toggleEvery) % 2])
+            if num % toggleEvery == 0:
+                changes.append(finished)
+            num += 1
+            nextWrite += interval
+            time.sleep(max(nextWrite - time.perf_counter(), 0))
+    writer = threading.Thread(target = write, daemon = True)
+    writer.start()
+
+    frameTimes = []
+    detections = []
+    attacking = handler.keyMap["mouse1"]
+    end = time.perf_counter() + seconds
+    nextFrame = time.perf_counter()
+    while time.perf_counter() < end:
+        frameStart = time.perf_counter()
+        handler.releaseSwing()
+        for event, strength in microbit.readEvents():
+            handler.translateSwingEvent(event, strength)
+        handler.translateMicrobitEvent(microbit.readRecentLine())
+        frameEnd = time.perf_counter()
+        frameTimes.append(frameEnd - frameStart)
+
+        if handler.keyMap["mouse1"] != attacking:
+            attacking = handler.keyMap["mouse1"]
+            detections.append(frameEnd)
+        #the axe sees the swing during the ticks of the frame, and a swing that already ended is let go at the start of the next frame
+        handler.swingSeen()
+        nextFrame += 1/fps
+        time.sleep(max(nextFrame - time.perf_counter(), 0))
+
+    fake.stopping.set()
+    writer.join(1.0)
+    microbit.closeConnection()
+    fake.close()
+    handler.ignoreAll()
+
+    #the first change is to face up, which does not change keyMap, so the first change that is detected is the second one
+    #the changes are matched up once the run is over, the main thread can see a change before the writer thread has recorded it
+    latencies = [detected - written for detected, written in zip(detections, changes[1:])]
+    frameTimes = np.array(frameTimes)*1000
+    latencies = np.array(latencies)*1000 if latencies else np.zeros(1)
+    return {"protocol": protocol, "written": fake.written, "linesPerSecond": fake.written/seconds, "frames": len(frameTimes),
+            "frameMeanMs": float(frameTimes.mean()), "frameP99Ms": float(np.percentile(frameTimes, 99)),
+            "changes": len(changes) - 1, "detected": len(detections), "latencyMeanMs": float(latencies.mean()),
+            "latencyP99Ms": float(np.percentile(latencies, 99))}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "micro:bit serial benchmark")
+    parser.add_argument("--protocol", choices = ("text", "binary"), nargs = "+", default = ["text", "binary"], help = "protocols to benchmark")
+    parser.add_argument("--lines", type = int, default = 200000, help = "lines parsed by the parser benchmark")
+    parser.add_argument("--seconds", type = float, default = 5.0, help = "how long the pseudo-terminal benchmark runs for")
+    parser.add_argument("--rate", type = float, default = 200, help = "lines written every second by the fake micro:bit")
+    parser.add_argument("--fps", type = float, default = 60, help = "frames run every second by the main thread")
+    parser.add_argument("--torn", type = float, default = 0.1, help = "chance that a line is torn")
+    parser.add_argument("--garbage", type = float, default = 0.01, help = "chance that garbage is written before a line")
+    parser.add_argument("--output", help = "json file the results are saved to")
+    args = parser.parse_args()
+
+    results = {}
+    for protocol in args.protocol:
+        parsed = benchmarkParser(protocol, args.lines, args.torn, args.garbage)
+        print(f"{protocol} parser: {parsed['linesPerSecond']:.0f} lines per second, {parsed['parsed']} of {parsed['written']} lines parsed")
+        pty = benchmarkPty(protocol, args.seconds, args.rate, args.fps, tornRate = args.torn, garbageRate = args.garbage)
+        print(f"{protocol} pseudo-terminal: {pty['linesPerSecond']:.0f} lines per second written, main thread {pty['frameMeanMs']:.4f} ms per frame "
+              f"(p99 {pty['frameP99Ms']:.4f} ms), latency {pty['latencyMeanMs']:.2f} ms (p99 {pty['latencyP99Ms']:.2f} ms), "
+              f"{pty['detected']} of {pty['changes']} changes detected")
+        results[protocol] = {"parser": parsed, "pty": pty}
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent = 4)
@@ -0,0 +1,323 @@
+import selectors
+import threading
+import queue
+import collections
+import time
+import os
+
+from accel_protocol import StreamDecoder
+
+
+class RingBuffer():
+    def __init__(self, capacity = 4096):
+        '''
+        Initialization for the RingBuffer class. The ring buffer holds the bytes read from a serial port that have not been split into lines yet.
+        It is a fixed size bytearray that is written to and read from in a circle, so reading from the port never grows a string or allocates a new buffer.
+        If the port sends more than the buffer can hold before a full line arrives, the oldest bytes are dropped.
+
+        Parameters
+        ----------------------------------------------------
+        capacity: Default: 4096, the number of bytes the buffer can hold
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.capacity = capacity
+        self.data = bytearray(capacity)
+        self.view = memoryview(self.data)
+
+        #the indice the next byte is read from, and the number of bytes in the buffer
+        self.start = 0
+        self.size = 0
+
+    def write(self, chunk):
+        '''
+        Adds bytes to the end of the buffer, dropping the oldest bytes if there is not enough room.
+'''
+        if len(chunk) >= self.capacity:
+            chunk = chunk[-self.capacity:]
+        overflow = self.size + len(chunk) - self.capacity
+        if overflow > 0:
+            self.start = (self.start + overflow) % self.capacity
+            self.size -= overflow
+
+        end = (self.start + self.size) % self.capacity
+        first = min(len(chunk), self.capacity - end)
+        self.view[end:end + first] = chunk[:first]
+        self.view[0:len(chunk) - first] = chunk[first:]
+        self.size += len(chunk)
+
+    def peek(self):
+        '''
+        Returns every byte in the buffer without taking them out of it, see consume.
+'''
+        end = self.start + self.size
+        if end <= self.capacity:
+            return bytes(self.view[self.start:end])
+        return bytes(self.view[self.start:]) + bytes(self.view[:end - self.capacity])
+
+    def consume(self, count):
+        '''
+        Takes a number of bytes out of the start of the buffer.
+'''
+        count = min(count, self.size)
+        self.start = (self.start + count) % self.capacity
+        self.size -= count
+
+    def readLines(self):
+        '''
+        Takes every complete line out of the buffer, the bytes after the last line ending are left in the buffer for the next read.
+
+        Returns
+        ----------------------------------------------------
+        Returns a list of the lines as bytes, without their line endings
+'''
+        if self.size == 0:
+            return []
+        end = self.start + self.size
+        if end <= self.capacity:
+            pending = self.data[self.start:end]
+        else:
+            pending = self.data[self.start:] + self.data[:end - self.capacity]
+
+        lastEnding = pending.rfind(b"\n")
+        if lastEnding < 0:
+            return []
+        self.start = (self.start + lastEnding + 1) % self.capacity
+        self.size -= lastEnding + 1
+        return [line.rstrip(b"\r") for line in pending[:lastEnding].split(b"\n")]
+
+
+class SerialReader(threading.Thread):
+    def __init__(self, ports = (), capacity = 4096, protocol = "text"):
+        '''
+        Initialization for the SerialReader class. The serial reader is a thread that reads every connected micro:bit, so the game loop never
+        waits on a serial port. It waits on all of the ports at once with a selector, reads whatever has arrived into the ring buffer of the port,
+        and splits off the complete lines. The newest line of each port is published as a snapshot, a tuple of the line, the time it arrived
+        (from time.monotonic) and a sequence number that goes up with every line.
+
+        The snapshot of a port is replaced as a whole with a single assignment, so the game loop can read it at any time without a lock and always
+        gets a complete snapshot. The game loop never touches the ports or the ring buffers.
+
+        On Windows, or anywhere a selector can not be used, the ports are polled every few milliseconds instead. A port that can not be waited on
+        with the selector (a pyserial port on Windows has no file descriptor) is polled on its own while the other ports are still waited on.
+        Ports can be added while the reader is running, when a micro:bit is plugged in (see addPort).
+
+        With the binary protocol the micro:bits send accelerometer frames instead of lines (see accel_protocol.py). The frames are decoded on the
+        reader thread as they arrive, and the swing events are put in a queue for each port instead of being published as a snapshot.
+
+        Parameters
+        ----------------------------------------------------
+        ports: Default: (), a list of open serial ports (serial.Serial objects), one for each micro:bit
+        capacity: Default: 4096, the size of the ring buffer of each port in bytes
+        protocol: Default: "text", "text" if the micro:bits send lines of text, or "binary" if they send accelerometer frames
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        super().__init__(name = "serialReader", daemon = True)
+        self.capacity = capacity
+        self.protocol = protocol
+        self.ports = []
+        self.buffers = []
+
+        #the newest snapshot of every port, (line, time, sequence number). Until a port sends a full line its snapshot is (None, 0, 0)
+        self.snapshots = []
+
+        #whether each port is still connected, a port that fails to read is closed and marked as disconnected
+        self.connected = []
+
+        #with the binary protocol, the decoder of every port and the swing events that have been decoded but not read by the game yet
+        #a deque can be appended to on one thread and popped from on another without a lock
+        self.decoders = []
+        self.events = []
+
+        self.stopping = threading.Event()
+        self.pollInterval = 0.005
+
+        #the indices of the ports that could not be registered with the selector, they are polled between waits on the selector
+        self.polled = []
+
+        #the indices of the ports that have been added but not registered with the selector yet, and a lock for adding ports from another thread
+        self.added = queue.SimpleQueue()
+        self.lock = threading.Lock()
+
+        #a pipe that wakes the selector up when a port is added or the reader is stopped
+        self.wakeRead, self.wakeWrite = os.pipe()
+
+        for port in ports:
+            self.addPort(port)
+
+    def addPort(self, port):
+        '''
+        This method adds an open serial port to the reader, it can be called from any thread while the reader is running.
+        Ports are never taken out of the reader, a port that has been disconnected stays in it marked as disconnected, so the indice of a port never changes.
+
+        Parameters
+        ----------------------------------------------------
+        port: an open serial port
+
+        Returns
+        ----------------------------------------------------
+        Returns the indice of the port, which is passed to getSnapshot
+'''
+        with self.lock:
+            num = len(self.ports)
+            self.buffers.append(RingBuffer(self.capacity))
+            self.snapshots.append((None, 0.0, 0))
+            self.connected.append(True)
+            self.decoders.append(StreamDecoder() if self.protocol == "binary" else None)
+            self.events.append(collections.deque())
+            #the port is added last, the poll loop only reads the ports in this list
+            self.ports.append(port)
+        self.added.put(num)
+        os.write(self.wakeWrite, b"\0")
+        return num
+
+    def getSnapshot(self, controller = 0):
+        '''
+        Returns the newest snapshot of a port, a tuple of the newest line (a string, or None if no line has arrived yet), the time it arrived and its sequence number.
+
+        Parameters
+        ----------------------------------------------------
+        controller: Default: 0, the indice of the port in the list of ports
+
+        Returns
+        ----------------------------------------------------
+        Returns the snapshot tuple
+'''
+        return self.snapshots[controller]
+
+    def readEvents(self, controller = 0):
+        '''
+        Takes every swing event that has been decoded from a port with the binary protocol, in the order they happened.
+
+        Parameters
+        ----------------------------------------------------
+        controller: Default: 0, the indice of the port in the list of ports
+
+        Returns
+        ----------------------------------------------------
+        Returns a list of the swing events, tuples of the name of the event and the strength of the swing
+'''
+        events = self.events[controller]
+        return [events.popleft() for num in range(len(events))]
+
+    def run(self):
+        '''
+        The loop of the reader thread, it runs until stop is called.
+'''
+        selector = self.makeSelector()
+        if selector is None:
+            #the ports can not be waited on, so they are polled
+            self.poll()
+            return
+
+        self.registerAdded(selector)
+        while not self.stopping.is_set():
+            #the selector only waits for a short time while there are ports to poll
+            timeout = self.pollInterval if self.polled else None
+            for key, events in selector.select(timeout):
+                if key.data is None:
+                    os.read(self.wakeRead, 512)
+                    self.registerAdded(selector)
+                elif not self.readPort(key.data):
+                    selector.unregister(key.fd)
+            for num in self.polled:
+                if self.connected[num]:
+                    self.readPort(num)
+        selector.close()
+
+    def makeSelector(self):
+        '''
+        Returns a selector with the wake pipe registered, or None if the ports have to be polled. On Windows the selector can only wait on
+        sockets, and registering the pipe does not fail, only waiting on it does, so the selector is tried once before it is used.
+'''
+        if os.name == "nt":
+            return None
+        selector = selectors.DefaultSelector()
+        try:
+            selector.register(self.wakeRead, selectors.EVENT_READ, None)
+            selector.select(0)
+        except (OSError, ValueError):
+            selector.close()
+            return None
+        return selector
+
+    def registerAdded(self, selector):
+        '''
+        Registers every port that has been added since the last call with the selector, a port that can not be registered is polled instead.
+'''
+        while not self.added.empty():
+            num = self.added.get()
+            try:
+                selector.register(self.ports[num].fileno(), selectors.EVENT_READ, num)
+            except (AttributeError, OSError, ValueError):
+                #io.UnsupportedOperation (no fileno) is a kind of OSError and ValueError
+                self.polled.append(num)
+
+    def poll(self):
+        '''
+        The loop of the reader thread when the ports can not be waited on with a selector.
+'''
+        while not self.stopping.is_set():
+            for num in range(len(self.ports)):
+                if self.connected[num]:
+                    self.readPort(num)
+            time.sleep(self.pollInterval)
+
+    def readPort(self, num):
+        '''
+        Reads everything that has arrived on a port into its ring buffer, then publishes the newest complete line.
+
+        Parameters
+        ----------------------------------------------------
+        num: the indice of the port
+
+        Returns
+        ----------------------------------------------------
+        Returns False if the port has been disconnected, otherwise True
+'''
+        port = self.ports[num]
+        try:
+            waiting = port.in_waiting
+            if waiting == 0:
+                return True
+            self.buffers[num].write(port.read(waiting))
+        except (OSError, ValueError) as e:
+            #serial.SerialException is a kind of OSError
+            print(f"micro:bit {num} disconnected: {e}")
+            self.connected[num] = False
+            try:
+                port.close()
+            except Exception:
+                pass
+            return False
+
+        if self.decoders[num] is not None:
+            buffer = self.buffers[num]
+            events, consumed = self.decoders[num].decode(buffer.peek())
+            buffer.consume(consumed)
+            self.events[num].extend(events)
+            return True
+
+        lines = self.buffers[num].readLines()
+        for line in reversed(lines):
+            if line:
+                sequence = self.snapshots[num][2] + 1
+                self.snapshots[num] = (line.decode("utf-8", "replace").strip(), time.monotonic(), sequence)
+                break
+        return True
+
+    def stop(self):
+        '''
+        Stops the reader thread and waits for it to finish. The ports are not closed.
+'''
+        self.stopping.set()
+        os.write(self.wakeWrite, b"\0")
+        if self.is_alive():
+            self.join(1.0)
+        os.close(self.wakeRead)
+        os.close(self.wakeWrite)
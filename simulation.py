@@ -0,0 +1,276 @@
+from panda3d.core import ClockObject
+
+import numpy as np
+import json
+import time
+
+
+class HeadlessSimulation():
+
+    #names of the systems of the fixed step loop that are timed, roundSetup is setUpRound
+    TIMED_TASKS = ("mainGame", "updatePlayer", "updateGhosts", "spawnDirector", "processCollisions", "roundSetup")
+
+    def __init__(self, gameObj, rounds = 5, startRound = 1, timestep = 1/60, fightTime = 5):
+        '''
+        Initialization for the HeadlessSimulation class. This class runs the game in headless mode (no window, no audio, no start screen)
+        as fast as the computer allows. Instead of using the real time between frames, the global clock is switched to a fixed timestep,
+        so every frame simulates exactly timestep seconds of the game, and every timer in the game follows the simulated time.
+        The fixed step loop of the game is set to the same timestep, so it runs exactly one tick every frame, and nothing is interpolated
+        since nothing is drawn.
+
+        Since there is no one playing, the player cannot die, and the ghosts that are still alive fightTime seconds after the last ghost of
+        the round has spawned are killed so the next round can start. At the end the number of rounds simulated per second and the time
+        spent in each task of the game are printed.
+
+        Parameters
+        ----------------------------------------------------
+        gameObj: the MyGame object, created with headless = True
+        rounds: Default: 5, the number of rounds to simulate
+        startRound: Default: 1, the round the simulation starts at
+        timestep: Default: 1/60, the number of seconds simulated by each frame
+        fightTime: Default: 5, the number of seconds after the last ghost spawns before the remaining ghosts are killed
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.game = gameObj
+        self.rounds = rounds
+        self.startRound = startRound
+        self.timestep = timestep
+        self.fightTime = fightTime
+
+        #total time in seconds and number of calls of each timed task
+        self.timings = {name: 0.0 for name in self.TIMED_TASKS}
+        self.calls = {name: 0 for name in self.TIMED_TASKS}
+
+        self.roundsCompleted = 0
+        self.frames = 0
+        self.finished = False
+
+    def timed(self, name, function):
+        '''
+        This method wraps a function so the time spent in it is added to the timings of name every time it is called.
+
+        Parameters
+        ----------------------------------------------------
+        name: the name of the timed task
+        function: the function to wrap
+
+        Returns
+        ----------------------------------------------------
+        Returns the wrapped function
+'''
+        def timedFunction(*args):
+            start = time.perf_counter()
+            result = function(*args)
+            self.timings[name] += time.perf_counter() - start
+            self.calls[name] += 1
+            return result
+        return timedFunction
+
+    def start(self, task):
+        '''
+        This is a task that sets up the main game, skips to the starting round, and then wraps every system of the fixed step loop so it is timed.
+
+        Parameters
+        ----------------------------------------------------
+        task: task object from direct.task
+
+        Returns
+        ----------------------------------------------------
+        returns task.done which indicates the task is finished and should be removed from the task manager
+'''
+        self.game.setUpRound = self.timed("roundSetup", self.game.setUpRound)
+        self.game.setUpMainGame(task)
+        self.game.simLoop.step = self.timestep
+        self.game.simLoop.interpolate = False
+        self.game.player.invulnerable = True
+        if self.startRound > 1:
+            self.game.round = self.startRound
+            self.game.setUpRound(task)
+            self.roundsCompleted = 0
+
+        systems = self.game.simLoop.systems
+        for name in self.TIMED_TASKS:
+            if name in systems:
+                systems[name] = self.timed(name, systems[name])
+        self.game.taskMgr.add(self.referee, "headlessReferee")
+        return task.done
+
+    def referee(self, task):
+        '''
+        This is a task that ends each round once every ghost has spawned and fought for fightTime seconds, and stops the simulation once
+        enough rounds have been completed.
+
+        Parameters
+        ----------------------------------------------------
+        task: task object from direct.task
+
+        Returns
+        ----------------------------------------------------
+        returns task.cont which indicates that the task needs to be called again.
+'''
+        ghostSystem = self.game.ghostSystem
+        self.roundsCompleted = self.game.round - self.startRound
+        if self.roundsCompleted >= self.rounds:
+            self.finished = True
+            return task.cont
+
+        lastSpawn = ((ghostSystem.count - 1) // 4)*5
+        if self.game.roundSpawnTimer.getTimePassed() > lastSpawn + self.fightTime:
+            #the ghost system kills these ghosts on its next update
+            ghostSystem.health[ghostSystem.status == ghostSystem.MOVING] = 0
+        return task.cont
+
+    def run(self):
+        '''
+        This method runs the simulation until enough rounds have been completed, then prints the results.
+
+        Parameters
+        ----------------------------------------------------
+        None
+
+        Returns
+        ----------------------------------------------------
+        Returns a dictionary with the number of rounds, frames, simulated seconds, real seconds, rounds per second and the timings of each task
+'''
+        clock = ClockObject.getGlobalClock()
+        clock.setMode(ClockObject.MNonRealTime)
+        clock.setFrameRate(1/self.timestep)
+
+        self.game.taskMgr.add(self.start, "headlessStart")
+        startTime = time.perf_counter()
+        while not self.finished:
+            self.game.taskMgr.step()
+            self.frames += 1
+        realTime = time.perf_counter() - startTime
+
+        results = {"rounds": self.roundsCompleted,
+                   "frames": self.frames,
+                   "simulatedSeconds": self.frames*self.timestep,
+                   "realSeconds": realTime,
+                   "roundsPerSecond": self.roundsCompleted/realTime,
+                   "timings": {name: {"totalMs": self.timings[name]*1000, "calls": self.calls[name],
+                                      "meanMs": self.timings[name]*1000/max(self.calls[name], 1)} for name in self.TIMED_TASKS}}
+        self.printResults(results)
+        return results
+
+    def printResults(self, results):
+        '''
+        Prints the results of the simulation.
+'''
+        print(f"simulated {results['rounds']} rounds ({results['frames']} frames, {results['simulatedSeconds']:.1f} s of game time) in {results['realSeconds']:.2f} s")
+        print(f"rounds per second: {results['roundsPerSecond']:.2f}, frames per second: {results['frames']/results['realSeconds']:.1f}")
+        for name, timing in results["timings"].items():
+            print(f"{name:>18}: {timing['totalMs']:10.1f} ms total, {timing['meanMs']:8.3f} ms per call, {timing['calls']} calls")
+
+
+class HeadlessReplay(HeadlessSimulation):
+    def __init__(self, gameObj, replay):
+        '''
+        Initialization for the HeadlessReplay class. This class plays back an input log in headless mode as fast as the computer allows (see input_log.py).
+        Unlike the headless simulation, nothing is done for the player, the replay plays the game exactly as it was recorded, until the log runs out,
+        the player dies or the game is quit. The time of every frame is measured, so the frame times of a recorded game can be compared between builds.
+
+        At the end the frame times, the time spent in each task of the game and the state the game ended in are printed. If two builds end in a
+        different state, they did not play the game the same way.
+
+        Parameters
+        ----------------------------------------------------
+        gameObj: the MyGame object, created with headless = True
+        replay: the InputReplay object to play back
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        super().__init__(gameObj, rounds = 0, timestep = replay.step)
+        self.replay = replay
+        self.frameTimes = []
+
+    def start(self, task):
+        '''
+        This is a task that sets up the main game with the input replay in place of the player, and then wraps every system of the fixed step loop so it is timed.
+
+        Parameters
+        ----------------------------------------------------
+        task: task object from direct.task
+
+        Returns
+        ----------------------------------------------------
+        returns task.done which indicates the task is finished and should be removed from the task manager
+'''
+        self.game.setUpRound = self.timed("roundSetup", self.game.setUpRound)
+        self.game.inputLog = self.replay
+        self.game.setUpMainGame(task)
+        self.game.simLoop.interpolate = False
+
+        systems = self.game.simLoop.systems
+        for name in self.TIMED_TASKS:
+            if name in systems:
+                systems[name] = self.timed(name, systems[name])
+        return task.done
+
+    def getState(self):
+        '''
+        Returns a dictionary of the state the game is in, the round, the kills, and the position, heading and health of the player.
+'''
+        player = self.game.player
+        return {"round": self.game.round, "kills": self.game.ghostKills, "ticks": self.game.simLoop.ticks,
+                "position": [player.posX, player.posY], "heading": player.heading, "health": player.playerHealth}
+
+    def run(self):
+        '''
+        This method plays back the input log until it runs out, the player dies or the game is quit, then prints the results.
+
+        Parameters
+        ----------------------------------------------------
+        None
+
+        Returns
+        ----------------------------------------------------
+        Returns a dictionary with the number of frames, the frame times, the timings of each task and the state the game ended in
+'''
+        clock = ClockObject.getGlobalClock()
+        clock.setMode(ClockObject.MNonRealTime)
+        clock.setFrameRate(1/self.timestep)
+
+        self.game.taskMgr.add(self.start, "headlessStart")
+        startTime = time.perf_counter()
+        try:
+            #the loop stops as soon as the last recorded frame has been played, a frame after it would be played with live input
+            while not self.replay.finished and self.replay.frame < len(self.replay.frames):
+                frameStart = time.perf_counter()
+                self.game.taskMgr.step()
+                self.frameTimes.append(time.perf_counter() - frameStart)
+        except SystemExit:
+            #the escape key was pressed in the game that was recorded
+            pass
+        realTime = time.perf_counter() - startTime
+
+        #the frame that sets up the game is not a frame of the game
+        frameTimes = np.array(self.frameTimes[1:] or [0.0])*1000
+        results = {"frames": len(self.replay.frames),
+                   "framesPlayed": self.replay.frame,
+                   "simulatedSeconds": self.game.gameClock.getTime(),
+                   "realSeconds": realTime,
+                   "meanMs": float(frameTimes.mean()),
+                   "p95Ms": float(np.percentile(frameTimes, 95)),
+                   "p99Ms": float(np.percentile(frameTimes, 99)),
+                   "maxMs": float(frameTimes.max()),
+                   "timings": {name: {"totalMs": self.timings[name]*1000, "calls": self.calls[name],
+                                      "meanMs": self.timings[name]*1000/max(self.calls[name], 1)} for name in self.TIMED_TASKS},
+                   "state": self.getState()}
+        self.printResults(results)
+        return results
+
+    def printResults(self, results):
+        '''
+        Prints the results of the replay.
+'''
+        print(f"replayed {results['framesPlayed']} of {results['frames']} frames ({results['simulatedSeconds']:.1f} s of game time) in {results['realSeconds']:.2f} s")
+        print(f"frame time: mean {results['meanMs']:.3f} ms, p95 {results['p95Ms']:.3f} ms, p99 {results['p99Ms']:.3f} ms, max {results['maxMs']:.3f} ms")
+        for name, timing in results["timings"].items():
+            print(f"{name:>18}: {timing['totalMs']:10.1f} ms total, {timing['meanMs']:8.3f} ms per call, {timing['calls']} calls")
+        print(f"final state: {json.dumps(results['state'])}")
@@ -0,0 +1,138 @@
+import numpy as np
+
+
+class SpatialHash():
+    def __init__(self, border, cellSize):
+        '''
+        Initialization for the SpatialHash class. The spatial hash splits the map into a uniform grid of square cells, every frame the
+        positions of the ghosts are sorted into the cell they are in. To find every ghost that is close to a ghost, only the cell the ghost
+        is in and the 8 cells around it need to be checked, instead of checking every other ghost in the game.
+
+        The cell size has to be at least as big as the largest radius that is searched, otherwise ghosts that are close enough could be in
+        cells that are not checked.
+
+        Parameters
+        ----------------------------------------------------
+        border: a tuple of two tuples, ((minX, maxX), (minY, maxY)), the same format as mapBorder in the MyGame class
+        cellSize: a float representing the width of each cell in the grid
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.cellSize = float(cellSize)
+        self.minX = float(border[0][0])
+        self.minY = float(border[1][0])
+        self.width = int(np.ceil((border[0][1] - border[0][0])/self.cellSize)) + 1
+        self.height = int(np.ceil((border[1][1] - border[1][0])/self.cellSize)) + 1
+
+        #ids and positions of the points in the grid, sorted by the cell they are in
+        self.ids = np.zeros(0, dtype = np.intp)
+        self.pos = np.zeros((0, 2))
+        self.cellX = np.zeros(0, dtype = np.intp)
+        self.cellY = np.zeros(0, dtype = np.intp)
+
+        #for every cell, the indice in the sorted arrays where the cell starts and how many points are in it
+        self.cellStart = np.zeros(self.width*self.height, dtype = np.intp)
+        self.cellCount = np.zeros(self.width*self.height, dtype = np.intp)
+
+    def rebuild(self, ids, pos):
+        '''
+        This method puts a new set of points into the grid, it is called once per frame before any queries are made.
+        Points outside of the border are put into the closest cell on the edge of the grid.
+
+        Parameters
+        ----------------------------------------------------
+        ids: an array of integers identifying each point, for ghosts this is the ghost number
+        pos: an array of shape (n, 2) with the x and y of each point
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        cellX = np.clip(((pos[:, 0] - self.minX)//self.cellSize).astype(np.intp), 0, self.width - 1)
+        cellY = np.clip(((pos[:, 1] - self.minY)//self.cellSize).astype(np.intp), 0, self.height - 1)
+        cells = cellY*self.width + cellX
+
+        order = np.argsort(cells, kind = "stable")
+        self.ids = np.asarray(ids, dtype = np.intp)[order]
+        self.pos = pos[order]
+        self.cellX = cellX[order]
+        self.cellY = cellY[order]
+
+        self.cellCount = np.bincount(cells, minlength = self.width*self.height)
+        self.cellStart = np.cumsum(self.cellCount) - self.cellCount
+
+    def pairsWithin(self, radius):
+        '''
+        This method finds every pair of points that are within radius of eachother. Each pair is returned twice, once in each order,
+        so every point gets a list of all of its neighbours. A point is never paired with itself.
+
+        Parameters
+        ----------------------------------------------------
+        radius: a float, has to be less than or equal to the cell size
+
+        Returns
+        ----------------------------------------------------
+        Returns a tuple of two arrays (first, second), first[k] and second[k] are the ids of the two points in the kth pair
+'''
+        count = len(self.ids)
+        firsts = []
+        seconds = []
+        for offsetX in (-1, 0, 1):
+            for offsetY in (-1, 0, 1):
+                neighbourX = self.cellX + offsetX
+                neighbourY = self.cellY + offsetY
+                inGrid = (neighbourX >= 0) & (neighbourX < self.width) & (neighbourY >= 0) & (neighbourY < self.height)
+                cells = np.where(inGrid, neighbourY*self.width + neighbourX, 0)
+                counts = np.where(inGrid, self.cellCount[cells], 0)
+
+                #expands each point into one entry for every point in the neighbouring cell
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+                first = np.repeat(np.arange(count), counts)
+                runStart = np.repeat(np.cumsum(counts) - counts, counts)
+                second = np.repeat(self.cellStart[cells], counts) + np.arange(total) - runStart
+                firsts.append(first)
+                seconds.append(second)
+
+        if not firsts:
+            empty = np.zeros(0, dtype = np.intp)
+            return empty, empty
+        first = np.concatenate(firsts)
+        second = np.concatenate(seconds)
+        distSq = ((self.pos[first] - self.pos[second])**2).sum(axis = 1)
+        keep = (first != second) & (distSq <= radius*radius)
+        return self.ids[first[keep]], self.ids[second[keep]]
+
+    def neighbours(self, pointId, radius):
+        '''
+        This method finds every point within radius of a single point that is in the grid.
+
+        Parameters
+        ----------------------------------------------------
+        pointId: the id of the point to search around
+        radius: a float, has to be less than or equal to the cell size
+
+        Returns
+        ----------------------------------------------------
+        Returns an array of the ids of every other point within radius of the point
+'''
+        found = np.flatnonzero(self.ids == pointId)
+        if found.size == 0:
+            return np.zeros(0, dtype = np.intp)
+        index = found[0]
+        centerX = self.cellX[index]
+        centerY = self.cellY[index]
+
+        candidates = []
+        for neighbourY in range(max(centerY - 1, 0), min(centerY + 2, self.height)):
+            cell = neighbourY*self.width + max(centerX - 1, 0)
+            lastCell = neighbourY*self.width + min(centerX + 1, self.width - 1)
+            #cells in the same row are next to eachother in the sorted arrays
+            candidates.append(np.arange(self.cellStart[cell], self.cellStart[lastCell] + self.cellCount[lastCell]))
+        candidates = np.concatenate(candidates)
+        distSq = ((self.pos[candidates] - self.pos[index])**2).sum(axis = 1)
+        keep = (candidates != index) & (distSq <= radius*radius)
+        return self.ids[candidates[keep]]
@@ -0,0 +1,120 @@
+import time
+
+import game
+
+
+class SpawnDirector():
+    def __init__(self, budget = 0.002, lookahead = 5):
+        '''
+        Initialization for the SpawnDirector class. The spawn director is responsible for spawning in the ghosts of a round.
+        Ghosts spawn in waves of four. At the start of a round it schedules every wave with the scheduler of the game clock, which spawns the
+        wave when it is due, so waves that are not due yet cost nothing.
+
+        Ghost objects are also not created at the start of the round. A ghost object is only created (or taken out of the ghost pool) a little while
+        before the ghost is due to spawn, and only as many as can be created within the time budget each frame, so starting a round with a lot of
+        ghosts never freezes a frame. If a ghost is due and its object has not been prepared yet, it is created right away.
+
+        Parameters
+        ----------------------------------------------------
+        budget: Default: 0.002, the number of seconds per frame that can be spent creating ghost objects ahead of time
+        lookahead: Default: 5, how many seconds before its spawn time a ghost object can be created
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.budget = budget
+        self.lookahead = lookahead
+
+        #the scheduler timer of every wave of the round, and the number of waves that have spawned
+        self.waves = []
+        self.spawnedWaves = 0
+        self.waveSize = 4
+        self.waveInterval = 5
+
+        #ghost numbers below nextToPrepare have already had their ghost objects prepared
+        self.nextToPrepare = 0
+        self.count = 0
+
+    def setUpRound(self, count):
+        '''
+        This method schedules the waves of a new round.
+
+        Parameters
+        ----------------------------------------------------
+        count: an integer representing the number of ghosts in the round
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        #ghosts spawn in groups of four, there is a 5 second interval between group spawns.
+        scheduler = game.gameObj.gameClock.scheduler
+        for timer in self.waves:
+            scheduler.cancel(timer)
+        self.count = count
+        self.spawnedWaves = 0
+        self.waves = [scheduler.schedule(wave*self.waveInterval, self.spawnWave, wave) for wave in range(-(-count//self.waveSize))]
+        self.nextToPrepare = 0
+
+    def spawnWave(self, wave):
+        '''
+        This method is called by the scheduler when a wave is due, it spawns in every ghost of the wave.
+
+        Parameters
+        ----------------------------------------------------
+        wave: the number of the wave, the first wave of the round is 0
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        for num in range(wave*self.waveSize, min((wave + 1)*self.waveSize, self.count)):
+            ghost = game.gameObj.ghostPool.get(num)
+            game.gameObj.ghosts[num] = ghost
+            game.gameObj.ghostSystem.spawn(num, ghost)
+        self.spawnedWaves += 1
+
+    def spawnRemaining(self):
+        '''
+        This method spawns in every wave of the round that has not spawned yet straight away, it is used by the benchmark.
+'''
+        scheduler = game.gameObj.gameClock.scheduler
+        for wave in range(self.spawnedWaves, len(self.waves)):
+            scheduler.cancel(self.waves[wave])
+            self.spawnWave(wave)
+
+    def prepareGhosts(self, elapsed):
+        '''
+        This method creates the ghost objects of the ghosts that are spawning soon, in order of ghost number, until it runs out of time for the frame.
+
+        Parameters
+        ----------------------------------------------------
+        elapsed: the time passed since the round started
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        start = time.perf_counter()
+        while self.nextToPrepare < self.count and (self.nextToPrepare // self.waveSize)*self.waveInterval <= elapsed + self.lookahead:
+            game.gameObj.ghostPool.prepare(self.nextToPrepare)
+            self.nextToPrepare += 1
+            if time.perf_counter() - start > self.budget:
+                break
+
+    def update(self, task):
+        '''
+        This is a task that prepares the ghosts that spawn next, the waves are spawned in by the scheduler.
+
+        Parameters
+        ----------------------------------------------------
+        task: task object from direct.task
+
+        Returns
+        ----------------------------------------------------
+        returns task.cont which indicates that the task needs to be called again.
+'''
+        if self.nextToPrepare < self.count:
+            self.prepareGhosts(game.gameObj.roundSpawnTimer.getTimePassed())
+        return task.cont
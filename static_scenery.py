@@ -0,0 +1,134 @@
+from panda3d.core import BitMask32
+
+import numpy as np
+
+
+def countScene(nodePath):
+    '''
+    This function counts the nodes and the geoms below a NodePath. Every geom is drawn with its own draw call, so the number of geoms
+    is the number of draw calls it takes to draw everything below the NodePath (if none of it is culled).
+
+    Parameters
+    ----------------------------------------------------
+    nodePath: the NodePath to count below, it is counted as well
+
+    Returns
+    ----------------------------------------------------
+    Returns a tuple of the number of nodes and the number of geoms
+'''
+    nodes = nodePath.findAllMatches("**").getNumPaths()
+    geoms = sum(geomNode.node().getNumGeoms() for geomNode in nodePath.findAllMatches("**/+GeomNode"))
+    return nodes, geoms
+
+
+class StaticScenery():
+    def __init__(self, parent, chunkSize = 30):
+        '''
+        Initialization for the StaticScenery class. The static scenery is everything in the map that never moves, the trees and the floor.
+        Each tree model is made up of a few nodes, and every tree used to have its own texture and lights set on it, so drawing the forest took
+        hundreds of nodes, render state changes and draw calls.
+
+        The build methods place every prop of the game map and merge the scenery into a few batches. The map is split into square chunks,
+        every prop is copied into the chunk its position is in, and then each chunk is flattened, which bakes the transform of every tree into its vertices and merges the trees
+        into as few geoms as possible. The chunks are kept separate so the trees outside of the view of the camera are still culled.
+        The texture and the lights are set once on the root of the trees, instead of on each tree.
+
+        Parameters
+        ----------------------------------------------------
+        parent: the NodePath the scenery is put under
+        chunkSize: Default: 30, the width and length of a chunk
+
+        Returns
+        ----------------------------------------------------
+        None
+'''
+        self.chunkSize = chunkSize
+        self.root = parent.attachNewNode("scenery")
+        self.treeRoot = self.root.attachNewNode("trees")
+        self.chunks = {}
+        self.stats = None
+
+    def buildSteps(self, gameMap, models, environment, texture, lights):
+        '''
+        This method puts the props of the game map (the trees) and the floor into the scenery and merges them into batches, one chunk at a time.
+        It is a generator, it stops after each chunk so building the scenery can be spread over several frames (see the GameLoader class).
+        The chunk of every prop is worked out for all of the props at once, then the model of every prop in the chunk is copied into the
+        chunk in its position, rotation and scale, and the chunk is flattened.
+        The floor keeps its own color and is not lit, the same as before, so it is flattened on its own.
+
+        Parameters
+        ----------------------------------------------------
+        gameMap: the GameMap object of the map
+        models: a list of model NodePaths, the indice of each model is its model id in the game map
+        environment: the NodePath of the floor
+        texture: the texture of the trees
+        lights: a list of light NodePaths that light the trees
+
+        Returns
+        ----------------------------------------------------
+        Yields how much of the scenery has been built, as a number between 0 and 1
+'''
+        #the state that every tree used to have set on it is set once on the root of the trees
+        self.treeRoot.setTexture(texture)
+        for light in lights:
+            self.treeRoot.setLight(light)
+
+        positions = gameMap.getPositions()
+        cells = np.floor(positions[:, :2]/self.chunkSize).astype(np.int64)
+        keys, chunkIds = np.unique(cells, axis = 0, return_inverse = True)
+        chunkIds = chunkIds.ravel()
+        modelIds = gameMap.getModelIds()
+        hprs = gameMap.getHprs()
+        scales = gameMap.getScales()
+
+        #the roots of the scenery and the floor are counted along with the chunks
+        nodesBefore, drawCallsBefore = countScene(environment)
+        nodesBefore += 2
+        for chunkId, (cellX, cellY) in enumerate(keys.tolist()):
+            chunk = self.treeRoot.attachNewNode(f"chunk{cellX}_{cellY}")
+            self.chunks[(cellX, cellY)] = chunk
+            props = np.flatnonzero(chunkIds == chunkId)
+            for modelId, (x, y, z), (h, p, r), scale in zip(modelIds[props].tolist(), positions[props].tolist(), hprs[props].tolist(), scales[props].tolist()):
+                prop = models[modelId].copyTo(chunk)
+                prop.setPosHprScale(x, y, z, h, p, r, scale, scale, scale)
+
+            nodes, drawCalls = countScene(chunk)
+            nodesBefore += nodes
+            drawCallsBefore += drawCalls
+            #every model is loaded under a ModelRoot node, which flattening is not allowed to remove, so those nodes are removed first
+            chunk.clearModelNodes()
+            chunk.flattenStrong()
+            yield (chunkId + 1)/(len(keys) + 1)
+
+        environment.wrtReparentTo(self.root)
+        environment.clearModelNodes()
+        environment.flattenStrong()
+
+        #flattening creates new nodes, so the collide masks are turned off afterwards. Nothing in the scenery is ever collided with
+        self.root.setCollideMask(BitMask32.allOff())
+
+        nodesAfter, drawCallsAfter = countScene(self.root)
+        self.stats = {"chunks": len(self.chunks),
+                      "nodesBefore": nodesBefore,
+                      "drawCallsBefore": drawCallsBefore,
+                      "nodesAfter": nodesAfter,
+                      "drawCallsAfter": drawCallsAfter}
+        yield 1.0
+
+    def build(self, gameMap, models, environment, texture, lights):
+        '''
+        This method builds the whole scenery at once, it takes the same parameters as buildSteps.
+
+        Returns
+        ----------------------------------------------------
+        Returns a dictionary with the number of chunks, and the number of nodes and draw calls of the scenery before and after it was merged
+'''
+        for progress in self.buildSteps(gameMap, models, environment, texture, lights):
+            pass
+        return self.stats
+
+    def getStats(self):
+        '''
+        Returns the dictionary returned by build, or None if the scenery has not been built yet.
+'''
+        return self.stats
@@ -1,13 +1,16 @@
-import time
+import game
+
+#the timer reads the time of the game clock instead of the time module, so timers follow the same clock as the rest of the game,
+#they stop while the game is paused and run faster than real time when the game is simulated in headless mode
 
 class Timer():
     def __init__(self):
         '''
-        This class is the timer class. It is a simple class using only the time module of python.
+        This class is the timer class. It is a simple class using only the time of the game clock (see the GameClock class).
         I ended up needing to add cooldowns for ghost hits so I created a timer class to make it easier.
         The timer class only has 3 attributes, delay, which represents the future time,
         it is equal to the delay you want added to the current time when the delay was set
-        originTime: which is the value returned by time.time(), this is set to be whenever the timer is started.
+        originTime: which is the time of the game clock, this is set to be whenever the timer is started.
         and mode: which indicates if a timer is currently timing or not.
         
         Parameters
@@ -35,8 +38,9 @@ class Timer():
         ----------------------------------------------------
         None
 '''
-        self.delay = time.time()+delay
-        self.originTime = time.time()
+        now = game.gameObj.gameClock.getTime()
+        self.delay = now+delay
+        self.originTime = now
         self.mode = "timing"
     
     def resetTimer(self):
@@ -55,7 +59,7 @@ class Timer():
         ----------------------------------------------------
         returns the difference between the delayTime and the current time. 
 '''
-        return self.delay-time.time()
+        return self.delay-game.gameObj.gameClock.getTime()
     
     def getTimePassed(self):
         '''
@@ -65,4 +69,4 @@ class Timer():
         ----------------------------------------------------
         returns the difference between the current time and the origintime. 
 '''
-        return time.time() - self.originTime
\ No newline at end of file
+        return game.gameObj.gameClock.getTime() - self.originTime
\ No newline at end of file